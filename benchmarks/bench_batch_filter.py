@@ -0,0 +1,102 @@
+"""
+Benchmark: JobFilter.evaluate on each job vs JobFilter.evaluate_batch.
+
+Generates synthetic SerpApi jobs (titles, companies, schedule types, apply
+options, posting dates and salaries drawn from realistic pools, so values
+repeat like they do across search results), checks that both paths give the
+same reason codes, and reports jobs per second. The batch path is timed with
+NumPy when it is installed and with the pure Python fallback.
+
+Usage:
+    python benchmarks/bench_batch_filter.py [--jobs 50000] [--companies 2000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import job_columns  # noqa: E402
+import job_filter as job_filter_module  # noqa: E402
+from job_filter import JobFilter  # noqa: E402
+
+WORDS = [
+    "software", "developer", "engineer", "backend", "frontend", "full", "stack", "python",
+    "java", "cloud", "platform", "data", "analyst", "mobile", "web", "systems", "application",
+]
+PREFIXES = ["", "", "", "senior", "sr.", "junior", "lead", "intern", "staff"]
+SCHEDULES = [None, "Full-time", "Full-time", "Part-time", "Contractor", "Full-time and Part-time"]
+DATES = [None, "just now", "5 hours ago", "1 day ago", "3 days ago", "1 week ago", "2 weeks ago", "30+ days ago"]
+SALARIES = [None, None, "$45K–$60K a year", "$70K–$90K a year", "$120K a year", "$25–$35 an hour", "$55 an hour"]
+BOARDS = [("LinkedIn", "https://ca.linkedin.com/jobs/view/{}"), ("Indeed", "https://ca.indeed.com/viewjob?jk={}"),
+          ("Glassdoor", "https://www.glassdoor.ca/job-listing/{}"), ("Apply on JobSpam", "https://jobspam.example/{}")]
+
+def make_jobs(count, num_companies, rng):
+    companies = [f"Company {i}" for i in range(num_companies)]
+    titles = [" ".join(filter(None, [rng.choice(PREFIXES)] + rng.sample(WORDS, rng.randint(2, 3)))) for _ in range(count // 10 or 1)]
+    jobs = []
+    for i in range(count):
+        company = rng.choice(companies)
+        options = [{"title": title, "link": link.format(i)} for title, link in rng.sample(BOARDS, rng.randint(0, 2))]
+        if rng.random() < 0.2:
+            options.append({"title": "Careers", "link": f"https://careers.{company.replace(' ', '').lower()}.com/{i}"})
+        job = {"title": rng.choice(titles).title(), "company_name": company, "apply_options": options}
+        extensions = [value for value in (rng.choice(DATES), rng.choice(SALARIES)) if value]
+        if extensions:
+            job["extensions"] = extensions
+        schedule = rng.choice(SCHEDULES)
+        if schedule:
+            job["detected_extensions"] = {"schedule_type": schedule}
+        jobs.append(job)
+    return jobs
+
+def best_of(repeat, function):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=50_000)
+    parser.add_argument("--companies", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = make_jobs(args.jobs, args.companies, rng)
+    config = SimpleNamespace(
+        blacklist_companies=[f"Company {i}" for i in range(0, args.companies, 50)],
+        exclude_keywords=["senior", "sr.", "lead", "staff", "intern"],
+        schedule_types=["full-time"],
+        trusted_domains=["linkedin", "indeed", "glassdoor"],
+    )
+    make_filter = lambda: JobFilter(config, max_days_old=7, min_salary=60000)
+
+    def per_job():
+        job_filter = make_filter()
+        return [job_filter.evaluate(job)[0] for job in jobs]
+
+    per_job_time, expected = best_of(args.repeat, per_job)
+    backends = [("pure Python", None)]
+    if job_columns.np is not None:
+        backends.insert(0, ("NumPy", job_columns.np))
+
+    rejected = sum(1 for code in expected if code)
+    print(f"{args.jobs} jobs, {args.companies} companies ({rejected} rejected)")
+    print(f"  {'per-job evaluate:':<30} {per_job_time:>7.3f}s ({args.jobs / per_job_time:>10,.0f} jobs/s)")
+    for name, numpy in backends:
+        job_columns.np = job_filter_module.np = numpy
+        batch_time, (_, codes) = best_of(args.repeat, lambda: make_filter().evaluate_batch(jobs))
+        assert codes == expected, f"evaluate_batch ({name}) disagrees with evaluate"
+        label = f"evaluate_batch ({name}):"
+        print(f"  {label:<30} {batch_time:>7.3f}s ({args.jobs / batch_time:>10,.0f} jobs/s, {per_job_time / batch_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
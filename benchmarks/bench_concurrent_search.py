@@ -0,0 +1,94 @@
+"""
+Benchmark: sequential vs concurrent query x location fan-out.
+
+Runs the SearchExecutor against a local fake SerpApi that sleeps for a fixed
+latency on every page, so the numbers reflect time spent waiting on the
+network rather than parsing.
+
+Usage:
+    python benchmarks/bench_concurrent_search.py [--latency 0.2] [--workers 8]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from job_finder import JobFinder  # noqa: E402
+from search_executor import SearchExecutor  # noqa: E402
+
+class FakeGoogleSearch:
+    """Stand-in for serpapi.GoogleSearch with injected latency and pagination."""
+    latency = 0.2
+    pages = 3
+
+    def __init__(self, params):
+        self.params = dict(params)
+
+    def get_dict(self):
+        time.sleep(self.latency)
+        token = self.params.get("next_page_token")
+        page = int(token.split("-")[1]) if token else 0
+        results = {
+            "jobs_results": [
+                {"title": f"{self.params['q']} #{page}-{i}", "company_name": "Acme", "location": self.params["location"]}
+                for i in range(10)
+            ]
+        }
+        if page + 1 < self.pages:
+            results["serpapi_pagination"] = {"next_page_token": f"page-{page + 1}"}
+        return results
+
+def build_combinations(num_queries, num_locations):
+    combinations = []
+    for q in range(num_queries):
+        for l in range(num_locations):
+            query, location = f"query {q}", f"City {l}"
+            combinations.append((query, location, {"q": f"{query} near {location}", "location": location}))
+    return combinations
+
+def run(workers, combinations, max_pages):
+    finder = JobFinder("bench", max_pages=max_pages)
+    start = time.perf_counter()
+    results = list(SearchExecutor(finder, max_workers=workers).run(combinations))
+    elapsed = time.perf_counter() - start
+    return elapsed, results, finder.total_api_calls
+
+def without_fetch_times(results):
+    """The results minus fetched_at, which differs between the two runs."""
+    return [
+        (query, location, [{k: v for k, v in job.items() if k != "fetched_at"} for job in jobs])
+        for query, location, jobs in results
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=12)
+    parser.add_argument("--locations", type=int, default=9)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    FakeGoogleSearch.latency = args.latency
+    FakeGoogleSearch.pages = args.pages
+    combinations = build_combinations(args.queries, args.locations)
+
+    with patch("job_finder.GoogleSearch", FakeGoogleSearch):
+        seq_time, seq_results, seq_calls = run(1, combinations, args.pages)
+        par_time, par_results, par_calls = run(args.workers, combinations, args.pages)
+
+    assert without_fetch_times(seq_results) == without_fetch_times(par_results), "Concurrent results differ from sequential results"
+    assert seq_calls == par_calls
+
+    print(f"Combinations: {len(combinations)}, pages/combination: {args.pages}, latency: {args.latency}s")
+    print(f"Sequential         : {seq_time:8.2f}s  ({seq_calls} API calls)")
+    print(f"Concurrent ({args.workers:>2} w.) : {par_time:8.2f}s  ({par_calls} API calls)")
+    print(f"Speedup            : {seq_time / par_time:8.2f}x")
+
+if __name__ == "__main__":
+    main()
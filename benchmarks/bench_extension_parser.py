@@ -0,0 +1,201 @@
+"""
+Benchmark: reading the date and salary fields of a job with the single-pass
+extension classifier vs the chain it replaced ('ago'/'day' probes, then the
+memoized regex parsers is_salary_text, parse_salary and parse_days_ago,
+copied below as they were before the classifier).
+
+Jobs get 2-5 extensions drawn from a realistic pool (dates, schedules,
+benefits, salaries with a long tail of distinct ranges) and a fetched_at, as
+JobFinder stamps them. Two levels are timed, with the memos cleared (cold)
+and filled (warm):
+  - fields:    only the date and salary extraction (the previous loop vs
+               parse_date_fields + parse_salary_fields sharing one
+               scan_extensions pass)
+  - parse_job: the previous eager parse_job vs a lazy ParsedJob whose date
+               and salary fields are read
+They must agree on the salary range of every job, and on days_ago wherever
+the previous chain found one (it never recognized "just now", which has no
+'ago' or 'day').
+
+Usage:
+    python benchmarks/bench_extension_parser.py [--jobs 100000] [--repeat 3]
+"""
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+from functools import lru_cache
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import extension_parser  # noqa: E402
+from job_parser import JobParser, parse_date_fields, parse_salary_fields, scan_extensions  # noqa: E402
+
+DATES = ["just now", "5 hours ago", "1 day ago", "2 days ago", "3 days ago", "6 days ago", "1 week ago", "30+ days ago"]
+OTHERS = ["Full-time", "Part-time", "Contractor", "Work from home", "Health insurance", "Dental insurance",
+          "Paid time off", "No degree mentioned"]
+SALARIES = ["$25–$30 an hour", "$20 an hour", "$80K–$100K a year", "$120K a year", "$4,000 a month"]
+
+def make_jobs(count, rng):
+    jobs = []
+    for _ in range(count):
+        extensions = [rng.choice(DATES)] + rng.sample(OTHERS, rng.randint(1, 3))
+        if rng.random() < 0.4:
+            if rng.random() < 0.1:
+                low = rng.randrange(40, 200)
+                extensions.append(f"${low}K–${low + rng.randrange(5, 60)}K a year")
+            else:
+                extensions.append(rng.choice(SALARIES))
+        rng.shuffle(extensions)
+        jobs.append({"title": "Developer", "company_name": "Acme", "extensions": extensions, "fetched_at": 1_760_000_000})
+    return jobs
+
+_AMOUNT = re.compile(r'\$?(\d+(?:\.\d+)?)(k)?')
+_SALARY_WORDS = ('$', 'salary', 'pay', 'compensation')
+_RELATIVE_DATE = re.compile(r'(\d+)\+?\s*(day|week|month)')
+_IMMEDIATE = ('just now', 'today', 'hour', 'minute', 'second')
+_UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30}
+
+@lru_cache(maxsize=4096)
+def chain_parse_salary(text):
+    text = text.lower().replace(',', '')
+    multiplier = 1
+    if 'hour' in text or '/hr' in text:
+        multiplier = 2080
+    elif 'month' in text or '/mo' in text:
+        multiplier = 12
+    matches = _AMOUNT.findall(text)
+    if not matches:
+        return None
+    values = [float(amount) * (1000 if suffix == 'k' else 1) for amount, suffix in matches]
+    annual_values = [v * multiplier for v in values]
+    return min(annual_values), max(annual_values)
+
+@lru_cache(maxsize=4096)
+def chain_is_salary_text(text):
+    lowered = text.lower()
+    return any(x in lowered for x in _SALARY_WORDS) and any(char.isdigit() for char in text)
+
+@lru_cache(maxsize=4096)
+def chain_parse_days_ago(text):
+    text = text.lower().strip()
+    if any(x in text for x in _IMMEDIATE):
+        return 0
+    if 'yesterday' in text:
+        return 1
+    match = _RELATIVE_DATE.search(text)
+    if match:
+        return int(match.group(1)) * _UNIT_DAYS[match.group(2)]
+    return None
+
+def chain_fields(job_data):
+    """The date and salary extraction of the previous parse_job, as (days_ago, salary range)."""
+    days_ago = None
+    salary_info = None
+    for item in job_data.get('extensions') or ():
+        if 'ago' in item or 'day' in item:
+            days_ago = chain_parse_days_ago(item)
+        elif chain_is_salary_text(item):
+            salary_info = chain_parse_salary(item)
+    return days_ago, salary_info
+
+def single_pass_fields(job_data):
+    scan = scan_extensions(job_data.get('extensions'))
+    salary_info = parse_salary_fields(job_data, scan)[1]
+    return parse_date_fields(job_data, scan)[1], (salary_info.min_salary, salary_info.max_salary) if salary_info else None
+
+def chain_parse_job(job_data):
+    """The previous JobParser.parse_job."""
+    title = job_data.get('title', 'N/A')
+    logging.debug(f"Parsing job: {title}")
+    posted_date = "N/A"
+    days_ago = None
+    salary_info = None
+    salary_raw = "N/A"
+    if 'extensions' in job_data and job_data['extensions']:
+        for item in job_data['extensions']:
+            if 'ago' in item or 'day' in item:
+                posted_date = item
+                days_ago = chain_parse_days_ago(item)
+            elif chain_is_salary_text(item):
+                salary_info = chain_parse_salary(item)
+                salary_raw = item
+    if not salary_info and 'detected_extensions' in job_data:
+        exts = job_data['detected_extensions']
+        if 'salary' in exts:
+            salary_info = chain_parse_salary(exts['salary'])
+            salary_raw = exts['salary']
+        if 'posted_at' in exts and posted_date == "N/A":
+            posted_date = exts['posted_at']
+            days_ago = chain_parse_days_ago(posted_date)
+    return SimpleNamespace(
+        title=title,
+        company=job_data.get('company_name', 'N/A'),
+        location=job_data.get('location', 'N/A'),
+        link=job_data.get('share_link'),
+        posted_date=posted_date,
+        days_ago=days_ago,
+        search_location=job_data.get('search_location', 'N/A'),
+        min_salary=salary_info[0] if salary_info else None,
+        max_salary=salary_info[1] if salary_info else None,
+        salary_raw=salary_raw,
+    )
+
+def dates_and_salaries(parse, jobs):
+    results = []
+    for job in jobs:
+        parsed = parse(job)
+        results.append((parsed.days_ago, (parsed.min_salary, parsed.max_salary) if parsed.max_salary is not None else None))
+    return results
+
+def clear_chain():
+    chain_parse_days_ago.cache_clear()
+    chain_parse_salary.cache_clear()
+    chain_is_salary_text.cache_clear()
+
+def clear_single_pass():
+    extension_parser.classify_extension.cache_clear()
+    extension_parser.classify_salary.cache_clear()
+
+def best_of(repeat, function, setup):
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs, random.Random(args.seed))
+    print(f"{args.jobs} jobs")
+    levels = (
+        ("fields", lambda: [chain_fields(job) for job in jobs], lambda: [single_pass_fields(job) for job in jobs]),
+        ("parse_job", lambda: dates_and_salaries(chain_parse_job, jobs), lambda: dates_and_salaries(JobParser.parse_job, jobs)),
+    )
+    for level, run_chain, run_single in levels:
+        for label, setup_chain, setup_single in (("cold", clear_chain, clear_single_pass), ("warm", None, None)):
+            chain_time, expected = best_of(args.repeat, run_chain, setup_chain)
+            single_time, result = best_of(args.repeat, run_single, setup_single)
+            for (days, salary), (expected_days, expected_salary) in zip(result, expected):
+                assert salary == expected_salary, "single-pass classifier disagrees with the previous chain"
+                assert expected_days is None or days == expected_days, "single-pass classifier disagrees with the previous chain"
+            recovered = sum(1 for (days, _), (expected_days, _) in zip(result, expected) if days is not None and expected_days is None)
+            print(f"  {level:<9} {label}: previous chain {chain_time / args.jobs * 1e6:>5.2f}µs/job, "
+                  f"single pass {single_time / args.jobs * 1e6:>5.2f}µs/job ({chain_time / single_time:.1f}x); "
+                  f"{recovered} posting dates the chain missed")
+
+if __name__ == "__main__":
+    main()
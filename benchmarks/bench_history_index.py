@@ -0,0 +1,98 @@
+"""
+Benchmark: dict-based JobHistory vs the compact digest index.
+
+Loads a history.json-shaped dict and builds the compact index with the same
+number of entries (1M by default), reports the memory used by each, and times per-job lookups against
+page-at-a-time bulk lookups (half of the looked-up jobs are in the history).
+
+Usage:
+    python benchmarks/bench_history_index.py [--entries 1000000] [--lookups 100000] [--page-size 10]
+"""
+import argparse
+import gc
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from history_index import CompactHistoryIndex  # noqa: E402
+
+def make_ids(count, prefix="job"):
+    """History keys shaped like the JobHistory fallback (32-char MD5 hex)."""
+    return [hashlib.md5(f"{prefix}{i}".encode('utf-8')).hexdigest() for i in range(count)]
+
+def measure(build):
+    """Returns (result, bytes still allocated, seconds) for build()."""
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+
+    # Memory is measured on a second build, so tracemalloc does not skew the timing
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, allocated, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"Generating {args.entries} history keys...")
+    ids = make_ids(args.entries)
+    now = time.time()
+    # Serialized like data/history.json, so the dict holds its own key and value strings
+    serialized = json.dumps({job_id: datetime.fromtimestamp(now - i).isoformat() for i, job_id in enumerate(ids)})
+
+    history, dict_bytes, dict_build = measure(lambda: json.loads(serialized))
+    index, index_bytes, index_build = measure(lambda: CompactHistoryIndex.from_items((job_id, now - i) for i, job_id in enumerate(ids)))
+
+    print(f"{'':<18}{'memory':>12}{'per entry':>12}{'load/build':>12}")
+    print(f"{'dict':<18}{dict_bytes / 1e6:>10.1f}MB{dict_bytes / args.entries:>11.1f}B{dict_build:>11.2f}s")
+    print(f"{'compact index':<18}{index_bytes / 1e6:>10.1f}MB{index_bytes / args.entries:>11.1f}B{index_build:>11.2f}s")
+
+    # Later runs load the saved binary index instead of rebuilding it
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.idx")
+        index.save(path)
+        start = time.perf_counter()
+        CompactHistoryIndex.load(path)
+        print(f"{'index file load':<18}{os.path.getsize(path) / 1e6:>10.1f}MB{'':>12}{time.perf_counter() - start:>11.2f}s")
+
+    half = args.lookups // 2
+    lookups = ids[:half] + make_ids(args.lookups - half, prefix="new")
+    pages = [lookups[i:i + args.page_size] for i in range(0, len(lookups), args.page_size)]
+
+    start = time.perf_counter()
+    dict_hits = sum(job_id in history for job_id in lookups)
+    dict_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single_hits = sum(index.contains(job_id) for job_id in lookups)
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk_hits = sum(sum(index.contains_many(page)) for page in pages)
+    bulk_time = time.perf_counter() - start
+
+    assert dict_hits == single_hits == bulk_hits == half
+    print(f"\n{args.lookups} lookups ({half} hits), pages of {args.page_size}:")
+    print(f"  dict membership:          {args.lookups / dict_time:>12,.0f} lookups/s")
+    print(f"  index contains():         {args.lookups / single_time:>12,.0f} lookups/s")
+    print(f"  index contains_many():    {args.lookups / bulk_time:>12,.0f} lookups/s")
+
+if __name__ == "__main__":
+    main()
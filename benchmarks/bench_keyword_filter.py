@@ -0,0 +1,90 @@
+"""
+Benchmark: per-keyword regex search vs the compiled keyword matcher in JobFilter.
+
+Generates synthetic job titles and exclusion keywords (including punctuated
+ones like "sr." and "c++"), checks that both implementations agree, and
+reports titles per second.
+
+Usage:
+    python benchmarks/bench_keyword_filter.py [--titles 100000] [--keywords 200] [--match-rate 0.1]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from job_filter import JobFilter  # noqa: E402
+
+WORDS = [
+    "software", "developer", "engineer", "backend", "frontend", "full", "stack", "python",
+    "java", "cloud", "platform", "data", "analyst", "mobile", "web", "systems", "application",
+    "services", "infrastructure", "security", "quality", "automation", "integration", "team",
+]
+
+def legacy_find_keyword(keywords, title):
+    """The previous implementation: build and search one regex per keyword."""
+    for keyword in keywords:
+        pattern = r''
+        if keyword and keyword[0].isalnum():
+            pattern += r'\b'
+        pattern += re.escape(keyword)
+        if keyword and keyword[-1].isalnum():
+            pattern += r'\b'
+        if re.search(pattern, title):
+            return keyword
+    return None
+
+def make_keywords(count, rng):
+    keywords = ["senior", "sr.", "lead", "principal", "c++", ".net", "intern", "(contract)"]
+    while len(keywords) < count:
+        keywords.append("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))))
+    return keywords[:count]
+
+def make_titles(count, keywords, match_rate, rng):
+    titles = []
+    for _ in range(count):
+        words = rng.sample(WORDS, rng.randint(2, 5))
+        if rng.random() < match_rate:
+            words.insert(rng.randint(0, len(words)), rng.choice(keywords))
+        titles.append(" ".join(words))
+    return titles
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=100_000)
+    parser.add_argument("--keywords", type=int, default=200)
+    parser.add_argument("--match-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keywords = make_keywords(args.keywords, rng)
+    titles = make_titles(args.titles, keywords, args.match_rate, rng)
+    config = SimpleNamespace(blacklist_companies=[], exclude_keywords=keywords, schedule_types=[], trusted_domains=None)
+
+    start = time.perf_counter()
+    job_filter = JobFilter(config)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = [legacy_find_keyword(job_filter.exclude_keywords, title) for title in titles]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [job_filter.find_excluded_keyword(title) for title in titles]
+    compiled_time = time.perf_counter() - start
+
+    assert legacy == compiled, "compiled matcher disagrees with the per-keyword search"
+    rejected = sum(1 for keyword in compiled if keyword)
+    print(f"{args.titles} titles x {args.keywords} keywords ({rejected} rejected), matcher compiled in {compile_time * 1000:.1f}ms")
+    print(f"  per-keyword re.search: {legacy_time:>7.2f}s ({args.titles / legacy_time:>10,.0f} titles/s)")
+    print(f"  compiled matcher:      {compiled_time:>7.2f}s ({args.titles / compiled_time:>10,.0f} titles/s)")
+    print(f"  speedup:               {legacy_time / compiled_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark: field parses and peak memory from filtering to the reports.
+
+Runs pages of jobs through what main() does: JobFilter.evaluate_batch with
+the age and salary rules enabled, a log line per accepted job, then jobs.md
+and summary.md. It compares three versions:
+  - legacy:    the accepted jobs are parsed again into a dict by every step,
+               as before ParsedJob existed;
+  - reparse:   main() builds a new ParsedJob for each accepted job and the
+               writers reuse it, but what the filter parsed is thrown away;
+  - current:   main() reuses the ParsedJob views evaluate_batch leaves in its
+               context, so accepted jobs are never parsed again.
+It reports the date/salary field group parses per job (parse_date_fields
+and parse_salary_fields calls), the wall time and the peak traced memory
+(tracemalloc). Reports are written to a temporary directory.
+
+Usage:
+    python benchmarks/bench_parsed_job.py [--jobs 20000]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import job_parser  # noqa: E402
+from file_manager import FileManager  # noqa: E402
+from job_filter import JobFilter  # noqa: E402
+from job_parser import JobParser  # noqa: E402
+
+LOCATIONS = ["Toronto, Ontario, Canada", "Vancouver, British Columbia, Canada", "Montreal, Quebec, Canada"]
+DATES = ["just now", "5 hours ago", "1 day ago", "3 days ago", "6 days ago", "30+ days ago"]
+SALARIES = [None, "$70K–$90K a year", "$120K a year", "$45–$55 an hour", "$40K a year"]
+PAGE_SIZE = 100
+CONFIG = SimpleNamespace(blacklist_companies=[], exclude_keywords=[], schedule_types=[], trusted_domains=None)
+
+def make_jobs(count, rng):
+    jobs = []
+    for i in range(count):
+        job = {
+            "title": f"Software Engineer {i % 500}",
+            "company_name": f"Company {rng.randrange(2000)}",
+            "location": rng.choice(LOCATIONS),
+            "search_location": rng.choice(LOCATIONS),
+            "share_link": f"https://www.google.com/search?ibp=htl;jobs#htidocid={i:016x}",
+            "extensions": [value for value in (rng.choice(DATES), "Full-time", rng.choice(SALARIES)) if value],
+            "fetched_at": 1_760_000_000 + i // PAGE_SIZE,
+            "apply_options": [{"title": "LinkedIn", "link": "https://www.linkedin.com/jobs/view/1"}],
+        }
+        jobs.append(job)
+    return jobs
+
+class ParseCounter:
+    """Counts the date and salary field group parses of ParsedJob."""
+    def __init__(self):
+        self.originals = (job_parser.parse_date_fields, job_parser.parse_salary_fields)
+        self.calls = 0
+
+    def wrap(self, function):
+        def counted(job, *args):
+            self.calls += 1
+            return function(job, *args)
+        return counted
+
+    def __enter__(self):
+        job_parser.parse_date_fields, job_parser.parse_salary_fields = (self.wrap(f) for f in self.originals)
+        return self
+
+    def __exit__(self, *exc):
+        job_parser.parse_date_fields, job_parser.parse_salary_fields = self.originals
+
+def pages(jobs):
+    for start in range(0, len(jobs), PAGE_SIZE):
+        yield jobs[start:start + PAGE_SIZE]
+
+def legacy_pipeline(jobs, directory):
+    job_filter = JobFilter(CONFIG, max_days_old=7, min_salary=60000, now=1_760_000_000)
+    accepted = []
+    for page in pages(jobs):
+        _, codes = job_filter.evaluate_batch(page)
+        for job, code in zip(page, codes):
+            if code is None:
+                parsed = JobParser.parse_job(job).to_dict()
+                logging.debug(f"Found job: {parsed['title']} - Salary: {parsed.get('salary_raw', 'N/A')}")
+                accepted.append(job)
+    # Each writer parsed the raw jobs again
+    for _ in range(2):
+        for job in accepted:
+            JobParser.parse_job(job).to_dict()
+    FileManager.save_markdown(accepted, os.path.join(directory, "jobs.md"))
+    FileManager.save_summary_markdown(accepted, os.path.join(directory, "summary.md"))
+
+def reparse_pipeline(jobs, directory):
+    job_filter = JobFilter(CONFIG, max_days_old=7, min_salary=60000, now=1_760_000_000)
+    new_jobs = []
+    for page in pages(jobs):
+        _, codes = job_filter.evaluate_batch(page)
+        for job, code in zip(page, codes):
+            if code is None:
+                parsed = JobParser.parse_job(job)
+                logging.debug(f"Found job: {parsed['title']} - Salary: {parsed.get('salary_raw', 'N/A')}")
+                new_jobs.append(parsed)
+    FileManager.save_markdown(new_jobs, os.path.join(directory, "jobs.md"))
+    FileManager.save_summary_markdown(new_jobs, os.path.join(directory, "summary.md"))
+
+def current_pipeline(jobs, directory):
+    job_filter = JobFilter(CONFIG, max_days_old=7, min_salary=60000, now=1_760_000_000)
+    new_jobs = []
+    for page in pages(jobs):
+        batch = {}
+        _, codes = job_filter.evaluate_batch(page, batch)
+        for code, parsed in zip(codes, batch['parsed']):
+            if code is None:
+                logging.debug(f"Found job: {parsed['title']} - Salary: {parsed.get('salary_raw', 'N/A')}")
+                new_jobs.append(parsed)
+    FileManager.save_markdown(new_jobs, os.path.join(directory, "jobs.md"))
+    FileManager.save_summary_markdown(new_jobs, os.path.join(directory, "summary.md"))
+
+def measure(name, pipeline, jobs):
+    with ParseCounter() as counter, tempfile.TemporaryDirectory() as directory:
+        tracemalloc.start()
+        start = time.perf_counter()
+        pipeline(jobs, directory)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"  {name:<8} {counter.calls / len(jobs):.2f} field parses/job, {elapsed:>6.2f}s, peak {peak / 1024 / 1024:>7.1f} MiB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    jobs = make_jobs(args.jobs, random.Random(args.seed))
+    print(f"{args.jobs} jobs in pages of {PAGE_SIZE}")
+    measure("legacy", legacy_pipeline, jobs)
+    measure("reparse", reparse_pipeline, jobs)
+    measure("current", current_pipeline, jobs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Microbenchmarks for SalaryParser and DateParser.
+
+Builds a corpus of SerpApi extension strings in which a few values
+("3 days ago", "Full-time", "$25–$30 an hour") repeat thousands of times and
+a long tail of salaries is rare, as in real search results. Each string goes
+through the same calls JobParser makes (parse_days_ago for dates,
+is_salary_text + parse_salary for the rest). The cases are:
+  - legacy:      the previous implementation (re.findall/re.search with
+                 uncompiled patterns, no memo), copied below
+  - cold:        current parsers (backed by the extension_parser
+                 classifier), memo cleared before the run
+  - warm:        current parsers, memo already filled by the cold run
+  - parse_many:  current batch entry points, which dedupe their input
+All cases must produce the same results.
+
+Usage:
+    python benchmarks/bench_parsers.py [--strings 200000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import extension_parser  # noqa: E402
+from date_parser import DateParser  # noqa: E402
+from salary_parser import SalaryParser  # noqa: E402
+
+COMMON = [
+    "just now", "5 hours ago", "1 day ago", "2 days ago", "3 days ago", "6 days ago", "1 week ago",
+    "30+ days ago", "Full-time", "Part-time", "Contractor", "Internship", "Work from home",
+    "Health insurance", "Dental insurance", "Paid time off", "No degree mentioned",
+    "$25–$30 an hour", "$20 an hour", "$80K–$100K a year", "$120K a year", "$4,000 a month",
+]
+
+def legacy_parse_salary(text):
+    if not text:
+        return None
+    text = text.lower().replace(',', '')
+    multiplier = 1
+    if 'hour' in text or '/hr' in text:
+        multiplier = 2080
+    elif 'month' in text or '/mo' in text:
+        multiplier = 12
+    matches = re.findall(r'\$?(\d+(?:\.\d+)?)(k)?', text)
+    if not matches:
+        return None
+    values = []
+    for amount, suffix in matches:
+        val = float(amount)
+        if suffix == 'k':
+            val *= 1000
+        values.append(val)
+    annual_values = [v * multiplier for v in values]
+    return min(annual_values), max(annual_values)
+
+def legacy_is_salary_text(text):
+    text = text.lower()
+    return any(x in text for x in ['$', 'salary', 'pay', 'compensation']) and any(char.isdigit() for char in text)
+
+def legacy_parse_days_ago(text):
+    if not text:
+        return None
+    text = text.lower().strip()
+    if any(x in text for x in ['just now', 'today', 'hour', 'minute', 'second']):
+        return 0
+    if 'yesterday' in text:
+        return 1
+    match = re.search(r'(\d+)\+?\s*(day|week|month)', text)
+    if match:
+        number = int(match.group(1))
+        unit = match.group(2)
+        if 'day' in unit:
+            return number
+        elif 'week' in unit:
+            return number * 7
+        elif 'month' in unit:
+            return number * 30
+    return None
+
+def make_corpus(count, rng):
+    weights = [1 / (rank + 1) for rank in range(len(COMMON))]
+    corpus = []
+    for _ in range(count):
+        if rng.random() < 0.05:
+            # Long tail: rarely repeated salary ranges
+            low = rng.randrange(40, 200)
+            corpus.append(f"${low}K–${low + rng.randrange(5, 60)}K a year")
+        else:
+            corpus.append(rng.choices(COMMON, weights)[0])
+    return corpus
+
+def is_date(text):
+    return 'ago' in text or 'day' in text
+
+def run_each(texts, parse_days_ago, is_salary_text, parse_salary):
+    return [parse_days_ago(text) if is_date(text) else (parse_salary(text) if is_salary_text(text) else None) for text in texts]
+
+def run_many(texts):
+    dates = [text for text in texts if is_date(text)]
+    salaries = [text for text in texts if not is_date(text) and SalaryParser.is_salary_text(text)]
+    parsed_dates = dict(zip(dates, DateParser.parse_many(dates)))
+    parsed_salaries = dict(zip(salaries, SalaryParser.parse_many(salaries)))
+    return [parsed_dates[text] if is_date(text) else parsed_salaries.get(text) for text in texts]
+
+def clear_memos():
+    extension_parser.classify_extension.cache_clear()
+    extension_parser.classify_salary.cache_clear()
+
+def best_of(repeat, function, setup=None):
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strings", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.strings, random.Random(args.seed))
+    current = (DateParser.parse_days_ago, SalaryParser.is_salary_text, SalaryParser.parse_salary)
+    cases = [
+        ("legacy", lambda: run_each(corpus, legacy_parse_days_ago, legacy_is_salary_text, legacy_parse_salary), None),
+        ("cold", lambda: run_each(corpus, *current), clear_memos),
+        ("warm", lambda: run_each(corpus, *current), None),
+        ("parse_many", lambda: run_many(corpus), clear_memos),
+    ]
+
+    print(f"{args.strings} extension strings, {len(set(corpus))} distinct")
+    baseline = None
+    expected = None
+    for name, function, setup in cases:
+        elapsed, result = best_of(args.repeat, function, setup)
+        if expected is None:
+            baseline, expected = elapsed, result
+        assert result == expected, f"{name} results differ from the legacy parsers"
+        print(f"  {name:<11} {elapsed:>7.3f}s ({args.strings / elapsed:>12,.0f} strings/s, {baseline / elapsed:>5.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Bloom filter snapshot of the job history.
+
+JobHistory writes data/history.bloom next to data/history.json on every save.
+At startup the snapshot is memory-mapped instead of parsing history.json, and
+jobs the filter has never seen (most of them) are answered from it directly.
+
+Rebuild or inspect the snapshot by hand:
+    python src/bloom_filter.py rebuild --history data/history.json --bloom data/history.bloom --fp-rate 0.01
+    python src/bloom_filter.py stats --history data/history.json --bloom data/history.bloom
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import tempfile
+
+def file_fingerprint(path):
+    """blake2b digest of a file's contents, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys, sized for a capacity and target
+    false-positive rate. Bit positions come from double hashing one 128-bit
+    blake2b digest per key.
+
+    Saved filters carry the fingerprint of the file they were built from and
+    are opened with mmap, so opening one costs nothing until it is queried.
+    """
+    _MAGIC = b"JFBLOOM1"
+    # magic, number of bits, number of hashes, entries, target fp rate, source fingerprint
+    _HEADER = struct.Struct("<8sQIQd32s")
+
+    def __init__(self, capacity, fp_rate=0.01):
+        capacity = max(1, capacity)
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.count = 0
+        self.fingerprint = None
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._offset = 0
+        self._mmap = None
+
+    @classmethod
+    def build(cls, keys, fp_rate=0.01):
+        """Builds a filter sized exactly for keys."""
+        keys = list(keys)
+        bloom = cls(len(keys), fp_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        if self._mmap is not None:
+            raise ValueError("A memory-mapped Bloom filter is read-only")
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def might_contain(self, key):
+        """False means key was definitely never added; True means it probably was."""
+        bits, offset = self._bits, self._offset
+        return all(bits[offset + (position >> 3)] & (1 << (position & 7)) for position in self._positions(key))
+
+    def expected_fp_rate(self):
+        """False-positive rate expected for the number of entries added so far."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    @property
+    def nbytes(self):
+        return (self.num_bits + 7) // 8
+
+    def save(self, path, fingerprint=None):
+        """Writes the filter atomically, tagged with the fingerprint of its source file."""
+        self.fingerprint = fingerprint
+        directory = os.path.dirname(path) or '.'
+        fd, temp_path = tempfile.mkstemp(prefix='.bloom-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._HEADER.pack(self._MAGIC, self.num_bits, self.num_hashes, self.count, self.fp_rate, fingerprint or b''))
+                f.write(self._bits[self._offset:self._offset + self.nbytes])
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def open(cls, path):
+        """Memory-maps a saved filter. Raises ValueError if the file is not a valid filter."""
+        with open(path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"{path} is empty")
+        if len(mapped) < cls._HEADER.size:
+            mapped.close()
+            raise ValueError(f"{path} is truncated")
+        magic, num_bits, num_hashes, count, fp_rate, fingerprint = cls._HEADER.unpack_from(mapped)
+        if magic != cls._MAGIC or len(mapped) < cls._HEADER.size + (num_bits + 7) // 8:
+            mapped.close()
+            raise ValueError(f"{path} is not a valid Bloom filter")
+
+        bloom = cls.__new__(cls)
+        bloom.fp_rate = fp_rate
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.count = count
+        bloom.fingerprint = fingerprint
+        bloom._bits = mapped
+        bloom._offset = cls._HEADER.size
+        bloom._mmap = mapped
+        return bloom
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Job history Bloom filter tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("rebuild", "Rebuild the snapshot from the history file."), ("stats", "Show snapshot statistics.")):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("--history", default="data/history.json")
+        command.add_argument("--bloom", default="data/history.bloom")
+    subparsers.choices["rebuild"].add_argument("--fp-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == "rebuild":
+        with open(args.history, 'r') as f:
+            keys = json.load(f).keys()
+        bloom = BloomFilter.build(keys, args.fp_rate)
+        bloom.save(args.bloom, fingerprint=file_fingerprint(args.history))
+        logging.info(f"Rebuilt {args.bloom}: {bloom.count} entries, {bloom.nbytes} bytes, {bloom.num_hashes} hashes, expected false-positive rate {bloom.expected_fp_rate():.3%}")
+    else:
+        bloom = BloomFilter.open(args.bloom)
+        fresh = bloom.fingerprint == file_fingerprint(args.history)
+        logging.info(
+            f"{args.bloom}: {bloom.count} entries, {bloom.nbytes} bytes, {bloom.num_hashes} hashes, "
+            f"expected false-positive rate {bloom.expected_fp_rate():.3%} (target {bloom.fp_rate:.3%}), "
+            f"{'up to date with' if fresh else 'stale for'} {args.history}"
+        )
+        bloom.close()
+
+if __name__ == "__main__":
+    main()
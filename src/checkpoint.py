@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+import threading
+
+class RunCheckpoint:
+    """
+    Append-only journal of the pages fetched during a run, so a crashed run
+    can be resumed without paying for the same API calls again.
+
+    Each line is a JSON record:
+      {"type": "page", "combo": [q, location], "page": n, "jobs": [...], "next_page_token": ...}
+      {"type": "done", "combo": [q, location]}
+    """
+    def __init__(self, path='data/checkpoint.jsonl'):
+        self.path = path
+        self.combos = {}
+        self._lock = threading.Lock()
+        self._ensure_data_dir()
+
+    def _ensure_data_dir(self):
+        """Ensure the directory for the journal exists."""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def start(self, resume=False):
+        """Loads the previous journal when resuming, otherwise starts an empty one."""
+        if resume:
+            self.load()
+        else:
+            self.combos = {}
+            open(self.path, 'w').close()
+
+    def load(self):
+        """Replays the journal into memory. A torn last line (crash mid-write) is ignored."""
+        self.combos = {}
+        if not os.path.exists(self.path):
+            logging.info("No checkpoint journal found. Starting a fresh run.")
+            return
+
+        with open(self.path, 'r') as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"Ignoring unreadable checkpoint record on line {line_number}.")
+                    continue
+                state = self.combos.setdefault(tuple(record["combo"]), {"pages": [], "next_page_token": None, "done": False})
+                if record["type"] == "page":
+                    state["pages"].append(record["jobs"])
+                    state["next_page_token"] = record.get("next_page_token")
+                elif record["type"] == "done":
+                    state["done"] = True
+
+        done = sum(1 for state in self.combos.values() if state["done"])
+        pages = sum(len(state["pages"]) for state in self.combos.values())
+        logging.info(f"Loaded checkpoint: {done} completed searches and {pages} fetched pages.")
+
+    def get(self, combo):
+        """Returns the journaled state of a (query, location) combination, or None."""
+        return self.combos.get(tuple(combo))
+
+    def _append(self, record):
+        line = json.dumps(record, separators=(',', ':')) + "\n"
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_page(self, combo, page, jobs, next_page_token):
+        self._append({
+            "type": "page",
+            "combo": list(combo),
+            "page": page,
+            "jobs": jobs,
+            "next_page_token": next_page_token,
+        })
+
+    def record_done(self, combo):
+        self._append({"type": "done", "combo": list(combo)})
+
+    def clear(self):
+        """Deletes the journal once the run's results are safely persisted."""
+        self.combos = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+            logging.info(f"Cleared checkpoint journal {self.path}")
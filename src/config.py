@@ -45,6 +45,96 @@ class Config:
         except ValueError:
             self.max_pages = 5
 
+        # Number of query/location combinations searched concurrently
+        try:
+            self.search_workers = max(1, int(os.getenv("SEARCH_WORKERS") or 4))
+        except ValueError:
+            self.search_workers = 4
+
+        # Fetch the next page in the background while the current one is processed
+        self.search_prefetch = self._parse_bool(os.getenv("SEARCH_PREFETCH"), default=True)
+
+        # SerpApi transport: "pooled" keeps keep-alive connections open,
+        # "serpapi" uses a new serpapi.GoogleSearch client for every page
+        self.serpapi_transport = (os.getenv("SERPAPI_TRANSPORT") or "pooled").strip().lower()
+        self.serpapi_base_url = os.getenv("SERPAPI_BASE_URL") or "https://serpapi.com"
+        # Record responses to / replay responses from a fixture corpus (see serpapi_replay.py)
+        self.serpapi_record_dir = os.getenv("SERPAPI_RECORD_DIR") or None
+        self.serpapi_replay_dir = os.getenv("SERPAPI_REPLAY_DIR") or None
+
+        # SerpApi budget and rate limiting (0 disables each)
+        try:
+            self.max_api_calls = int(os.getenv("MAX_API_CALLS") or 0)
+        except ValueError:
+            self.max_api_calls = 0
+        try:
+            self.requests_per_second = float(os.getenv("REQUESTS_PER_SECOND") or 0)
+        except ValueError:
+            self.requests_per_second = 0
+
+        # Retry backoff cap and circuit breaker for a failing SerpApi
+        try:
+            self.retry_max_delay = float(os.getenv("RETRY_MAX_DELAY") or 30)
+        except ValueError:
+            self.retry_max_delay = 30
+        try:
+            self.circuit_failure_threshold = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD") or 5)
+        except ValueError:
+            self.circuit_failure_threshold = 5
+        try:
+            self.circuit_cooldown_seconds = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS") or 300)
+        except ValueError:
+            self.circuit_cooldown_seconds = 300
+
+        # History-aware early pagination stop (0 disables each rule)
+        try:
+            self.stop_seen_percent = float(os.getenv("STOP_SEEN_PERCENT") or 0)
+        except ValueError:
+            self.stop_seen_percent = 0
+        try:
+            self.stop_seen_pages = int(os.getenv("STOP_SEEN_PAGES") or 0)
+        except ValueError:
+            self.stop_seen_pages = 0
+
+        # Freshness-based pagination stop: stop when more than this percentage of
+        # a page is older than max_days_old (0 disables)
+        try:
+            self.stop_stale_percent = float(os.getenv("STOP_STALE_PERCENT") or 0)
+        except ValueError:
+            self.stop_stale_percent = 0
+
+        # SerpApi response cache (0 hours disables the cache)
+        try:
+            self.cache_ttl_hours = float(os.getenv("SERPAPI_CACHE_TTL_HOURS") or 6)
+        except ValueError:
+            self.cache_ttl_hours = 6
+        try:
+            self.cache_max_mb = int(os.getenv("SERPAPI_CACHE_MAX_MB") or 100)
+        except ValueError:
+            self.cache_max_mb = 100
+        self.cache_bypass = self._parse_bool(os.getenv("SERPAPI_CACHE_BYPASS"))
+
+        # Job history storage: "json" (data/history.json), "sqlite" (data/history.db)
+        # "compact" (binary digest index, data/history.idx) or "segmented"
+        # (one file per ISO week under data/history/)
+        self.history_backend = (os.getenv("HISTORY_BACKEND") or "json").strip().lower()
+        # Merge concurrent writers' entries into data/history.json instead of overwriting them
+        self.history_merge_on_save = self._parse_bool(os.getenv("HISTORY_MERGE_ON_SAVE"), default=True)
+        # Bloom filter snapshot (data/history.bloom) for a fast cold start
+        self.history_bloom = self._parse_bool(os.getenv("HISTORY_BLOOM"), default=True)
+        try:
+            self.history_bloom_fp_rate = float(os.getenv("HISTORY_BLOOM_FP_RATE") or 0.01)
+        except ValueError:
+            self.history_bloom_fp_rate = 0.01
+        if not 0 < self.history_bloom_fp_rate < 1:
+            self.history_bloom_fp_rate = 0.01
+
+        # Remember rejected jobs (data/rejections.json) so they aren't re-evaluated every run
+        self.rejection_cache = self._parse_bool(os.getenv("REJECTION_CACHE"), default=True)
+
+        # Reorder the filter rules during a run so cheap, selective ones run first
+        self.filter_adaptive_order = self._parse_bool(os.getenv("FILTER_ADAPTIVE_ORDER"), default=True)
+
         # Salary filtering
         try:
             self.min_salary = int(os.getenv("MIN_SALARY") or 0)
@@ -98,6 +188,12 @@ class Config:
         else:
             self.email_receivers = []
 
+    def _parse_bool(self, env_str, default=False):
+        """Parses a boolean-like string ("true", "1", "yes", "on")."""
+        if env_str is None or env_str.strip() == "":
+            return default
+        return env_str.strip().lower() in ("1", "true", "yes", "on")
+
     def _parse_list(self, env_str):
         """Parses a JSON list string or comma-separated string into a list."""
         if not env_str:
@@ -1,4 +1,18 @@
-import re
+import time
+from extension_parser import classify_extension
+
+SECONDS_PER_DAY = 86400
+
+def resolve_posted_at(days_ago, fetched_at=None):
+    """
+    The Unix time a job was posted, counting days_ago back from fetched_at
+    (when the relative date was fetched; now if None). None if days_ago is.
+    """
+    if days_ago is None:
+        return None
+    if fetched_at is None:
+        fetched_at = time.time()
+    return int(fetched_at) - days_ago * SECONDS_PER_DAY
 
 class DateParser:
     @staticmethod
@@ -6,30 +20,24 @@ class DateParser:
         """
         Parses a relative date string and returns the number of days ago.
         Returns None if the date cannot be parsed.
+        Uses the same memoized classifier as JobParser (see extension_parser),
+        so both always agree on a job's age.
         """
-        if not text:
-            return None
-            
-        text = text.lower().strip()
-        
-        # Immediate matches
-        if any(x in text for x in ['just now', 'today', 'hour', 'minute', 'second']):
-            return 0
-        if 'yesterday' in text:
-            return 1
-            
-        # Regex for "X days/weeks/months ago"
-        # Matches: "2 days ago", "1 week ago", "30+ days ago"
-        match = re.search(r'(\d+)\+?\s*(day|week|month)', text)
-        if match:
-            number = int(match.group(1))
-            unit = match.group(2)
-            
-            if 'day' in unit:
-                return number
-            elif 'week' in unit:
-                return number * 7
-            elif 'month' in unit:
-                return number * 30
-                
-        return None
+        return classify_extension(text).days_ago
+
+    @staticmethod
+    def parse_posted_at(text, fetched_at=None):
+        """
+        Resolves a relative date string into the Unix time the job was posted,
+        anchored to fetched_at, the Unix time the string was fetched ("3 days
+        ago" fetched at T -> T - 3 days). Unlike days_ago, the result stays
+        correct however long the job is cached. Returns None if the date
+        cannot be parsed.
+        """
+        return resolve_posted_at(DateParser.parse_days_ago(text), fetched_at)
+
+    @staticmethod
+    def parse_many(texts):
+        """parse_days_ago for a list of strings, parsing each distinct string once."""
+        results = {text: DateParser.parse_days_ago(text) for text in set(texts)}
+        return [results[text] for text in texts]
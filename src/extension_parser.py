@@ -0,0 +1,171 @@
+"""
+Single-pass classifier for SerpApi job extensions.
+
+Each extension string ("3 days ago", "Full-time", "$25–$30 an hour",
+"Health insurance") is tokenized once. The same scan tags it as a posting
+date, salary, schedule, benefits or unknown item and collects the numbers
+needed for days_ago, the annual salary range, the currency and the pay
+period. Results are memoized per raw string, since the same extensions
+repeat across thousands of jobs.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+POSTED_DATE = "posted_date"
+SALARY = "salary"
+SCHEDULE = "schedule"
+BENEFITS = "benefits"
+UNKNOWN = "unknown"
+
+ExtensionInfo = namedtuple(
+    "ExtensionInfo",
+    ["kind", "days_ago", "min_salary", "max_salary", "currency", "pay_period"],
+)
+EMPTY = ExtensionInfo(UNKNOWN, None, None, None, None, None)
+
+# Amounts ($50k, 80000, 50.50), currency symbols, '+' ("30+ days"), '/' ("/hr") and words
+_TOKEN = re.compile(r'(\d+(?:\.\d+)?)(k)?|([$€£₹¥])|(\+)|(/)|([a-z]+(?:-[a-z]+)*)')
+
+_CURRENCY_SYMBOLS = {'€': 'EUR', '£': 'GBP', '₹': 'INR', '¥': 'JPY'}
+_CURRENCY_CODES = {'usd', 'cad', 'eur', 'gbp', 'aud', 'inr'}
+_SALARY_PREFIXES = ('salar', 'pay', 'compensation', 'wage')
+_SCHEDULE_WORDS = {'full-time', 'part-time', 'contractor', 'contract', 'internship', 'temporary', 'temp-to-hire', 'volunteer'}
+_BENEFIT_WORDS = {'insurance', 'dental', 'vision', 'health', 'paid', 'pto', 'retirement', 'pension', 'benefits'}
+# Pay period of a whole word, and the multiplier to an annual amount. The
+# abbreviations only count after a slash ("$50/hr"), not as words on their own.
+_PERIOD_WORDS = {
+    'hour': 'hour', 'hours': 'hour', 'hourly': 'hour',
+    'day': 'day', 'days': 'day', 'daily': 'day',
+    'week': 'week', 'weeks': 'week', 'weekly': 'week',
+    'month': 'month', 'months': 'month', 'monthly': 'month',
+    'year': 'year', 'years': 'year', 'yearly': 'year', 'annual': 'year', 'annually': 'year', 'annum': 'year',
+}
+_PERIOD_ABBREVIATIONS = {'hr': 'hour', 'hrs': 'hour', 'wk': 'week', 'mo': 'month', 'yr': 'year'}
+_ANNUAL = {'hour': 2080, 'month': 12, 'week': 52, 'day': 260, 'year': 1, None: 1}
+# Days per time unit of a relative date ("5 hours ago" is today)
+_UNIT_DAYS = (('second', 0), ('minute', 0), ('hour', 0), ('day', 1), ('week', 7), ('month', 30))
+# Hourly and monthly rates take precedence when several periods are mentioned
+_PERIOD_PRIORITY = {'hour': 0, 'month': 1, 'week': 2, 'day': 3, 'year': 4}
+
+@lru_cache(maxsize=4096)
+def classify_extension(text):
+    """
+    Classifies one extension string. Returns an ExtensionInfo:
+      - kind: POSTED_DATE, SALARY, SCHEDULE, BENEFITS or UNKNOWN
+      - days_ago: for posting dates ("3 days ago" -> 3, "30+ days ago" -> 30)
+      - min_salary, max_salary: the amounts found, annualized by the pay
+        period ("$25–$30 an hour" -> 52000.0, 62400.0)
+      - currency: an ISO code ("EUR", "CAD") or "$", which SerpApi uses for
+        several currencies
+      - pay_period: "hour", "day", "week", "month", "year" or None
+    """
+    return _classify(text, known_salary=False)
+
+@lru_cache(maxsize=1024)
+def classify_salary(text):
+    """
+    classify_extension for text already known to be a salary, such as
+    SerpApi's detected_extensions.salary: its amounts count without a
+    currency or salary word ("150 a day" is a daily rate, annualized to
+    39000.0).
+    """
+    return _classify(text, known_salary=True)
+
+def _classify(text, known_salary):
+    if not text:
+        return EMPTY
+    amounts = []
+    currency = None
+    pay_period = None
+    salary_word = False
+    schedule = False
+    benefits = False
+    # Days of a relative date ("3 days ago", "5 hours ago", "Yesterday"),
+    # None unless the text has that shape
+    date_days = None
+    # Days of a counted time unit ("3 days") right before the current token
+    unit_days = None
+    last_amount = None
+    last_word = None
+    previous = None
+
+    for amount, k, symbol, plus, slash, word in _TOKEN.findall(text.lower().replace(',', '')):
+        if amount:
+            value = float(amount) * (1000 if k else 1)
+            amounts.append(value)
+            last_amount = value
+            previous = 'amount'
+            unit_days = None
+            continue
+        if symbol:
+            currency = currency or _CURRENCY_SYMBOLS.get(symbol, symbol)
+            previous = 'symbol'
+            unit_days = None
+            continue
+        if plus:
+            # "30+ days" still counts 30 as the number of the unit
+            continue
+        if slash:
+            previous = 'slash'
+            unit_days = None
+            continue
+        if word in ('a', 'an'):
+            # "an hour ago", "$50,000 a year": one of the unit that follows
+            last_amount = 1
+            previous = 'amount'
+            continue
+
+        period = _PERIOD_ABBREVIATIONS.get(word) if previous == 'slash' else None
+        period = period or _PERIOD_WORDS.get(word)
+        if period and (pay_period is None or _PERIOD_PRIORITY[period] < _PERIOD_PRIORITY[pay_period]):
+            pay_period = period
+        if word == 'ago' and unit_days is not None:
+            date_days = unit_days
+        elif word == 'today' or (word == 'now' and last_word == 'just'):
+            date_days = 0
+        elif word == 'yesterday':
+            date_days = 1
+        unit_days = None
+        if previous == 'amount':
+            for prefix, days in _UNIT_DAYS:
+                if word.startswith(prefix):
+                    unit_days = int(last_amount) * days
+                    break
+        if word in _CURRENCY_CODES:
+            currency = word.upper()
+        elif word.startswith(_SALARY_PREFIXES):
+            salary_word = True
+        elif word in _SCHEDULE_WORDS:
+            schedule = True
+        elif word in _BENEFIT_WORDS:
+            benefits = True
+        last_word = word
+        previous = 'word'
+
+    min_salary = max_salary = None
+    if amounts:
+        multiplier = _ANNUAL[pay_period]
+        min_salary = min(amounts) * multiplier
+        max_salary = max(amounts) * multiplier
+    else:
+        # "Day shift" mentions a period, but pays nothing
+        pay_period = None
+
+    if amounts and (known_salary or currency or salary_word):
+        kind = SALARY
+    elif date_days is not None:
+        kind = POSTED_DATE
+    elif schedule:
+        kind = SCHEDULE
+    elif benefits:
+        kind = BENEFITS
+    else:
+        kind = UNKNOWN
+
+    days_ago = None
+    if kind == POSTED_DATE:
+        # The numbers of a date are not amounts
+        min_salary = max_salary = currency = pay_period = None
+        days_ago = date_days
+    return ExtensionInfo(kind, days_ago, min_salary, max_salary, currency, pay_period)
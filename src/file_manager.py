@@ -1,5 +1,6 @@
 import json
 import logging
+from datetime import datetime
 from job_parser import JobParser
 
 class FileManager:
@@ -18,13 +19,14 @@ class FileManager:
         """
         Saves a summary of the job data to a Markdown file.
         Used for the GitHub Issue body to avoid character limits.
+        jobs can be raw SerpApi jobs or ParsedJob objects.
         """
         logging.info(f"Saving Summary Markdown data to {filename}...")
         
         # Group jobs by search_location
         jobs_by_location = {}
         for job in jobs:
-            parsed_job = JobParser.parse_job(job)
+            parsed_job = JobParser.ensure_parsed(job)
             # Use 'Unknown Location' if search_location is missing
             loc = parsed_job.get('search_location', 'Unknown Location')
             if loc not in jobs_by_location:
@@ -57,13 +59,14 @@ class FileManager:
         """
         Saves the parsed job data to a Markdown file, grouped by search location.
         Includes a summary table and collapsible sections.
+        jobs can be raw SerpApi jobs or ParsedJob objects.
         """
         logging.info(f"Saving Markdown data to {filename}...")
         
         # Group jobs by search_location
         jobs_by_location = {}
         for job in jobs:
-            parsed_job = JobParser.parse_job(job)
+            parsed_job = JobParser.ensure_parsed(job)
             # Use 'Unknown Location' if search_location is missing
             loc = parsed_job.get('search_location', 'Unknown Location')
             if loc not in jobs_by_location:
@@ -102,6 +105,9 @@ class FileManager:
                     company = job['company']
                     job_location = job['location']
                     posted_date = job['posted_date']
+                    if job['posted_at'] is not None:
+                        # The relative date is as of the fetch, so also show the absolute one
+                        posted_date = f"{posted_date} ({datetime.fromtimestamp(job['posted_at']).strftime('%Y-%m-%d')})"
                     link = job['link']
                     salary = job.get('salary_raw', 'N/A')
 
@@ -121,4 +127,28 @@ class FileManager:
                 
                 f.write("</details>\n\n")
         
-        logging.info(f"Job results summary saved to {filename}")
\ No newline at end of file
+        logging.info(f"Job results summary saved to {filename}")
+
+    @staticmethod
+    def save_filter_stats(stats, filename):
+        """
+        Saves the per-rule filter statistics of this run (see JobFilter.stats)
+        to a Markdown table, in the order the rules ended the run.
+        """
+        logging.info(f"Saving filter statistics to {filename}...")
+        with open(filename, 'w', encoding="utf-8") as f:
+            f.write("# Filter Statistics\n\n")
+            if not stats:
+                f.write("No filter rules were run.\n")
+                logging.info(f"Filter statistics saved to {filename}")
+                return
+
+            f.write("| Position | Rule | Evaluated | Rejected | Rejection Rate | Total Time (ms) | Avg Time (µs) |\n")
+            f.write("| :---: | :--- | ---: | ---: | ---: | ---: | ---: |\n")
+            for row in stats:
+                f.write(
+                    f"| {row['position']} | {row['rule']} | {row['evaluated']} | {row['rejected']} | "
+                    f"{row['rejection_rate']:.1%} | {row['total_ms']:.2f} | {row['avg_us']:.1f} |\n"
+                )
+            f.write(f"\n**Final rule order:** {' → '.join(row['rule'] for row in stats)}\n")
+        logging.info(f"Filter statistics saved to {filename}")
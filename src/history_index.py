@@ -0,0 +1,257 @@
+"""
+Compact binary job history.
+
+Select it with HISTORY_BACKEND=compact. Instead of a dict of job id strings to
+ISO timestamp strings, every entry is a 64-bit key digest plus an epoch-seconds
+timestamp (16 bytes), stored in sorted arrays and persisted as data/history.idx.
+An existing data/history.json is imported the first time the index is created.
+"""
+import array
+import bisect
+import hashlib
+import heapq
+import json
+import logging
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from job_history import JobHistory, copy_file_mode
+
+def key_digest(job_id):
+    """
+    64-bit digest of a history key. With 1M entries the chance of any two
+    keys colliding is about 3 in 100 million.
+    """
+    return int.from_bytes(hashlib.blake2b(job_id.encode('utf-8'), digest_size=8).digest(), 'big')
+
+class CompactHistoryIndex:
+    """
+    Set of history keys with their last-seen time, stored as parallel sorted
+    arrays of 64-bit digests and epoch seconds.
+
+    New keys are kept in a small dict and merged into the sorted arrays when it
+    grows beyond merge_threshold (or before saving/expiring), so adding a key
+    never re-sorts the whole index. Thread-safe.
+    """
+    _MAGIC = b"JFHIDX01"
+    _HEADER = struct.Struct("<8sQ")
+
+    def __init__(self, merge_threshold=4096):
+        self.merge_threshold = merge_threshold
+        self._keys = array.array('Q')
+        self._timestamps = array.array('q')
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_items(cls, items, merge_threshold=4096):
+        """Builds an index from (job_id, epoch_seconds) pairs."""
+        index = cls(merge_threshold=merge_threshold)
+        # Sorted by digest, then timestamp, so the last duplicate is the latest
+        entries = sorted((key_digest(job_id), int(timestamp)) for job_id, timestamp in items)
+        keys, timestamps = index._keys, index._timestamps
+        for digest, timestamp in entries:
+            if keys and keys[-1] == digest:
+                timestamps[-1] = timestamp
+            else:
+                keys.append(digest)
+                timestamps.append(timestamp)
+        return index
+
+    def __len__(self):
+        with self._lock:
+            return len(self._keys) + len(self._pending)
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the stored entries."""
+        with self._lock:
+            return (self._keys.itemsize + self._timestamps.itemsize) * len(self._keys) + sys.getsizeof(self._pending)
+
+    def _find(self, digest, lo=0):
+        """Returns the position of digest in the sorted keys, or -1."""
+        position = bisect.bisect_left(self._keys, digest, lo)
+        if position < len(self._keys) and self._keys[position] == digest:
+            return position
+        return -1
+
+    def add(self, job_id, timestamp=None):
+        """Records job_id as seen at timestamp (epoch seconds, default now)."""
+        digest = key_digest(job_id)
+        timestamp = int(time.time() if timestamp is None else timestamp)
+        with self._lock:
+            position = self._find(digest)
+            if position >= 0:
+                self._timestamps[position] = timestamp
+                return
+            self._pending[digest] = timestamp
+            if len(self._pending) >= self.merge_threshold:
+                self._merge()
+
+    def contains(self, job_id):
+        digest = key_digest(job_id)
+        with self._lock:
+            return digest in self._pending or self._find(digest) >= 0
+
+    def contains_many(self, job_ids):
+        """Returns a list of booleans, one per job id, checked under a single lock."""
+        digests = [key_digest(job_id) for job_id in job_ids]
+        results = []
+        with self._lock:
+            keys, pending, size = self._keys, self._pending, len(self._keys)
+            for digest in digests:
+                position = bisect.bisect_left(keys, digest)
+                results.append((position < size and keys[position] == digest) or digest in pending)
+        return results
+
+    def _merge(self):
+        """Merges the pending keys into the sorted arrays. Must be called with the lock held."""
+        if not self._pending:
+            return
+        keys = array.array('Q')
+        timestamps = array.array('q')
+        pending = sorted(self._pending.items())
+        for digest, timestamp in heapq.merge(zip(self._keys, self._timestamps), pending):
+            keys.append(digest)
+            timestamps.append(timestamp)
+        self._keys, self._timestamps = keys, timestamps
+        self._pending = {}
+
+    def remove_older_than(self, cutoff):
+        """Drops entries last seen before cutoff (epoch seconds). Returns how many were removed."""
+        with self._lock:
+            self._merge()
+            keys = array.array('Q')
+            timestamps = array.array('q')
+            for digest, timestamp in zip(self._keys, self._timestamps):
+                if timestamp >= cutoff:
+                    keys.append(digest)
+                    timestamps.append(timestamp)
+            removed = len(self._keys) - len(keys)
+            self._keys, self._timestamps = keys, timestamps
+        return removed
+
+    def save(self, path):
+        """
+        Writes the index as a header followed by the little-endian key and
+        timestamp arrays. The file is written to a temporary file and renamed
+        over path, so a crash mid-save leaves the previous index intact.
+        """
+        with self._lock:
+            self._merge()
+            keys, timestamps = array.array('Q', self._keys), array.array('q', self._timestamps)
+        if sys.byteorder == 'big':
+            keys.byteswap()
+            timestamps.byteswap()
+        directory = os.path.dirname(path) or '.'
+        fd, temp_path = tempfile.mkstemp(prefix='.history-idx-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._HEADER.pack(self._MAGIC, len(keys)))
+                keys.tofile(f)
+                timestamps.tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+            copy_file_mode(temp_path, path)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path, merge_threshold=4096):
+        """Reads an index written by save(). Raises ValueError if the file is not an index."""
+        index = cls(merge_threshold=merge_threshold)
+        with open(path, 'rb') as f:
+            header = f.read(cls._HEADER.size)
+            if len(header) != cls._HEADER.size:
+                raise ValueError(f"{path} is truncated")
+            magic, count = cls._HEADER.unpack(header)
+            if magic != cls._MAGIC:
+                raise ValueError(f"{path} is not a history index")
+            try:
+                index._keys.fromfile(f, count)
+                index._timestamps.fromfile(f, count)
+            except EOFError:
+                raise ValueError(f"{path} is truncated")
+        if sys.byteorder == 'big':
+            index._keys.byteswap()
+            index._timestamps.byteswap()
+        return index
+
+class CompactJobHistory(JobHistory):
+    """
+    JobHistory backed by a CompactHistoryIndex persisted to a binary file.
+    Only key digests are kept, so the original job ids cannot be listed.
+    """
+    def __init__(self, history_file='data/history.idx', json_file=None):
+        self.history_file = history_file
+        self.json_file = json_file
+        self.index = CompactHistoryIndex()
+        self._ensure_data_dir()
+        self.load_history()
+
+    def load_history(self):
+        """Loads the index file, importing json_file if the index does not exist yet."""
+        if os.path.exists(self.history_file):
+            try:
+                self.index = CompactHistoryIndex.load(self.history_file)
+                logging.info(f"Loaded job history index from {self.history_file} ({len(self.index)} entries)")
+            except (ValueError, IOError) as e:
+                logging.error(f"Failed to load history index: {e}. Starting with empty history.")
+                self.index = CompactHistoryIndex()
+        elif self.json_file and os.path.exists(self.json_file):
+            logging.info(f"No history index found. Importing {self.json_file}...")
+            self.index = CompactHistoryIndex.from_items(self._read_json(self.json_file))
+            logging.info(f"Imported {len(self.index)} entries from {self.json_file}")
+        else:
+            logging.info("No history index found. Starting with empty history.")
+            self.index = CompactHistoryIndex()
+
+    @staticmethod
+    def _read_json(json_file):
+        """Yields (job_id, epoch seconds) pairs from a history.json file, skipping invalid timestamps."""
+        try:
+            with open(json_file, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logging.error(f"Failed to read history file {json_file}: {e}")
+            return
+        for job_id, timestamp in data.items():
+            try:
+                yield job_id, datetime.fromisoformat(timestamp).timestamp()
+            except (TypeError, ValueError):
+                logging.warning(f"Skipping history entry {job_id} with invalid timestamp {timestamp!r}.")
+
+    def save_history(self):
+        """Save the index to its binary file. Returns True on success."""
+        try:
+            self.index.save(self.history_file)
+            logging.info(f"Saved job history index to {self.history_file}")
+            return True
+        except IOError as e:
+            logging.error(f"Failed to save history index: {e}")
+            return False
+
+    def is_seen(self, job):
+        """Check if a job has been seen before."""
+        return self.index.contains(self._generate_id(job))
+
+    def is_seen_many(self, jobs):
+        """Checks a whole page of jobs at once. Returns one boolean per job."""
+        return self.index.contains_many([self._generate_id(job) for job in jobs])
+
+    def add_job(self, job):
+        """Add a job to the history."""
+        self.index.add(self._generate_id(job))
+
+    def cleanup_old_entries(self, days=45):
+        """Remove entries older than the specified number of days."""
+        removed_count = self.index.remove_older_than(time.time() - days * 86400)
+        if removed_count > 0:
+            logging.info(f"Cleaned up {removed_count} old entries from history.")
+            self.save_history()
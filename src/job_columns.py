@@ -0,0 +1,145 @@
+"""
+Columnar view of a page of raw SerpApi jobs, used by JobFilter.evaluate_batch.
+
+String fields (lowercased title, company and schedule type) are dictionary
+encoded: each distinct value is stored once and every job holds the index of
+its value. A predicate then runs once per distinct value and is mapped back
+onto the jobs with one lookup each. days_ago, posted_at and max_salary are
+float columns with NaN for unknown values, so the age and salary checks are
+plain comparisons. Only the field a rule asks about is parsed, only for the rows
+it asks about, and once for all jobs with the same extensions. The parsed
+fields are kept in a ParsedJob view per row, which the caller can reuse for
+the jobs that pass.
+
+NumPy is used when it is installed; otherwise the columns are plain lists
+and the results are the same.
+"""
+from job_parser import ParsedJob
+
+try:
+    import numpy as np
+except ImportError:  # optional: fall back to pure Python columns
+    np = None
+
+_NAN = float('nan')
+_MISSING = object()
+
+class EncodedColumn:
+    """A dictionary-encoded string column."""
+    def __init__(self, raw_values, transform=str.lower):
+        index = {}
+        codes = [index.setdefault(value, len(index)) for value in raw_values]
+        # Transform (lowercase) each distinct raw value only once
+        self.values = [transform(value) for value in index]
+        self.codes = np.asarray(codes, dtype=np.intp) if np is not None else codes
+
+    def mask(self, predicate, rows):
+        """Returns predicate(value) for each of rows, evaluating each distinct value once."""
+        if np is not None:
+            row_codes = self.codes[rows]
+            table = np.zeros(len(self.values), dtype=bool)
+            for code in np.unique(row_codes):
+                table[code] = predicate(self.values[code])
+            return table[row_codes]
+        row_codes = [self.codes[i] for i in rows]
+        table = {code: bool(predicate(self.values[code])) for code in set(row_codes)}
+        return [table[code] for code in row_codes]
+
+class JobColumns:
+    """
+    Lazily built columns over a list of raw jobs. Rows are job indices: an
+    intp array with NumPy, a list without it.
+    """
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self._columns = {}
+        self._parsed = {}
+        self._views = [None] * len(jobs)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def all_rows(self):
+        if np is not None:
+            return np.arange(len(self.jobs), dtype=np.intp)
+        return list(range(len(self.jobs)))
+
+    def take(self, rows):
+        """The raw jobs at rows."""
+        jobs = self.jobs
+        return [jobs[i] for i in rows]
+
+    def split(self, rows, mask):
+        """Splits rows into (rejected, kept) by a boolean mask aligned with rows."""
+        if np is not None:
+            mask = np.asarray(mask, dtype=bool)
+            return rows[mask], rows[~mask]
+        rejected = [i for i, flag in zip(rows, mask) if flag]
+        kept = [i for i, flag in zip(rows, mask) if not flag]
+        return rejected, kept
+
+    def column(self, name):
+        """The encoded 'title', 'company' or 'schedule' column."""
+        column = self._columns.get(name)
+        if column is None:
+            if name == 'title':
+                raw = [job.get('title', '') for job in self.jobs]
+            elif name == 'company':
+                raw = [job.get('company_name', '') for job in self.jobs]
+            elif name == 'schedule':
+                raw = [job.get('detected_extensions', {}).get('schedule_type', '') for job in self.jobs]
+            else:
+                raise KeyError(name)
+            column = self._columns[name] = EncodedColumn(raw)
+        return column
+
+    def view(self, i):
+        """The ParsedJob of row i, created once and kept for the caller (see JobFilter.evaluate_batch)."""
+        view = self._views[i]
+        if view is None:
+            view = self._views[i] = ParsedJob(self.jobs[i])
+        return view
+
+    def views(self):
+        """The ParsedJob of every row, in order."""
+        return [self.view(i) for i in range(len(self.jobs))]
+
+    def numeric(self, name, rows):
+        """
+        The 'days_ago', 'posted_at' or 'max_salary' values of rows, NaN where
+        unknown. Only that field's group is parsed, once per distinct set of
+        the fields it depends on, and rows with the same inputs share the
+        parsed group through their ParsedJob views.
+        """
+        if name in ('days_ago', 'posted_at'):
+            group, key_of = 'date', self._date_key
+        else:
+            group, key_of = 'salary', self._salary_key
+        cache = self._parsed.setdefault(group, {})
+        values = []
+        for i in rows:
+            view = self.view(i)
+            key = key_of(self.jobs[i])
+            fields = cache.get(key)
+            if fields is None:
+                fields = cache[key] = view.date_fields() if group == 'date' else view.salary_fields()
+            elif group == 'date':
+                view.share_fields(date=fields)
+            else:
+                view.share_fields(salary=fields)
+            value = getattr(view, name)
+            values.append(_NAN if value is None else value)
+        if np is not None:
+            return np.asarray(values, dtype=float)
+        return values
+
+    @staticmethod
+    def _date_key(job):
+        # posted_at also depends on when the job was fetched
+        detected = job.get('detected_extensions') or {}
+        return tuple(job.get('extensions') or ()), detected.get('posted_at', _MISSING), job.get('fetched_at')
+
+    @staticmethod
+    def _salary_key(job):
+        detected = job.get('detected_extensions') or {}
+        return tuple(job.get('extensions') or ()), detected.get('salary', _MISSING)
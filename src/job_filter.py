@@ -1,51 +1,264 @@
 import logging
 import re
+import time
+from functools import lru_cache
 from urllib.parse import urlparse
+from date_parser import SECONDS_PER_DAY
+from job_columns import JobColumns, np
+from job_parser import JobParser
+
+class FilterRule:
+    """One check of the JobFilter pipeline, with its statistics for the run."""
+    def __init__(self, code, check, check_batch):
+        self.code = code
+        # check(job, context) returns a rejection reason, or None to accept
+        self.check = check
+        # check_batch(columns, rows) returns a rejection mask aligned with rows
+        self.check_batch = check_batch
+        self.evaluated = 0
+        self.rejected = 0
+        self.seconds = 0.0
+
+    @property
+    def rejection_rate(self):
+        return self.rejected / self.evaluated if self.evaluated else 0.0
+
+    @property
+    def avg_seconds(self):
+        return self.seconds / self.evaluated if self.evaluated else 0.0
+
+    def rank(self):
+        """
+        Average cost divided by rejection rate, i.e. seconds spent per job
+        rejected. Lower ranks run first; rules that never rejected run last.
+        """
+        if not self.rejected:
+            return float('inf')
+        return self.seconds / self.rejected
 
 class JobFilter:
-    def __init__(self, config):
+    # Reason codes returned by evaluate()
+    BLACKLIST = "blacklist"
+    KEYWORD = "keyword"
+    SCHEDULE = "schedule"
+    SOURCE = "source"
+    AGE = "age"
+    SALARY = "salary"
+
+    _WORD = re.compile(r'\w+')
+
+    def __init__(self, config, max_days_old=None, min_salary=0, adaptive=False, reorder_interval=200, now=None):
         self.blacklist_companies = [c.lower() for c in config.blacklist_companies]
         self.exclude_keywords = [k.lower() for k in config.exclude_keywords]
+        self._keyword_patterns = [re.compile(self._keyword_pattern(k)) for k in self.exclude_keywords]
+        # Plain words (\bword\b) match exactly when they equal one of the title's
+        # \w+ runs, so they are checked with one set lookup per title word. The
+        # rest ('sr.', 'c++', 'full stack') are combined into one alternation, so
+        # a title is scanned once instead of once per keyword.
+        self._keyword_words = {k for k in self.exclude_keywords if self._WORD.fullmatch(k) and k[0].isalnum() and k[-1].isalnum()}
+        self._keyword_others = [(k, p) for k, p in zip(self.exclude_keywords, self._keyword_patterns) if k not in self._keyword_words]
+        self._keyword_matcher = re.compile('|'.join(f'(?:{p.pattern})' for _, p in self._keyword_others)) if self._keyword_others else None
+        # Configured position of each keyword, to report the first one that matches
+        self._keyword_order = {}
+        for position, keyword in enumerate(self.exclude_keywords):
+            self._keyword_order.setdefault(keyword, position)
         self.schedule_types = [s.lower() for s in config.schedule_types]
         if getattr(config, "trusted_domains", None):
             self.trusted_domains = [d.lower() for d in config.trusted_domains]
         else:
             # None/empty means domain filtering disabled.
             self.trusted_domains = None
+        self._domain_index = DomainIndex(self.trusted_domains)
+
+        # The age and salary rules need the parsed job, so they are only
+        # added when enabled and start after the cheap field checks
+        self.max_days_old = max_days_old
+        self.min_salary = min_salary
+        # Jobs posted before this Unix time are too old. Postings are compared
+        # by their absolute posted_at, so jobs fetched earlier (cached or
+        # replayed results) age correctly without being reparsed.
+        self.age_cutoff = None
+        if max_days_old is not None:
+            self.age_cutoff = int(time.time() if now is None else now) - max_days_old * SECONDS_PER_DAY
+        self.rules = [
+            FilterRule(self.BLACKLIST, self._check_blacklist, self._batch_blacklist),
+            FilterRule(self.KEYWORD, self._check_keywords, self._batch_keywords),
+            FilterRule(self.SCHEDULE, self._check_schedule, self._batch_schedule),
+            FilterRule(self.SOURCE, self._check_source, self._batch_source),
+        ]
+        if max_days_old is not None:
+            self.rules.append(FilterRule(self.AGE, self._check_age, self._batch_age))
+        if min_salary > 0:
+            self.rules.append(FilterRule(self.SALARY, self._check_salary, self._batch_salary))
+        # Reorder the rules by observed cost per rejection every reorder_interval jobs
+        self.adaptive = adaptive
+        self.reorder_interval = max(1, reorder_interval)
+        self._evaluations = 0
 
     def is_valid(self, job):
         """
         Checks if a job is valid based on blacklist, keywords, schedule type, and application sources.
         Returns (bool, reason).
         """
-        title = job.get('title', '').lower()
-        company = job.get('company_name', '').lower()
-        schedule_type = job.get('detected_extensions', {}).get('schedule_type', '').lower()
+        code, reason = self.evaluate(job)
+        return code is None, reason
+
+    def evaluate(self, job, context=None):
+        """
+        Like is_valid, but returns (reason_code, reason) where reason_code is
+        None for a valid job, or the code of the first rule that rejected it
+        (BLACKLIST, KEYWORD, SCHEDULE, SOURCE, AGE or SALARY).
+
+        context is an optional dict shared by the rules for this job; if a
+        rule parsed the job, the JobParser result is left in context['parsed'].
+        """
+        if context is None:
+            context = {}
+        code, reason = None, None
+        for rule in self.rules:
+            start = time.perf_counter()
+            reason = rule.check(job, context)
+            rule.seconds += time.perf_counter() - start
+            rule.evaluated += 1
+            if reason:
+                rule.rejected += 1
+                code = rule.code
+                break
+        else:
+            reason = None
+
+        self._evaluations += 1
+        if self.adaptive and self._evaluations % self.reorder_interval == 0:
+            self.reorder()
+        return code, reason
+
+    def evaluate_batch(self, jobs, context=None):
+        """
+        Evaluates a page of jobs column by column (see job_columns.py) instead
+        of job by job. Returns (surviving, codes): the indices of the valid
+        jobs in order, and one reason code per job (None for valid jobs).
+
+        Like evaluate, context is an optional dict: context['parsed'] is set
+        to one ParsedJob per job, holding whatever the age and salary rules
+        parsed, so accepted jobs don't have to be parsed again.
+
+        Each rule only looks at the jobs the earlier rules kept, in the current
+        rule order, so the result matches calling evaluate on every job. With
+        adaptive ordering the rules are only reordered between batches.
+        """
+        columns = JobColumns(jobs)
+        codes = [None] * len(jobs)
+        rows = columns.all_rows()
+        for rule in self.rules:
+            if not len(rows):
+                break
+            start = time.perf_counter()
+            mask = rule.check_batch(columns, rows)
+            rejected, kept = columns.split(rows, mask)
+            rule.seconds += time.perf_counter() - start
+            rule.evaluated += len(rows)
+            rule.rejected += len(rejected)
+            for i in rejected:
+                codes[i] = rule.code
+            rows = kept
+
+        evaluations = self._evaluations
+        self._evaluations += len(jobs)
+        if self.adaptive and evaluations // self.reorder_interval != self._evaluations // self.reorder_interval:
+            self.reorder()
+        if context is not None:
+            context['parsed'] = columns.views()
+        return [int(i) for i in rows], codes
+
+    def describe(self, job, code, parsed_job=None):
+        """
+        The rejection reason the rule with the given code gives for job, e.g.
+        to log batch results. Pass the job's ParsedJob from evaluate_batch's
+        context['parsed'] so the age and salary rules don't parse it again.
+        """
+        context = {} if parsed_job is None else {'parsed': parsed_job}
+        for rule in self.rules:
+            if rule.code == code:
+                return rule.check(job, context)
+        return None
+
+    def reorder(self):
+        """
+        Sorts the rules so the ones that reject the most jobs per second spent
+        run first. Rules that haven't rejected anything yet go last, keeping
+        their relative order. Only the reported reason can change: a job is
+        rejected if any rule rejects it, whatever the order.
+        """
+        order = [rule.code for rule in self.rules]
+        self.rules.sort(key=FilterRule.rank)
+        new_order = [rule.code for rule in self.rules]
+        if new_order != order:
+            logging.info(f"Reordered filter rules: {', '.join(new_order)}")
+
+    def stats(self):
+        """Per-rule statistics for this run, in the current rule order."""
+        return [
+            {
+                "rule": rule.code,
+                "position": position,
+                "evaluated": rule.evaluated,
+                "rejected": rule.rejected,
+                "rejection_rate": rule.rejection_rate,
+                "total_ms": rule.seconds * 1000,
+                "avg_us": rule.avg_seconds * 1e6,
+            }
+            for position, rule in enumerate(self.rules, start=1)
+        ]
+
+    def _parsed(self, job, context):
+        """Parses the job at most once per evaluation, for the age and salary rules."""
+        if 'parsed' not in context:
+            context['parsed'] = JobParser.parse_job(job)
+        return context['parsed']
+
+    def _batch_blacklist(self, columns, rows):
+        return columns.column('company').mask(lambda company: company in self.blacklist_companies, rows)
+
+    def _batch_keywords(self, columns, rows):
+        return columns.column('title').mask(lambda title: self.find_excluded_keyword(title) is not None, rows)
+
+    def _batch_schedule(self, columns, rows):
+        return columns.column('schedule').mask(
+            lambda schedule_type: bool(schedule_type) and not any(allowed in schedule_type for allowed in self.schedule_types),
+            rows,
+        )
+
+    def _batch_source(self, columns, rows):
+        return [not has_source for has_source, _ in self.has_reputable_sources(columns.take(rows))]
+
+    def _batch_age(self, columns, rows):
+        posted_at = columns.numeric('posted_at', rows)
+        # Unknown dates are NaN, which never compares less
+        if np is not None:
+            return posted_at < self.age_cutoff
+        return [posted < self.age_cutoff for posted in posted_at]
+
+    def _batch_salary(self, columns, rows):
+        max_salary = columns.numeric('max_salary', rows)
+        # Unknown (NaN) and zero salaries are kept, like in _check_salary
+        if np is not None:
+            return (max_salary < self.min_salary) & (max_salary != 0)
+        return [salary < self.min_salary and salary != 0 for salary in max_salary]
 
-        # Check company blacklist
-        if company in self.blacklist_companies:
-            return False, f"Blacklisted company: {job.get('company_name')}"
-        
+    def _check_blacklist(self, job, context):
+        if job.get('company_name', '').lower() in self.blacklist_companies:
+            return f"Blacklisted company: {job.get('company_name')}"
+        return None
+
+    def _check_keywords(self, job, context):
         # Check excluded keywords in title
-        for keyword in self.exclude_keywords:
-            # Use regex word boundary check to avoid partial matches (e.g. 'lead' in 'leading')
-            # Handle special case where keyword ends with punctuation (like 'sr.')
-            pattern = r''
-            
-            # Add leading boundary if keyword starts with a word char
-            if keyword and keyword[0].isalnum():
-                pattern += r'\b'
-            
-            pattern += re.escape(keyword)
-            
-            # Add trailing boundary if keyword ends with a word char
-            if keyword and keyword[-1].isalnum():
-                pattern += r'\b'
-                
-            if re.search(pattern, title):
-                return False, f"Excluded keyword '{keyword}' in title: {job.get('title')}"
-
-        # Check schedule type
+        keyword = self.find_excluded_keyword(job.get('title', '').lower())
+        if keyword is not None:
+            return f"Excluded keyword '{keyword}' in title: {job.get('title')}"
+        return None
+
+    def _check_schedule(self, job, context):
+        schedule_type = job.get('detected_extensions', {}).get('schedule_type', '').lower()
         if schedule_type:
             # Check if any allowed schedule type is present in the job's schedule type string
             is_allowed = False
@@ -53,16 +266,64 @@ class JobFilter:
                 if allowed_type in schedule_type:
                     is_allowed = True
                     break
-            
+
             if not is_allowed:
-                return False, f"Invalid schedule type: {job.get('detected_extensions', {}).get('schedule_type')}"
+                return f"Invalid schedule type: {job.get('detected_extensions', {}).get('schedule_type')}"
+        return None
 
-        # Check application sources
+    def _check_source(self, job, context):
         has_source, source_reason = self.has_reputable_source(job)
         if not has_source:
-            return False, source_reason
+            return source_reason
+        return None
+
+    def _check_age(self, job, context):
+        parsed_job = self._parsed(job, context)
+        posted_at = parsed_job.posted_at
+        if posted_at is not None and posted_at < self.age_cutoff:
+            return f"{parsed_job['title']} - Posted: {parsed_job['posted_date']} (Older than {self.max_days_old} days)"
+        return None
+
+    def _check_salary(self, job, context):
+        parsed_job = self._parsed(job, context)
+        max_salary = parsed_job.get('max_salary')
+        # If salary is known AND strictly less than min_salary, skip it
+        if max_salary and max_salary < self.min_salary:
+            return f"{parsed_job['title']} - Salary: {parsed_job.get('salary_raw', 'N/A')} (Below {self.min_salary})"
+        return None
+
+    @staticmethod
+    def _keyword_pattern(keyword):
+        """
+        Regex for one excluded keyword.
+        Use regex word boundary check to avoid partial matches (e.g. 'lead' in 'leading')
+        Handle special case where keyword ends with punctuation (like 'sr.')
+        """
+        pattern = r''
 
-        return True, None
+        # Add leading boundary if keyword starts with a word char
+        if keyword and keyword[0].isalnum():
+            pattern += r'\b'
+
+        pattern += re.escape(keyword)
+
+        # Add trailing boundary if keyword ends with a word char
+        if keyword and keyword[-1].isalnum():
+            pattern += r'\b'
+        return pattern
+
+    def find_excluded_keyword(self, title):
+        """
+        Returns the first excluded keyword (in configured order) found in the
+        lowercased title, or None. A title costs one word split plus one scan
+        of the combined pattern, whatever the number of keywords.
+        """
+        matches = self._keyword_words.intersection(self._WORD.findall(title)) if self._keyword_words else set()
+        if self._keyword_matcher is not None and self._keyword_matcher.search(title):
+            matches.update(keyword for keyword, pattern in self._keyword_others if pattern.search(title))
+        if not matches:
+            return None
+        return min(matches, key=self._keyword_order.__getitem__)
 
     def has_reputable_source(self, job):
         """
@@ -79,38 +340,122 @@ class JobFilter:
         if not self.trusted_domains:
             return True, None
 
-        company_name = job.get('company_name', '').lower()
-        # Normalize company name for URL check (remove spaces, punctuation could be tricky but let's start simple)
-        normalized_company = ''.join(e for e in company_name if e.isalnum())
-
-        def _extract_hostname(raw_url: str) -> str:
-            """Best-effort hostname extraction, tolerant of missing scheme."""
-            if not raw_url:
-                return ""
-            parsed = urlparse(raw_url)
-            if not parsed.netloc and parsed.path and "://" not in raw_url:
-                parsed = urlparse(f"https://{raw_url}")
-
-            host = (parsed.hostname or "").lower()
-            if host.startswith("www."):
-                host = host[4:]
-            return host
-        
+        normalized_company = normalize_company(job.get('company_name', ''))
+
         for option in apply_options:
-            link = option.get('link', '').lower()
-            title = option.get('title', '').lower()
-            
-            # Check trusted domains
-            for domain in self.trusted_domains:
-                if domain in link or domain in title:
-                    return True, None
-            
+            host = extract_hostname(option.get('link', ''))
+
+            # Check trusted domains against the hostname and the option title
+            if self._domain_index.matches_host(host) or self._domain_index.matches_text(option.get('title', '')):
+                return True, None
+
             # Check direct company page
             # Heuristic: company name must appear in the hostname (not just the path)
             # This avoids aggregators like job boards embedding the company name in a URL slug.
-            host = _extract_hostname(link)
-            normalized_host = ''.join(c for c in host if c.isalnum())
-            if normalized_company and normalized_company in normalized_host:
+            if normalized_company and normalized_company in _normalize_host(host):
                 return True, None
-                    
+
         return False, "No reputable application source found"
+
+    def has_reputable_sources(self, jobs):
+        """
+        Batch version of has_reputable_source for a page of jobs. Every distinct
+        hostname and option title on the page is looked up only once, and a
+        link is only parsed if its option title isn't already trusted.
+        Returns one (bool, reason) per job.
+        """
+        if not self.trusted_domains:
+            return [self.has_reputable_source(job) for job in jobs]
+
+        hosts = {}
+        titles = {}
+        results = []
+        for job in jobs:
+            apply_options = job.get('apply_options', [])
+            if not apply_options:
+                results.append((False, "No application options found"))
+                continue
+            normalized_company = None
+            for option in apply_options:
+                title = option.get('title', '')
+                trusted = titles.get(title)
+                if trusted is None:
+                    trusted = titles[title] = self._domain_index.matches_text(title)
+                if trusted:
+                    break
+                link = option.get('link', '')
+                entry = hosts.get(link)
+                if entry is None:
+                    host = extract_hostname(link)
+                    entry = hosts[link] = (host, self._domain_index.matches_host(host))
+                host, trusted = entry
+                if trusted:
+                    break
+                if normalized_company is None:
+                    normalized_company = normalize_company(job.get('company_name', ''))
+                if normalized_company and normalized_company in _normalize_host(host):
+                    break
+            else:
+                results.append((False, "No reputable application source found"))
+                continue
+            results.append((True, None))
+        return results
+
+@lru_cache(maxsize=8192)
+def extract_hostname(raw_url):
+    """Best-effort hostname extraction, tolerant of missing scheme."""
+    if not raw_url:
+        return ""
+    try:
+        parsed = urlparse(raw_url)
+        if not parsed.netloc and parsed.path and "://" not in raw_url:
+            parsed = urlparse(f"https://{raw_url}")
+        host = (parsed.hostname or "").lower()
+    except ValueError:
+        # e.g. an invalid IPv6 literal
+        return ""
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+@lru_cache(maxsize=8192)
+def _normalize_host(host):
+    return ''.join(c for c in host if c.isalnum())
+
+@lru_cache(maxsize=8192)
+def normalize_company(company_name):
+    """Lowercased company name without spaces or punctuation, for the hostname heuristic."""
+    return ''.join(e for e in company_name.lower() if e.isalnum())
+
+class DomainIndex:
+    """
+    Precomputed trusted-domain lookup, independent of the number of domains.
+
+    Entries without a dot ("linkedin") match any label of a hostname
+    ("ca.linkedin.com"). Entries with a dot ("acme.com") match that hostname
+    and its subdomains ("careers.acme.com"): every parent domain of the
+    hostname is looked up in a set, which is what a reversed-label suffix trie
+    would walk. Option titles ("LinkedIn", "Apply on acme.com") are matched
+    the same way, token by token.
+    """
+    _TEXT_TOKEN = re.compile(r'[\w-]+(?:\.[\w-]+)*')
+
+    def __init__(self, domains):
+        domains = [d.strip().lower() for d in domains or [] if d.strip()]
+        self.labels = {d for d in domains if '.' not in d}
+        self.suffixes = {d[4:] if d.startswith('www.') else d for d in domains if '.' in d}
+
+    def matches_host(self, host):
+        if not host:
+            return False
+        labels = host.split('.')
+        if not self.labels.isdisjoint(labels):
+            return True
+        if self.suffixes:
+            for i in range(len(labels)):
+                if '.'.join(labels[i:]) in self.suffixes:
+                    return True
+        return False
+
+    def matches_text(self, text):
+        return any(self.matches_host(token) for token in self._TEXT_TOKEN.findall(text.lower()))
@@ -1,107 +1,317 @@
 import logging
 import time
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from serpapi import GoogleSearch
+from rate_limiter import BudgetExhaustedError
+from retry_policy import (
+    TRANSIENT,
+    QUOTA,
+    CircuitOpenError,
+    RetryPolicy,
+    SerpApiError,
+    classify_exception,
+    classify_response_error,
+)
+
+# Why iter_pages stopped paginating (see on_stop)
+STOP_END = "end"
+STOP_MAX_PAGES = "max_pages"
+STOP_POLICY = "policy"
+STOP_ERROR = "error"
+STOP_BUDGET = "budget"
+# The search was cut short and is not complete
+INTERRUPTED_STOPS = (STOP_ERROR, STOP_BUDGET)
 
 class JobFinder:
-    def __init__(self, api_key, max_pages=5, max_retries=3):
+    def __init__(self, api_key, max_pages=5, max_retries=3, cache=None, policies=None,
+                 budget=None, rate_limiter=None, transport=None, retry_policy=None, circuit_breaker=None):
         self.api_key = api_key
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Shared CircuitBreaker so a dead upstream short-circuits every search
+        self.circuit_breaker = circuit_breaker
+        # Object with a fetch(params) -> dict method (see transport.py).
+        # Without one, every page is fetched with a fresh serpapi.GoogleSearch.
+        self.transport = transport
+        self.cache = cache
+        # Shared per-run call budget (ApiBudget) and request-rate limiter (TokenBucket)
+        self.budget = budget
+        self.rate_limiter = rate_limiter
+        # Early-termination policies consulted after every page (see pagination_policy)
+        self.policies = policies or []
+        # Policy name -> number of pages not fetched because of an early stop
+        self.pages_skipped = {}
         self.max_pages = max_pages
         self.total_api_calls = 0
         self.max_retries = max_retries
+        # Searches may run on several threads at once (see SearchExecutor),
+        # so shared counters are only updated while holding this lock.
+        self._lock = threading.Lock()
         logging.info("JobFinder instance created.")
 
+    def _record_api_call(self):
+        """Increments the API call counter in a thread-safe way."""
+        with self._lock:
+            self.total_api_calls += 1
+
+    def _record_pages_skipped(self, name, pages):
+        """Records pages avoided by an early pagination stop in a thread-safe way."""
+        with self._lock:
+            self.pages_skipped[name] = self.pages_skipped.get(name, 0) + pages
+
+    def _check_policies(self, page_results, policy_state):
+        """
+        Consults the early-termination policies. Returns (name, reason) of
+        the first policy that wants to stop, or (None, None).
+        """
+        for policy in self.policies:
+            reason = policy.should_stop(page_results, policy_state.setdefault(policy.name, {}))
+            if reason:
+                return policy.name, reason
+        return None, None
+
+    @staticmethod
+    def _combo_key(search_params):
+        """Identifies the query/location combination a request belongs to."""
+        return (search_params.get("q"), search_params.get("location"))
+
     def _fetch_with_retry(self, search_params) -> dict:
         """
-        Fetches results from SerpApi with retry logic for transient failures.
+        Fetches results from SerpApi, retrying transient failures with
+        decorrelated jitter and honouring Retry-After hints.
+        Quota and fatal errors raise SerpApiError without retrying; account-wide
+        ones also trip the circuit breaker so the remaining searches short-circuit.
+        Responses served from the cache do not count toward total_api_calls.
         """
+        if self.cache:
+            cached = self.cache.get(search_params)
+            if cached is not None:
+                return cached
+
+        # The budget is checked first: once the breaker lets a half-open trial
+        # through, that trial must report back (see CircuitBreaker)
+        combo = self._combo_key(search_params)
+        if self.budget and not self.budget.try_acquire(combo):
+            raise BudgetExhaustedError("SerpApi call budget exhausted for this run")
+
+        if self.circuit_breaker and not self.circuit_breaker.allow():
+            if self.budget:
+                self.budget.refund(combo)
+            raise CircuitOpenError("SerpApi circuit breaker is open, skipping request")
+
+        delay = None
         for attempt in range(self.max_retries):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
             try:
-                search = GoogleSearch(search_params)
                 logging.info("Sending request to SerpApi...")
-                results = search.get_dict()
-                self.total_api_calls += 1
-                return results
-            except json.JSONDecodeError as e:
-                logging.warning(f"API returned invalid JSON (attempt {attempt + 1}/{self.max_retries}): {e}")
-                if attempt < self.max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                    logging.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
+                if self.transport:
+                    results = self.transport.fetch(search_params)
                 else:
-                    logging.error("Max retries reached. API request failed.")
-                    raise
+                    results = GoogleSearch(search_params).get_dict()
+                self._record_api_call()
+                if "error" in results:
+                    error = classify_response_error(results["error"])
+                    if error is not None:
+                        raise error
             except Exception as e:
+                kind = classify_exception(e)
+                if kind != TRANSIENT:
+                    account_wide = kind == QUOTA or getattr(e, "account_wide", False) or getattr(e, "status", None) in (401, 403)
+                    logging.error(f"API request failed with a {kind} error: {e}")
+                    if self.circuit_breaker:
+                        if account_wide:
+                            self.circuit_breaker.trip(str(e))
+                        else:
+                            # The error is about this request, not the upstream
+                            self.circuit_breaker.release_trial()
+                    if isinstance(e, SerpApiError):
+                        raise
+                    raise SerpApiError(str(e), kind=kind, account_wide=account_wide) from e
+
                 logging.warning(f"API request failed (attempt {attempt + 1}/{self.max_retries}): {e}")
-                if attempt < self.max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logging.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_failure()
+                if attempt == self.max_retries - 1:
                     logging.error("Max retries reached. API request failed.")
                     raise
+                if self.circuit_breaker and not self.circuit_breaker.allow():
+                    raise CircuitOpenError("SerpApi circuit breaker opened, giving up on this request") from e
+
+                delay = self.retry_policy.next_delay(delay, retry_after=getattr(e, "retry_after", None))
+                logging.info(f"Retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
+                continue
+
+            if self.circuit_breaker:
+                self.circuit_breaker.record_success()
+            # Stamped before caching, so cached and replayed jobs keep the
+            # time their relative dates ("3 days ago") refer to
+            self._stamp_fetched_at(results.get("jobs_results", []), int(time.time()))
+            if self.cache and "error" not in results:
+                self.cache.set(search_params, results)
+            return results
         # This should never be reached due to raise statements above
         raise RuntimeError("Failed to fetch results after all retries")
 
-    def search_jobs(self, params):
+    @staticmethod
+    def _stamp_fetched_at(jobs, fetched_at):
         """
-        Executes the job search using SerpApi.
+        Records on each job the Unix time it was fetched, which anchors its
+        relative posting date (see JobParser). Existing stamps are kept.
         """
-        logging.info(f"Executing search with params: {params}")
+        for job in jobs:
+            job.setdefault("fetched_at", fetched_at)
+
+    def _fetch_page(self, search_params, next_page_token=None):
+        """
+        Fetches a single page of results. Each page gets its own copy of the
+        params so a prefetch running in the background never races the caller.
+        """
+        page_params = dict(search_params)
+        if next_page_token:
+            page_params["next_page_token"] = next_page_token
+            logging.info("Fetching next page with token.")
+        else:
+            logging.info("Fetching first page of results.")
+        return self._fetch_with_retry(page_params)
+
+    def iter_pages(self, params, prefetch=False, start_page=0, next_page_token=None, on_page=None, on_stop=None):
+        """
+        Executes the job search using SerpApi and yields the jobs of each page
+        as soon as it arrives.
+
+        When prefetch is True, page N+1 is requested on a background thread
+        while the caller processes page N. Only the jobs of each page are kept;
+        the rest of the raw SerpApi payload is released page by page.
 
-        all_res = []
-        next_page_token = None
+        start_page/next_page_token resume a search that was interrupted, and
+        on_page(page, jobs, next_page_token) is called for every page fetched
+        (next_page_token is None once the search is complete).
+
+        on_stop(reason) is called once pagination ends: STOP_END (no more
+        results), STOP_MAX_PAGES, STOP_POLICY (early stop), or one of
+        INTERRUPTED_STOPS (STOP_ERROR, STOP_BUDGET) when the search was cut
+        short and could still be continued from the last page's token.
+        """
+        logging.info(f"Executing search with params: {params}")
 
         # Ensure API key is in params
         search_params = params.copy()
         search_params["api_key"] = self.api_key
-        
-        for page in range(self.max_pages):
-            if next_page_token:
-                search_params["next_page_token"] = next_page_token
-                logging.info(f"Fetching next page with token.")
-            else:
-                logging.info("Fetching first page of results.")
-
-            results = self._fetch_with_retry(search_params)
-
-            if "error" in results:
-                logging.error(f"Error from API: {results['error']}")
-                break
-
-            page_results = results.get("jobs_results", [])
-
-            logging.info(f"Page {page + 1} returned {len(page_results)} jobs.")
-
-            if not page_results:
-                logging.info("No more results found, stopping search.")
-                break
-
-            all_res.extend(page_results)
-
-            next_page_token = results.get("serpapi_pagination", {}).get("next_page_token")
-
-            if not next_page_token:
-                logging.info("No next page token found, ending pagination.")
-                break
-        
-        # Debugging: Print what keys are returned
-        logging.debug(f"DEBUG: Keys returned from API: {list(results.keys())}")
-        if "error" in results:
-            logging.debug(f"DEBUG: API Error: {results['error']}")
-        
-        # Inject search location into each job result
         search_location = params.get("location", "Unknown")
-        for job in all_res:
-            job["search_location"] = search_location
 
-        return all_res
+        policy_state = {}
+        prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch") if prefetch else None
+        pending = None
+        stopped = STOP_MAX_PAGES
+
+        try:
+            for page in range(start_page, self.max_pages):
+                try:
+                    if pending is not None:
+                        results = pending.result()
+                        pending = None
+                    else:
+                        results = self._fetch_page(search_params, next_page_token)
+                except SerpApiError as e:
+                    # Quota/fatal errors and an open circuit end this search
+                    logging.error(f"Error from API: {e}")
+                    stopped = STOP_ERROR
+                    break
+                except BudgetExhaustedError as e:
+                    # Degrade gracefully: keep the pages fetched so far
+                    skipped = self.max_pages - page
+                    self._record_pages_skipped("budget", skipped)
+                    logging.warning(f"{e}. Returning {page} page(s) for this search, skipped up to {skipped}.")
+                    stopped = STOP_BUDGET
+                    break
+
+                if "error" in results:
+                    # Only "no results" errors get this far (see classify_response_error)
+                    logging.info(f"No more results found: {results['error']}")
+                    stopped = STOP_END
+                    break
+
+                logging.debug(f"DEBUG: Keys returned from API: {list(results.keys())}")
+                page_results = results.get("jobs_results", [])
+                next_page_token = results.get("serpapi_pagination", {}).get("next_page_token")
+                results = None
+
+                logging.info(f"Page {page + 1} returned {len(page_results)} jobs.")
+
+                if not page_results:
+                    logging.info("No more results found, stopping search.")
+                    stopped = STOP_END
+                    break
+
+                # Inject search location into each job result. Responses cached
+                # before fetched_at was recorded are stamped now.
+                for job in page_results:
+                    job["search_location"] = search_location
+                self._stamp_fetched_at(page_results, int(time.time()))
+
+                stop_reason = None
+                if next_page_token and page + 1 < self.max_pages:
+                    policy_name, stop_reason = self._check_policies(page_results, policy_state)
+                    if stop_reason:
+                        skipped = self.max_pages - (page + 1)
+                        self._record_pages_skipped(policy_name, skipped)
+                        logging.info(f"Stopping pagination early: {stop_reason}. Skipped up to {skipped} page(s).")
+
+                if on_page:
+                    on_page(page, page_results, None if stop_reason else next_page_token)
+
+                if stop_reason:
+                    stopped = STOP_POLICY
+                    yield page_results
+                    break
+
+                if next_page_token and prefetcher and page + 1 < self.max_pages:
+                    pending = prefetcher.submit(self._fetch_page, search_params, next_page_token)
+
+                yield page_results
+
+                if not next_page_token:
+                    logging.info("No next page token found, ending pagination.")
+                    stopped = STOP_END
+                    break
+            if on_stop:
+                on_stop(stopped)
+        finally:
+            if prefetcher:
+                prefetcher.shutdown(wait=True)
+            self.release_budget(search_params)
+
+    def release_budget(self, search_params):
+        """
+        Returns the unused budget share of a search to the shared pool, once it
+        ended or when it won't be fetched in this run (e.g. it was replayed
+        from the checkpoint journal).
+        """
+        if self.budget:
+            self.budget.release(self._combo_key(search_params))
+
+    def iter_jobs(self, params, prefetch=False):
+        """
+        Yields jobs one at a time, page by page. See iter_pages.
+        """
+        for page_results in self.iter_pages(params, prefetch=prefetch):
+            yield from page_results
+
+    def search_jobs(self, params, prefetch=False):
+        """
+        Executes the job search using SerpApi and returns every job found.
+        """
+        return list(self.iter_jobs(params, prefetch=prefetch))
     
-    def removeDuplicates(self, jobs):
+    def removeDuplicates(self, jobs, seen=None):
         """
         Removes duplicate jobs based on (title, company, location).
+        Pass the same seen set across calls to deduplicate a stream of batches.
         """
-        seen = set()
+        if seen is None:
+            seen = set()
         unique = []
 
         for job in jobs:
@@ -2,14 +2,61 @@ import json
 import os
 import logging
 import hashlib
+import shutil
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from bloom_filter import BloomFilter, file_fingerprint
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are still atomic, just not locked
+    fcntl = None
+
+def job_key(job):
+    """Returns the history key of a job: its SerpApi job_id, or a hash of title, company and location."""
+    if 'job_id' in job:
+        return job['job_id']
+
+    # Fallback: Create a hash from title, company, and location
+    unique_string = f"{job.get('title', '')}{job.get('company_name', '')}{job.get('location', '')}"
+    return hashlib.md5(unique_string.encode('utf-8')).hexdigest()
+
+def copy_file_mode(temp_path, path):
+    """
+    Gives temp_path the permissions of the file it will replace (0644 if there
+    is none yet), since tempfile.mkstemp always creates files as 0600.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+    os.chmod(temp_path, mode)
 
 class JobHistory:
-    def __init__(self, history_file='data/history.json'):
+    def __init__(self, history_file='data/history.json', merge_on_save=True, bloom_file=None, bloom_fp_rate=0.01):
         self.history_file = history_file
+        self.lock_file = history_file + '.lock'
+        # Re-read the file on save and apply only this instance's changes, so
+        # overlapping runs or parallel workers don't overwrite each other
+        self.merge_on_save = merge_on_save
+        # Optional Bloom filter snapshot: while it is fresh, the history file is
+        # only parsed once a lookup might be a hit (see bloom_filter.py)
+        self.bloom_file = bloom_file
+        self.bloom_fp_rate = bloom_fp_rate
+        self.bloom = None
+        self.bloom_negatives = 0
+        self.bloom_maybes = 0
+        self.bloom_false_positives = 0
         self.history = {}
+        self._loaded = {}
+        self._store_loaded = False
+        self._load_lock = threading.Lock()
         self._ensure_data_dir()
-        self.load_history()
+        if not self._open_bloom():
+            self.load_history()
 
     def _ensure_data_dir(self):
         """Ensure the directory for the history file exists."""
@@ -17,50 +64,209 @@ class JobHistory:
         if directory and not os.path.exists(directory):
             os.makedirs(directory)
 
-    def load_history(self):
-        """Load history from the JSON file."""
-        if os.path.exists(self.history_file):
+    @contextmanager
+    def _locked(self):
+        """Holds an exclusive lock on the history's lock file."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_file, 'a') as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
             try:
-                with open(self.history_file, 'r') as f:
-                    self.history = json.load(f)
-                logging.info(f"Loaded job history from {self.history_file}")
-            except (json.JSONDecodeError, IOError) as e:
-                logging.error(f"Failed to load history file: {e}. Starting with empty history.")
-                self.history = {}
-        else:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _read_file(self):
+        """Reads the history file. Returns {} if it does not exist."""
+        if not os.path.exists(self.history_file):
+            return {}
+        with open(self.history_file, 'r') as f:
+            return json.load(f)
+
+    def _backup_corrupt_file(self):
+        """Keeps an unreadable history file aside so the next save doesn't destroy it."""
+        backup = f"{self.history_file}.corrupt-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        try:
+            shutil.copy(self.history_file, backup)
+            logging.error(f"Copied the unreadable history file to {backup}")
+        except IOError as e:
+            logging.error(f"Failed to back up the unreadable history file: {e}")
+
+    def _load_file(self):
+        """Reads the history file, returning {} if it is missing or unreadable."""
+        if not os.path.exists(self.history_file):
             logging.info("No history file found. Starting with empty history.")
-            self.history = {}
+            return {}
+        try:
+            history = self._read_file()
+            logging.info(f"Loaded job history from {self.history_file}")
+            return history
+        except (json.JSONDecodeError, IOError) as e:
+            logging.error(f"Failed to load history file: {e}. Starting with empty history.")
+            self._backup_corrupt_file()
+            return {}
+
+    def load_history(self):
+        """Load history from the JSON file."""
+        history = self._load_file()
+        with self._load_lock:
+            self.history = history
+            self._loaded = dict(history)
+            self._store_loaded = True
+
+    def _open_bloom(self):
+        """
+        Maps the Bloom filter snapshot if it was built from the current history
+        file. Returns True if the history file can be loaded lazily.
+        """
+        if not self.bloom_file or not os.path.exists(self.bloom_file):
+            return False
+        try:
+            bloom = BloomFilter.open(self.bloom_file)
+        except (ValueError, IOError) as e:
+            logging.warning(f"Ignoring unreadable Bloom filter snapshot {self.bloom_file}: {e}")
+            return False
+        if bloom.fingerprint != file_fingerprint(self.history_file):
+            logging.info("Bloom filter snapshot is out of date. Loading the full history.")
+            bloom.close()
+            return False
+
+        self.bloom = bloom
+        logging.info(
+            f"Using Bloom filter snapshot {self.bloom_file} ({bloom.count} entries, "
+            f"expected false-positive rate {bloom.expected_fp_rate():.2%}). History loads on the first possible match."
+        )
+        return True
+
+    def _ensure_loaded(self):
+        """Loads the full history file, keeping the jobs added so far in this run."""
+        if self._store_loaded:
+            return
+        with self._load_lock:
+            if self._store_loaded:
+                return
+            history = self._load_file()
+            self._loaded = dict(history)
+            # add_job holds the same lock, so nothing is added while merging
+            history.update(self.history)
+            # Lookups on other threads check _store_loaded before self.history,
+            # so the merged dict must be in place before the flag is set
+            self.history = history
+            self._store_loaded = True
+
+    def _contains(self, job_id):
+        # Read the flag first: once it is set, self.history is the full history
+        store_loaded = self._store_loaded
+        if job_id in self.history:
+            return True
+        if store_loaded:
+            return False
+        if not self.bloom.might_contain(job_id):
+            self.bloom_negatives += 1
+            return False
+        self.bloom_maybes += 1
+        self._ensure_loaded()
+        if job_id in self.history:
+            return True
+        self.bloom_false_positives += 1
+        return False
+
+    def _merge_with_file(self):
+        """
+        Applies the changes made since load (additions, updates and removals)
+        on top of the current file contents. Must be called with the lock held.
+        """
+        try:
+            merged = self._read_file()
+        except (json.JSONDecodeError, IOError) as e:
+            logging.error(f"Failed to re-read history file before saving: {e}. Saving this run's history only.")
+            return dict(self.history)
+
+        for job_id, timestamp in self.history.items():
+            if self._loaded.get(job_id) != timestamp:
+                merged[job_id] = timestamp
+        for job_id, timestamp in self._loaded.items():
+            # Only drop entries another writer hasn't refreshed in the meantime
+            if job_id not in self.history and merged.get(job_id) == timestamp:
+                del merged[job_id]
+        return merged
+
+    def _write_atomic(self, data):
+        """Writes data to a temporary file and renames it over the history file."""
+        directory = os.path.dirname(self.history_file) or '.'
+        fd, temp_path = tempfile.mkstemp(prefix='.history-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            copy_file_mode(temp_path, self.history_file)
+            os.replace(temp_path, self.history_file)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def _save_bloom(self, data):
+        """Rebuilds the Bloom filter snapshot for the file just written. Must be called with the lock held."""
+        try:
+            bloom = BloomFilter.build(data.keys(), self.bloom_fp_rate)
+            bloom.save(self.bloom_file, fingerprint=file_fingerprint(self.history_file))
+        except (IOError, OSError) as e:
+            logging.warning(f"Failed to save Bloom filter snapshot: {e}")
 
     def save_history(self):
-        """Save history to the JSON file."""
+        """Save history to the JSON file. Returns True on success."""
+        if not self.merge_on_save:
+            # Overwriting needs the full history, not just this run's additions
+            self._ensure_loaded()
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.history, f, indent=2)
+            with self._locked():
+                data = self._merge_with_file() if self.merge_on_save else self.history
+                self._write_atomic(data)
+                if self.bloom_file:
+                    self._save_bloom(data)
+            added = len(data) - len(self.history)
+            if self.merge_on_save and self._store_loaded and added > 0:
+                logging.info(f"Merged {added} history entries saved by other runs.")
+            with self._load_lock:
+                self.history = data
+                self._loaded = dict(data)
+                self._store_loaded = True
+            if self.bloom:
+                logging.info(
+                    f"Bloom filter answered {self.bloom_negatives} history lookups without loading the history; "
+                    f"{self.bloom_maybes} possible matches, {self.bloom_false_positives} false positives "
+                    f"(expected rate {self.bloom.expected_fp_rate():.2%})."
+                )
             logging.info(f"Saved job history to {self.history_file}")
-        except IOError as e:
+            return True
+        except (IOError, OSError) as e:
             logging.error(f"Failed to save history file: {e}")
+            return False
 
     def _generate_id(self, job):
         """Generate a unique ID for a job if one doesn't exist."""
-        if 'job_id' in job:
-            return job['job_id']
-        
-        # Fallback: Create a hash from title, company, and location
-        unique_string = f"{job.get('title', '')}{job.get('company_name', '')}{job.get('location', '')}"
-        return hashlib.md5(unique_string.encode('utf-8')).hexdigest()
+        return job_key(job)
 
     def is_seen(self, job):
         """Check if a job has been seen before."""
-        job_id = self._generate_id(job)
-        return job_id in self.history
+        return self._contains(self._generate_id(job))
+
+    def is_seen_many(self, jobs):
+        """Check a whole page of jobs at once. Returns one boolean per job."""
+        return [self._contains(self._generate_id(job)) for job in jobs]
 
     def add_job(self, job):
         """Add a job to the history."""
         job_id = self._generate_id(job)
-        self.history[job_id] = datetime.now().isoformat()
+        # Under the load lock, so a lazy load never merges a dict that is still being added to
+        with self._load_lock:
+            self.history[job_id] = datetime.now().isoformat()
 
     def cleanup_old_entries(self, days=45):
         """Remove entries older than the specified number of days."""
+        self._ensure_loaded()
         cutoff_date = datetime.now() - timedelta(days=days)
         initial_count = len(self.history)
         
@@ -1,56 +1,221 @@
-import logging
-from salary_parser import SalaryParser
-from date_parser import DateParser
+from date_parser import resolve_posted_at
+from extension_parser import EMPTY, POSTED_DATE, SALARY, classify_extension, classify_salary
+
+def scan_extensions(extensions):
+    """
+    Classifies each extension once and returns its posting date and salary,
+    each as (item, ExtensionInfo) or None, for parse_date_fields and
+    parse_salary_fields to share.
+    """
+    date = salary = None
+    for item in extensions or ():
+        info = classify_extension(item)
+        if info.kind == POSTED_DATE:
+            # A date whose days could not be read never replaces one that could
+            if date is None or info.days_ago is not None or date[1].days_ago is None:
+                date = (item, info)
+        elif info.kind == SALARY:
+            salary = (item, info)
+    return date, salary
+
+def parse_date_fields(job_data, scan=None):
+    """
+    Returns (posted_date, days_ago, posted_at) of a raw job. posted_at is
+    anchored to the job's fetched_at (see JobFinder), or to now for jobs
+    fetched before it was recorded. scan is the job's scan_extensions result,
+    if already known.
+    """
+    date = (scan or scan_extensions(job_data.get('extensions')))[0]
+    posted_date, days_ago = (date[0], date[1].days_ago) if date else ("N/A", None)
+
+    # Also check detected_extensions if available (SerpApi specific)
+    if days_ago is None:
+        exts = job_data.get('detected_extensions') or {}
+        if exts.get('posted_at'):
+            info = classify_extension(exts['posted_at'])
+            if info.days_ago is not None or posted_date == "N/A":
+                posted_date = exts['posted_at']
+                days_ago = info.days_ago
+    return posted_date, days_ago, resolve_posted_at(days_ago, job_data.get('fetched_at'))
+
+def parse_salary_fields(job_data, scan=None):
+    """
+    Returns (salary_raw, ExtensionInfo of the salary or None) of a raw job.
+    scan is the job's scan_extensions result, if already known.
+    """
+    salary = (scan or scan_extensions(job_data.get('extensions')))[1]
+    if salary:
+        return salary
+
+    salary_info = None
+    salary_raw = "N/A"
+    exts = job_data.get('detected_extensions') or {}
+    if 'salary' in exts:
+        # Known to be a salary, so amounts count even without a currency
+        info = classify_salary(exts['salary'])
+        if info.max_salary is not None:
+            salary_info = info
+        salary_raw = exts['salary']
+    return salary_raw, salary_info
+
+class ParsedJob:
+    """
+    Parsed view of a raw SerpApi job. raw references the original dict (it is
+    not copied), e.g. for jobs.json and the history. Fields can also be read
+    like a dict (job['title'], job.get('salary_raw', 'N/A')).
+
+    Fields are resolved on first access and cached: the date fields
+    (posted_date, days_ago, posted_at) and the salary fields (min_salary,
+    max_salary, salary_raw, currency, pay_period) are parsed separately, so a
+    filter that only checks the age never parses the salary. Both groups
+    share one classification of the extensions (scan_extensions).
+
+    days_ago is relative to when the job was fetched; posted_at is the
+    absolute Unix time, so the age of a cached or replayed job is still a
+    single comparison against a cutoff.
+    """
+    __slots__ = ("raw", "_date", "_salary", "_scan")
+    FIELDS = (
+        "title", "company", "location", "link", "posted_date", "days_ago", "search_location",
+        "min_salary", "max_salary", "salary_raw", "currency", "pay_period", "posted_at", "fetched_at",
+    )
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._date = None
+        self._salary = None
+        self._scan = None
+
+    @property
+    def title(self):
+        return self.raw.get('title', 'N/A')
+
+    @property
+    def company(self):
+        return self.raw.get('company_name', 'N/A')
+
+    @property
+    def location(self):
+        return self.raw.get('location', 'N/A')
+
+    @property
+    def link(self):
+        return self.raw.get('share_link')
+
+    @property
+    def search_location(self):
+        return self.raw.get('search_location', 'N/A')
+
+    @property
+    def fetched_at(self):
+        """Unix time the job was fetched from SerpApi, if recorded."""
+        return self.raw.get('fetched_at')
+
+    @property
+    def posted_date(self):
+        date = self._date
+        if date is None:
+            date = self._date = parse_date_fields(self.raw, self._scanned())
+        return date[0]
+
+    @property
+    def days_ago(self):
+        date = self._date
+        if date is None:
+            date = self._date = parse_date_fields(self.raw, self._scanned())
+        return date[1]
+
+    @property
+    def posted_at(self):
+        """Unix time the job was posted, if known. Does not go stale like days_ago."""
+        date = self._date
+        if date is None:
+            date = self._date = parse_date_fields(self.raw, self._scanned())
+        return date[2]
+
+    def _scanned(self):
+        # Both field groups read the same classified extensions
+        scan = self._scan
+        if scan is None:
+            scan = self._scan = scan_extensions(self.raw.get('extensions'))
+        return scan
+
+    def _salary_fields(self):
+        salary_raw, salary_info = parse_salary_fields(self.raw, self._scanned())
+        self._salary = (salary_raw, salary_info or EMPTY)
+        return self._salary
+
+    @property
+    def salary_raw(self):
+        return (self._salary or self._salary_fields())[0]
+
+    @property
+    def min_salary(self):
+        return (self._salary or self._salary_fields())[1].min_salary
+
+    @property
+    def max_salary(self):
+        return (self._salary or self._salary_fields())[1].max_salary
+
+    @property
+    def currency(self):
+        """Currency of the salary ("$", "EUR"), if known."""
+        return (self._salary or self._salary_fields())[1].currency
+
+    @property
+    def pay_period(self):
+        """Pay period of the salary ("hour", "year"), if known."""
+        return (self._salary or self._salary_fields())[1].pay_period
+
+    def date_fields(self):
+        """The (posted_date, days_ago, posted_at) group, parsed on first use."""
+        date = self._date
+        if date is None:
+            date = self._date = parse_date_fields(self.raw, self._scanned())
+        return date
+
+    def salary_fields(self):
+        """The (salary_raw, ExtensionInfo) group, parsed on first use."""
+        return self._salary or self._salary_fields()
+
+    def share_fields(self, date=None, salary=None):
+        """
+        Takes field groups already parsed for a job with the same date or
+        salary inputs (see JobColumns) instead of parsing them again.
+        """
+        if date is not None:
+            self._date = date
+        if salary is not None:
+            self._salary = salary
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.FIELDS:
+            return default
+        return getattr(self, key)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        return f"ParsedJob({self.title!r}, {self.company!r})"
 
 class JobParser:
     @staticmethod
     def parse_job(job_data):
         """
-        Extracts relevant fields from the raw job data.
+        Returns a ParsedJob referencing job_data. Its date and salary fields
+        are extracted from the raw job data when first read.
         """
-        title = job_data.get('title', 'N/A')
-        logging.debug(f"Parsing job: {title}")
-        company = job_data.get('company_name', 'N/A')
-        location = job_data.get('location', 'N/A')
-        link = job_data.get('share_link')
-        search_location = job_data.get('search_location', 'N/A')
-        
-        posted_date = "N/A"
-        days_ago = None
-        salary_info = None
-        salary_raw = "N/A"
-        
-        if 'extensions' in job_data and job_data['extensions']:
-            for item in job_data['extensions']:
-                if 'ago' in item or 'day' in item:
-                    posted_date = item
-                    days_ago = DateParser.parse_days_ago(item)
-                elif SalaryParser.is_salary_text(item):
-                    salary_info = SalaryParser.parse_salary(item)
-                    salary_raw = item
-        
-        # Also check detected_extensions if available (SerpApi specific)
-        if not salary_info and 'detected_extensions' in job_data:
-            exts = job_data['detected_extensions']
-            if 'salary' in exts:
-                salary_info = SalaryParser.parse_salary(exts['salary'])
-                salary_raw = exts['salary']
-            if 'posted_at' in exts and posted_date == "N/A":
-                posted_date = exts['posted_at']
-                days_ago = DateParser.parse_days_ago(posted_date)
-
-        min_salary = salary_info[0] if salary_info else None
-        max_salary = salary_info[1] if salary_info else None
-
-        return {
-            "title": title,
-            "company": company,
-            "location": location,
-            "link": link,
-            "posted_date": posted_date,
-            "days_ago": days_ago,
-            "search_location": search_location,
-            "min_salary": min_salary,
-            "max_salary": max_salary,
-            "salary_raw": salary_raw
-        }
\ No newline at end of file
+        return ParsedJob(job_data)
+
+    @staticmethod
+    def ensure_parsed(job):
+        """Returns job as a ParsedJob, parsing it only if it is still a raw dict."""
+        if isinstance(job, ParsedJob):
+            return job
+        return JobParser.parse_job(job)
@@ -1,3 +1,4 @@
+import argparse
 import logging
 import os
 import shutil
@@ -6,8 +7,19 @@ from config import Config
 from job_finder import JobFinder
 from file_manager import FileManager
 from job_history import JobHistory
-from job_parser import JobParser
+from sqlite_history import SqliteJobHistory
+from history_index import CompactJobHistory
+from segmented_history import SegmentedJobHistory
 from job_filter import JobFilter
+from search_executor import SearchExecutor
+from checkpoint import RunCheckpoint
+from rejection_cache import RejectionCache, rule_fingerprints
+from response_cache import ResponseCache
+from pagination_policy import SeenHistoryPolicy, FreshnessPolicy
+from rate_limiter import ApiBudget, TokenBucket
+from transport import PooledHttpTransport
+from retry_policy import CircuitBreaker, RetryPolicy
+from serpapi_replay import RecordingTransport, ReplayStore, ReplayTransport
 from email_notification import EmailNotification
 from utils import format_location_for_query
 
@@ -20,7 +32,7 @@ logging.basicConfig(
     ]
 )
 
-def main():
+def main(resume=False):
     logging.info("Starting Job Finder Automation...")
     # Initialize configuration
     config = Config()
@@ -30,18 +42,11 @@ def main():
         logging.error("API_KEY not found in environment variables.")
         return
 
-    # Initialize JobFinder and JobHistory
-    finder = JobFinder(config.api_key, max_pages=config.max_pages)
-    history = JobHistory()
-    job_filter = JobFilter(config)
-    logging.info(f"JobFinder initialized with max_pages={config.max_pages}.")
-    
-    all_jobs = []
-    
+    # Build every query x location combination up front so they can be
+    # executed concurrently.
+    combinations = []
     for query in config.queries:
         for location in config.locations:
-            logging.info(f"Searching for '{query}' in {location}...")
-            # Execute search
             search_params = config.search_params.copy()
             
             # Format location for query (e.g. "Toronto, ON")
@@ -50,71 +55,165 @@ def main():
             # Update query to include "near location" for better results
             search_params["q"] = f"{query} near {short_location}"
             search_params["location"] = location
-            
-            jobs = finder.search_jobs(search_params)
-            logging.info(f"Found {len(jobs)} jobs for '{query}' in {location} (using '{short_location}').")
-            all_jobs.extend(jobs)
+            combinations.append((query, location, search_params))
+
+    # Initialize JobFinder and JobHistory
+    cache = None
+    # Record/replay runs must see (and capture) real transport traffic
+    if config.cache_ttl_hours > 0 and not (config.serpapi_record_dir or config.serpapi_replay_dir):
+        cache = ResponseCache(
+            ttl_seconds=config.cache_ttl_hours * 3600,
+            max_bytes=config.cache_max_mb * 1024 * 1024,
+            bypass=config.cache_bypass,
+        )
+    if config.history_backend == "sqlite":
+        # The first run imports the existing JSON history into the database
+        history = SqliteJobHistory(json_file='data/history.json')
+    elif config.history_backend == "compact":
+        history = CompactJobHistory(json_file='data/history.json')
+    elif config.history_backend == "segmented":
+        history = SegmentedJobHistory(json_file='data/history.json')
+    else:
+        history = JobHistory(
+            merge_on_save=config.history_merge_on_save,
+            bloom_file='data/history.bloom' if config.history_bloom else None,
+            bloom_fp_rate=config.history_bloom_fp_rate,
+        )
+    policies = []
+    if config.stop_seen_percent > 0 or config.stop_seen_pages > 0:
+        policies.append(SeenHistoryPolicy(
+            history,
+            max_seen_percent=config.stop_seen_percent,
+            max_seen_pages=config.stop_seen_pages,
+        ))
+    if config.stop_stale_percent > 0:
+        policies.append(FreshnessPolicy(config.max_days_old, max_stale_percent=config.stop_stale_percent))
+    transport = None
+    http_transport = None
+    if config.serpapi_replay_dir:
+        logging.info(f"Replaying SerpApi responses from {config.serpapi_replay_dir}.")
+        transport = ReplayTransport(ReplayStore(config.serpapi_replay_dir))
+    elif config.serpapi_transport == "pooled":
+        http_transport = PooledHttpTransport(base_url=config.serpapi_base_url, pool_size=config.search_workers * 2)
+        transport = http_transport
+    if config.serpapi_record_dir:
+        logging.info(f"Recording SerpApi responses to {config.serpapi_record_dir}.")
+        transport = RecordingTransport(config.serpapi_record_dir, inner=transport)
+    budget = ApiBudget(config.max_api_calls, num_combos=len(combinations))
+    rate_limiter = TokenBucket(config.requests_per_second)
+    circuit_breaker = CircuitBreaker(
+        failure_threshold=config.circuit_failure_threshold,
+        cooldown=config.circuit_cooldown_seconds,
+    )
+    finder = JobFinder(
+        config.api_key,
+        max_pages=config.max_pages,
+        cache=cache,
+        policies=policies,
+        budget=budget,
+        rate_limiter=rate_limiter,
+        transport=transport,
+        retry_policy=RetryPolicy(max_delay=config.retry_max_delay),
+        circuit_breaker=circuit_breaker,
+    )
+    job_filter = JobFilter(
+        config,
+        max_days_old=config.max_days_old,
+        min_salary=config.min_salary,
+        adaptive=config.filter_adaptive_order,
+    )
+    # Verdicts for jobs rejected in earlier runs, reused while the job and
+    # the rejecting rule's settings are unchanged
+    rejections = RejectionCache(rule_fingerprints(config)) if config.rejection_cache else None
+    logging.info(f"JobFinder initialized with max_pages={config.max_pages}, search_workers={config.search_workers}.")
     
-    # Deduplicate aggregated results (intra-run duplicates)
-    all_jobs = finder.removeDuplicates(all_jobs)
-    logging.info(f"Total unique jobs found in this run: {len(all_jobs)}")
-
-    # Filter out jobs seen in previous runs (inter-run duplicates)
-    # AND filter by salary if configured
-    # AND filter by date if configured
-    # AND filter by blacklist/keywords
+    # Journal every fetched page so a crashed run can be resumed with --resume
+    checkpoint = RunCheckpoint()
+    checkpoint.start(resume=resume)
+    executor = SearchExecutor(
+        finder,
+        max_workers=config.search_workers,
+        prefetch=config.search_prefetch,
+        checkpoint=checkpoint,
+    )
+
+    # Each combination is deduplicated and filtered as soon as it arrives,
+    # while later combinations are still being fetched.
+    # Intra-run duplicates are tracked across combinations with seen_keys;
+    # inter-run duplicates are checked against the history.
+    # Then run the filter rules (blacklist/keywords/schedule/sources, date and salary).
+    seen_keys = set()
+    total_unique = 0
     new_jobs = []
     skipped_salary = 0
     skipped_date = 0
     skipped_history = 0
     skipped_filter = 0
-    
-    for job in all_jobs:
-        # Check history first
-        if history.is_seen(job):
-            skipped_history += 1
-            continue
-            
-        # Check blacklist and keywords
-        is_valid, reason = job_filter.is_valid(job)
-        if not is_valid:
-            logging.info(f"Skipping job: {reason}")
-            skipped_filter += 1
-            continue
-
-        parsed_job = JobParser.parse_job(job)
-        salary_str = parsed_job.get('salary_raw', 'N/A')
-        days_ago = parsed_job.get('days_ago')
-
-        # Check date if max_days_old is set
-        if days_ago is not None and days_ago > config.max_days_old:
-            logging.info(f"Skipping job: {parsed_job['title']} - Posted: {parsed_job['posted_date']} (Older than {config.max_days_old} days)")
-            skipped_date += 1
-            continue
-
-        # Check salary if min_salary is set
-        if config.min_salary > 0:
-            max_salary = parsed_job.get('max_salary')
-            
-            # If salary is known AND strictly less than min_salary, skip it
-            if max_salary and max_salary < config.min_salary:
-                logging.info(f"Skipping job: {parsed_job['title']} - Salary: {salary_str} (Below {config.min_salary})")
-                skipped_salary += 1
+    skipped_cached = 0
+
+    for query, location, jobs in executor.run(combinations):
+        short_location = format_location_for_query(location)
+        logging.info(f"Found {len(jobs)} jobs for '{query}' in {location} (using '{short_location}').")
+
+        # Deduplicate against everything seen earlier in this run
+        jobs = finder.removeDuplicates(jobs, seen=seen_keys)
+        total_unique += len(jobs)
+
+        # Check history first, for the whole combination at once
+        seen_flags = history.is_seen_many(jobs)
+        candidates = []
+        for job, seen in zip(jobs, seen_flags):
+            if seen:
+                skipped_history += 1
                 continue
-        
-        logging.info(f"Found job: {parsed_job['title']} - Salary: {salary_str} - Posted: {parsed_job['posted_date']}")
-        new_jobs.append(job)
-        history.add_job(job)
+
+            if rejections and rejections.get(job):
+                skipped_cached += 1
+                continue
+            candidates.append(job)
+
+        # Check blacklist, keywords, schedule, sources, age and salary, also
+        # for the whole combination at once
+        batch = {}
+        _, reason_codes = job_filter.evaluate_batch(candidates, batch)
+        for job, reason_code, parsed_job in zip(candidates, reason_codes, batch['parsed']):
+            if reason_code:
+                logging.info(f"Skipping job: {job_filter.describe(job, reason_code, parsed_job)}")
+                if reason_code == JobFilter.AGE:
+                    skipped_date += 1
+                elif reason_code == JobFilter.SALARY:
+                    skipped_salary += 1
+                else:
+                    skipped_filter += 1
+                if rejections:
+                    rejections.add(job, reason_code)
+                continue
+
+            salary_str = parsed_job.get('salary_raw', 'N/A')
+            logging.info(f"Found job: {parsed_job['title']} - Salary: {salary_str} - Posted: {parsed_job['posted_date']}")
+            # Parsed (as far as the filter needed) once in evaluate_batch,
+            # and reused by every report writer
+            new_jobs.append(parsed_job)
+
+    # Only add this run's jobs to the history once every search is done, so
+    # SeenHistoryPolicy stops each combination against the same history (as
+    # loaded at the start of the run), whatever order the searches ran in
+    for parsed_job in new_jobs:
+        history.add_job(parsed_job.raw)
     
+    logging.info(f"Total unique jobs found in this run: {total_unique}")
     logging.info(f"Skipped {skipped_history} jobs due to history (already seen).")
     logging.info(f"Skipped {skipped_filter} jobs due to filters (blacklist/keywords/schedule/sources).")
     logging.info(f"Skipped {skipped_salary} jobs due to low salary.")
     logging.info(f"Skipped {skipped_date} jobs due to age.")
+    if rejections:
+        logging.info(f"Skipped {skipped_cached} jobs rejected in earlier runs ({rejections.invalidated} cached verdicts invalidated by job or config changes).")
     logging.info(f"Net new jobs after history, salary, and date check: {len(new_jobs)}")
     
     # Save results
     logging.info("Saving results...")
-    FileManager.save_json(new_jobs, 'jobs.json')
+    FileManager.save_json([parsed_job.raw for parsed_job in new_jobs], 'jobs.json')
+    FileManager.save_filter_stats(job_filter.stats(), 'filter_stats.md')
     FileManager.save_markdown(new_jobs, 'jobs.md')
     
     # Check if jobs.md is too large for GitHub Issue body (limit is ~65536 chars)
@@ -126,11 +225,36 @@ def main():
         logging.info("Report is too large. Generating condensed summary.")
         FileManager.save_summary_markdown(new_jobs, 'summary.md')
     
-    # Save history and cleanup
-    history.save_history()
+    # Save history and cleanup. The checkpoint is only cleared once the
+    # history is safely on disk, so a failed save can still be resumed.
+    if history.save_history():
+        checkpoint.clear()
     history.cleanup_old_entries()
+    if rejections:
+        rejections.cleanup_old_entries()
+        rejections.save()
+    if config.history_backend == "sqlite":
+        history.close()
     
-    logging.info(f"Total SerpApi calls made in this session: {finder.total_api_calls}")
+    pages_avoided = sum(finder.pages_skipped.values())
+    logging.info(f"Total SerpApi calls made in this session: {finder.total_api_calls} (pages avoided by early stop: {pages_avoided})")
+    if http_transport:
+        http_transport.close()
+        timing = http_transport.summary()
+        if timing:
+            logging.info(
+                f"SerpApi HTTP timing over {timing['requests']} requests on {timing['connections_opened']} connections (avg): "
+                f"dns={timing['dns']:.3f}s connect={timing['connect']:.3f}s tls={timing['tls']:.3f}s "
+                f"ttfb={timing['ttfb']:.3f}s body={timing['body']:.3f}s total={timing['total']:.3f}s"
+            )
+    if circuit_breaker.short_circuited:
+        logging.warning(f"Circuit breaker short-circuited {circuit_breaker.short_circuited} SerpApi requests (state: {circuit_breaker.state}).")
+    if config.max_api_calls > 0:
+        logging.info(f"SerpApi budget: used {budget.used} of {config.max_api_calls} calls, {budget.denied} page requests denied.")
+    for policy_name, pages in sorted(finder.pages_skipped.items()):
+        logging.info(f"Early pagination stop ({policy_name}): skipped up to {pages} pages, saving up to {pages} API credits.")
+    if cache:
+        logging.info(f"SerpApi response cache: {cache.hits} hits, {cache.misses} misses.")
 
     # Send Email Notification
     if config.email_address and config.email_password:
@@ -160,4 +284,11 @@ def main():
     logging.info("Automation completed successfully.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Job Finder Automation")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run from the checkpoint journal instead of starting over.",
+    )
+    args = parser.parse_args()
+    main(resume=args.resume)
\ No newline at end of file
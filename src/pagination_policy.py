@@ -0,0 +1,85 @@
+import logging
+from job_parser import parse_date_fields
+
+class PaginationPolicy:
+    """
+    Base class for early-termination policies consulted by JobFinder after
+    every page. Policies must be stateless; per-search state lives in the
+    `state` dict that JobFinder creates for each query/location search.
+    """
+    name = "policy"
+
+    def should_stop(self, page_jobs, state):
+        """
+        Returns a human-readable reason to stop paginating, or None to continue.
+        """
+        raise NotImplementedError
+
+class SeenHistoryPolicy(PaginationPolicy):
+    """
+    Stops paginating when pages are mostly made of jobs already in JobHistory.
+    main() only adds this run's jobs after every search has finished, so the
+    history checked here is the one loaded at the start of the run.
+    """
+    name = "history"
+
+    def __init__(self, history, max_seen_percent=0, max_seen_pages=0):
+        self.history = history
+        # Stop when more than this percentage of a page was already seen (0 disables)
+        self.max_seen_percent = max_seen_percent
+        # Stop after this many consecutive fully-seen pages (0 disables)
+        self.max_seen_pages = max_seen_pages
+
+    def should_stop(self, page_jobs, state):
+        if not page_jobs:
+            return None
+
+        seen = sum(self.history.is_seen_many(page_jobs))
+        seen_percent = 100.0 * seen / len(page_jobs)
+
+        if seen == len(page_jobs):
+            state["consecutive_seen_pages"] = state.get("consecutive_seen_pages", 0) + 1
+        else:
+            state["consecutive_seen_pages"] = 0
+
+        logging.debug(f"{seen}/{len(page_jobs)} jobs on this page are already in history.")
+
+        if self.max_seen_percent and seen_percent > self.max_seen_percent:
+            return f"{seen_percent:.0f}% of the page is already in history (limit {self.max_seen_percent}%)"
+        if self.max_seen_pages and state["consecutive_seen_pages"] >= self.max_seen_pages:
+            return f"{state['consecutive_seen_pages']} consecutive pages already in history"
+        return None
+
+class FreshnessPolicy(PaginationPolicy):
+    """
+    Stops paginating once a page is dominated by postings older than max_days_old,
+    so we don't pay for pages that main() would throw away anyway.
+    """
+    name = "freshness"
+
+    def __init__(self, max_days_old, max_stale_percent=50):
+        self.max_days_old = max_days_old
+        # Stop when more than this percentage of a page is older than the cutoff
+        self.max_stale_percent = max_stale_percent
+
+    @staticmethod
+    def _days_ago(job):
+        """Age of a raw job, read the same way as the age filter (see JobParser)."""
+        return parse_date_fields(job)[1]
+
+    def should_stop(self, page_jobs, state):
+        if not page_jobs:
+            return None
+
+        stale = 0
+        for job in page_jobs:
+            days_ago = self._days_ago(job)
+            if days_ago is not None and days_ago > self.max_days_old:
+                stale += 1
+        stale_percent = 100.0 * stale / len(page_jobs)
+
+        logging.debug(f"{stale}/{len(page_jobs)} jobs on this page are older than {self.max_days_old} days.")
+
+        if stale_percent > self.max_stale_percent:
+            return f"{stale_percent:.0f}% of the page is older than {self.max_days_old} days (limit {self.max_stale_percent}%)"
+        return None
@@ -0,0 +1,97 @@
+import logging
+import threading
+import time
+
+class BudgetExhaustedError(Exception):
+    """Raised when a search may not spend any more SerpApi calls in this run."""
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that smooths the request rate across all workers.
+    A rate of 0 (or less) disables rate limiting.
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available, then consumes it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            # Sleep outside the lock so other workers can refill/check meanwhile
+            time.sleep(wait_time)
+
+class ApiBudget:
+    """
+    Caps the number of SerpApi calls per run and shares them fairly between
+    query/location combinations.
+
+    Every combination is guaranteed an equal share of the budget. Calls beyond
+    that share come from a common pool, which is refilled with the unused share
+    of each combination once it finishes. A max_calls of 0 (or less) disables
+    the budget.
+    """
+    def __init__(self, max_calls, num_combos=1):
+        self.max_calls = max_calls
+        self.num_combos = max(1, num_combos)
+        self.share = max_calls // self.num_combos if max_calls > 0 else 0
+        self.pool = max_calls - self.share * self.num_combos if max_calls > 0 else 0
+        self.used = 0
+        self.denied = 0
+        self._used_by_combo = {}
+        self._released = set()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, combo):
+        """Reserves one call for combo. Returns False if the budget is exhausted."""
+        if self.max_calls <= 0:
+            with self._lock:
+                self.used += 1
+            return True
+        with self._lock:
+            used = self._used_by_combo.get(combo, 0)
+            within_share = used < self.share and combo not in self._released
+            if not within_share:
+                if self.pool <= 0:
+                    self.denied += 1
+                    return False
+                self.pool -= 1
+            self._used_by_combo[combo] = used + 1
+            self.used += 1
+            return True
+
+    def refund(self, combo):
+        """Gives back a call reserved with try_acquire that was never made."""
+        with self._lock:
+            self.used -= 1
+            if self.max_calls <= 0:
+                return
+            used = self._used_by_combo[combo] - 1
+            self._used_by_combo[combo] = used
+            if not (used < self.share and combo not in self._released):
+                self.pool += 1
+
+    def release(self, combo):
+        """Returns the unused part of combo's share to the common pool."""
+        if self.max_calls <= 0:
+            return
+        with self._lock:
+            if combo in self._released:
+                return
+            self._released.add(combo)
+            unused = max(0, self.share - self._used_by_combo.get(combo, 0))
+            self.pool += unused
+        if unused:
+            logging.debug(f"Released {unused} unused API calls from {combo} to the shared pool.")
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta
+from extension_parser import POSTED_DATE, classify_extension
+from job_history import job_key
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+def rule_fingerprints(config):
+    """
+    Fingerprints of the configuration each rejection reason depends on, so a
+    cached verdict is dropped as soon as its rule's settings change.
+    """
+    return {
+        "blacklist": _digest(sorted(c.lower() for c in config.blacklist_companies)),
+        "keyword": _digest(sorted(k.lower() for k in config.exclude_keywords)),
+        "schedule": _digest(sorted(s.lower() for s in config.schedule_types)),
+        "source": _digest(sorted(d.lower() for d in config.trusted_domains) if config.trusted_domains else None),
+        "age": _digest(config.max_days_old),
+        "salary": _digest(config.min_salary),
+    }
+
+def content_fingerprint(job):
+    """
+    Fingerprint of the job fields the rules look at. The posting date is left
+    out: it changes every day, and an age rejection only becomes more certain.
+    """
+    extensions = [item for item in job.get('extensions') or [] if classify_extension(item).kind != POSTED_DATE]
+    detected = {k: v for k, v in (job.get('detected_extensions') or {}).items() if k != 'posted_at'}
+    options = [(option.get('title', ''), option.get('link', '')) for option in job.get('apply_options') or []]
+    return _digest([
+        job.get('title', ''),
+        job.get('company_name', ''),
+        job.get('location', ''),
+        extensions,
+        detected,
+        options,
+    ])
+
+class RejectionCache:
+    """
+    Persisted verdicts for jobs rejected by the filters, the age check or the
+    salary check, so jobs that stay live for weeks are not re-evaluated (and
+    re-logged) on every run.
+
+    Each entry stores the reason code, the fingerprint of that rule's config
+    and a fingerprint of the job's content. A verdict is only reused while both
+    still match.
+    """
+    def __init__(self, fingerprints, cache_file='data/rejections.json'):
+        self.cache_file = cache_file
+        self.fingerprints = fingerprints
+        self.entries = {}
+        self.hits = 0
+        self.invalidated = 0
+        self._ensure_data_dir()
+        self.load()
+
+    def _ensure_data_dir(self):
+        """Ensure the directory for the cache file exists."""
+        directory = os.path.dirname(self.cache_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def load(self):
+        if not os.path.exists(self.cache_file):
+            logging.info("No rejection cache found. Starting with an empty cache.")
+            self.entries = {}
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                self.entries = json.load(f)
+            logging.info(f"Loaded {len(self.entries)} cached rejections from {self.cache_file}")
+        except (json.JSONDecodeError, IOError) as e:
+            logging.error(f"Failed to load rejection cache: {e}. Starting with an empty cache.")
+            self.entries = {}
+
+    def get(self, job):
+        """Returns the cached reason code for job, or None if it must be evaluated."""
+        job_id = job_key(job)
+        entry = self.entries.get(job_id)
+        if entry is None:
+            return None
+        if entry["fingerprint"] != self.fingerprints.get(entry["reason"]) or entry["content"] != content_fingerprint(job):
+            del self.entries[job_id]
+            self.invalidated += 1
+            return None
+        self.hits += 1
+        return entry["reason"]
+
+    def add(self, job, reason):
+        """Records that job was rejected with reason code (e.g. "keyword", "salary")."""
+        self.entries[job_key(job)] = {
+            "reason": reason,
+            "fingerprint": self.fingerprints.get(reason),
+            "content": content_fingerprint(job),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    def cleanup_old_entries(self, days=45):
+        """Drops verdicts older than the given number of days (the posting is long gone)."""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        expired = [job_id for job_id, entry in self.entries.items() if entry.get("timestamp", "") < cutoff]
+        for job_id in expired:
+            del self.entries[job_id]
+        if expired:
+            logging.info(f"Cleaned up {len(expired)} old entries from the rejection cache.")
+
+    def save(self):
+        """Writes the cache atomically. Returns True on success."""
+        directory = os.path.dirname(self.cache_file) or '.'
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix='.rejections-', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(self.entries, f)
+                os.replace(temp_path, self.cache_file)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+            logging.info(f"Saved {len(self.entries)} cached rejections to {self.cache_file}")
+            return True
+        except (IOError, OSError) as e:
+            logging.error(f"Failed to save rejection cache: {e}")
+            return False
@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+class ResponseCache:
+    def __init__(self, cache_dir='data/serpapi_cache', ttl_seconds=6 * 3600, max_bytes=100 * 1024 * 1024, bypass=False):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> (size_bytes, last_used) for size-bounded LRU eviction
+        self._index = {}
+        self._ensure_cache_dir()
+        self._load_index()
+
+    def _ensure_cache_dir(self):
+        """Ensure the cache directory exists."""
+        if self.cache_dir and not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    def _load_index(self):
+        """Build the in-memory LRU index from the files already on disk."""
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json.gz'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            self._index[name[:-len('.json.gz')]] = (stat.st_size, stat.st_mtime)
+
+    @staticmethod
+    def make_key(params):
+        """
+        Builds a content-addressed key from the search params.
+        The api_key is excluded so the cache is shared across keys, while
+        next_page_token (and every other param) is part of the key.
+        """
+        normalized = {
+            str(k): str(v)
+            for k, v in params.items()
+            if k != 'api_key' and v is not None
+        }
+        payload = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+
+    def get(self, params):
+        """
+        Returns the cached response for params, or None on a miss, an expired
+        entry, or when the cache is bypassed.
+        """
+        if self.bypass:
+            return None
+
+        key = self.make_key(params)
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, EOFError, json.JSONDecodeError) as e:
+            logging.warning(f"Discarding unreadable cache entry {key}: {e}")
+            self._remove(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if time.time() - entry.get('cached_at', 0) > self.ttl_seconds:
+            logging.debug(f"Cache entry {key} expired.")
+            self._remove(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        now = time.time()
+        try:
+            # Touch the file so LRU order survives across runs
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            if key in self._index:
+                self._index[key] = (self._index[key][0], now)
+        logging.info("Serving SerpApi response from cache.")
+        return entry['results']
+
+    def set(self, params, results):
+        """Stores a response and evicts least recently used entries if over max_bytes."""
+        key = self.make_key(params)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        entry = {'cached_at': time.time(), 'results': results}
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"Failed to write cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            self._index[key] = (size, time.time())
+        self._evict()
+
+    def _remove(self, key):
+        with self._lock:
+            self._index.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            total = sum(size for size, _ in self._index.values())
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+                if total <= self.max_bytes:
+                    break
+                victims.append(key)
+                total -= size
+        for key in victims:
+            self._remove(key)
+        logging.info(f"Evicted {len(victims)} entries from the SerpApi response cache.")
@@ -0,0 +1,154 @@
+import logging
+import random
+import threading
+import time
+from transport import TransportError
+
+TRANSIENT = "transient"
+QUOTA = "quota"
+FATAL = "fatal"
+
+class SerpApiError(Exception):
+    """
+    An error reported by SerpApi that ends the current search.
+    account_wide errors (quota, invalid API key) also affect every other search.
+    """
+    def __init__(self, message, kind=FATAL, account_wide=False):
+        super().__init__(message)
+        self.kind = kind
+        self.account_wide = account_wide
+
+class CircuitOpenError(SerpApiError):
+    """Raised instead of calling SerpApi while the circuit breaker is open."""
+    def __init__(self, message):
+        super().__init__(message, kind=TRANSIENT)
+
+# Substrings of SerpApi "error" messages, checked in order
+_NO_RESULTS_MESSAGES = ("hasn't returned any results",)
+_QUOTA_MESSAGES = ("run out of searches", "searches for the month", "rate limit", "plan limit", "too many requests")
+_AUTH_MESSAGES = ("invalid api key", "api key is missing", "account is suspended", "unauthorized")
+_TRANSIENT_MESSAGES = ("try again", "timeout", "timed out", "temporarily", "internal error", "server error")
+
+def classify_response_error(message):
+    """
+    Classifies the "error" value of a SerpApi response.
+    Returns None when the error just means there are no (more) results.
+    """
+    text = str(message).lower()
+    if any(m in text for m in _NO_RESULTS_MESSAGES):
+        return None
+    if any(m in text for m in _QUOTA_MESSAGES):
+        return SerpApiError(message, kind=QUOTA, account_wide=True)
+    if any(m in text for m in _AUTH_MESSAGES):
+        return SerpApiError(message, kind=FATAL, account_wide=True)
+    if any(m in text for m in _TRANSIENT_MESSAGES):
+        return SerpApiError(message, kind=TRANSIENT)
+    return SerpApiError(message, kind=FATAL)
+
+def classify_exception(error):
+    """Classifies an exception raised while talking to SerpApi."""
+    if isinstance(error, SerpApiError):
+        return error.kind
+    if isinstance(error, TransportError) and error.status:
+        if error.status == 429:
+            # Rate limiting with a retry hint is worth waiting for; without one
+            # it usually means the plan's searches are used up.
+            return TRANSIENT if error.retry_after else QUOTA
+        if error.status in (401, 403):
+            return FATAL
+        if 400 <= error.status < 500 and error.status != 408:
+            return FATAL
+    # Invalid JSON, connection resets, timeouts and 5xx are worth retrying
+    return TRANSIENT
+
+class RetryPolicy:
+    """
+    Decorrelated-jitter backoff: each delay is drawn uniformly between
+    base_delay and three times the previous delay, capped at max_delay.
+    The randomness keeps concurrent workers from retrying in lock-step.
+    """
+    def __init__(self, base_delay=1.0, max_delay=30.0, rng=None):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def next_delay(self, previous_delay=None, retry_after=None):
+        """Returns the number of seconds to wait before the next attempt."""
+        if retry_after is not None:
+            return min(max(float(retry_after), 0.0), self.max_delay)
+        previous_delay = previous_delay or self.base_delay
+        return min(self.max_delay, self.rng.uniform(self.base_delay, previous_delay * 3))
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker shared by all searches of a run.
+
+    After failure_threshold consecutive failures (or an account-wide error)
+    the circuit opens and every call is short-circuited for cooldown seconds.
+    Then a single trial call is let through: success closes the circuit,
+    failure opens it again.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=5, cooldown=300):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.short_circuited = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Returns True if a call may be made now."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at >= self.cooldown:
+                    self.state = self.HALF_OPEN
+                    logging.info("Circuit breaker half-open, allowing a trial request.")
+                    return True
+                self.short_circuited += 1
+                return False
+            if self.state == self.HALF_OPEN:
+                # Only the trial request is allowed until it reports back
+                self.short_circuited += 1
+                return False
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logging.info("Circuit breaker closed.")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+
+    def release_trial(self):
+        """
+        Ends a half-open trial that neither succeeded nor failed (e.g. a fatal
+        error about the request itself), so the next call becomes a new trial.
+        Has no effect in any other state.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic() - self.cooldown
+
+    def trip(self, reason):
+        """Opens the circuit immediately, e.g. on a quota or invalid API key error."""
+        with self._lock:
+            logging.error(f"Circuit breaker tripped: {reason}")
+            self._open()
+
+    def _open(self):
+        if self.state != self.OPEN:
+            logging.warning(f"Circuit breaker open for {self.cooldown}s after {self.failures} failure(s).")
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
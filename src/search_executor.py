@@ -0,0 +1,77 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from job_finder import INTERRUPTED_STOPS
+
+class SearchExecutor:
+    def __init__(self, finder, max_workers=1, prefetch=False, checkpoint=None):
+        self.finder = finder
+        self.max_workers = max(1, int(max_workers))
+        self.prefetch = prefetch
+        # Optional RunCheckpoint journaling every fetched page
+        self.checkpoint = checkpoint
+        logging.info(f"SearchExecutor created with max_workers={self.max_workers}, prefetch={self.prefetch}.")
+
+    def _run_one(self, combination):
+        """
+        Runs a single (query, location, search_params) combination.
+        """
+        query, location, search_params = combination
+        if not self.checkpoint:
+            logging.info(f"Searching for '{query}' in {location}...")
+            jobs = self.finder.search_jobs(search_params, prefetch=self.prefetch)
+            return query, location, jobs
+
+        combo = (query, location)
+        state = self.checkpoint.get(combo) or {"pages": [], "next_page_token": None, "done": False}
+        jobs = [job for page_jobs in state["pages"] for job in page_jobs]
+        if state["done"] or (state["pages"] and not state["next_page_token"]):
+            logging.info(f"Resuming '{query}' in {location}: reusing {len(state['pages'])} journaled page(s).")
+            # Its budget share is left for the searches that still need calls
+            self.finder.release_budget(search_params)
+            return query, location, jobs
+
+        if state["pages"]:
+            logging.info(f"Resuming '{query}' in {location} from page {len(state['pages']) + 1}...")
+        else:
+            logging.info(f"Searching for '{query}' in {location}...")
+
+        def on_page(page, page_jobs, next_page_token):
+            self.checkpoint.record_page(combo, page, page_jobs, next_page_token)
+
+        stopped = []
+        for page_jobs in self.finder.iter_pages(
+            search_params,
+            prefetch=self.prefetch,
+            start_page=len(state["pages"]),
+            next_page_token=state["next_page_token"],
+            on_page=on_page,
+            on_stop=stopped.append,
+        ):
+            jobs.extend(page_jobs)
+        # A search cut short by an API error, the circuit breaker or the budget
+        # stays open in the journal, so --resume fetches the remaining pages
+        if stopped and stopped[0] not in INTERRUPTED_STOPS:
+            self.checkpoint.record_done(combo)
+        else:
+            logging.warning(f"Search for '{query}' in {location} was interrupted; --resume will continue it.")
+        return query, location, jobs
+
+    def run(self, combinations):
+        """
+        Executes all search combinations and lazily yields (query, location, jobs)
+        tuples in the same order as the combinations were given, regardless
+        of the order in which the searches finish. Callers can process each
+        combination while later ones are still being fetched.
+        """
+        combinations = list(combinations)
+        if self.max_workers == 1 or len(combinations) <= 1:
+            for combination in combinations:
+                yield self._run_one(combination)
+            return
+
+        workers = min(self.max_workers, len(combinations))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search") as executor:
+            # executor.map preserves input order, so aggregated results are
+            # identical to a sequential run.
+            for result in executor.map(self._run_one, combinations):
+                yield result
@@ -0,0 +1,230 @@
+"""
+Time-partitioned job history.
+
+Select it with HISTORY_BACKEND=segmented. Entries are stored in one JSON file
+per ISO week under data/history/, listed in a small manifest.json:
+    {"version": 1, "segments": {"2026-W42": {"file": "2026-W42.json", "start": "2026-10-12", "count": 12}}}
+Expiring old entries deletes whole week files, and startup only reads the
+weeks inside the retention window. An existing data/history.json is split
+into weekly segments the first time the directory is created.
+
+Saves take the same file lock as JobHistory and write each file to a
+temporary file that is renamed over it, segments first and the manifest
+last, so the manifest never lists a missing or partly written segment.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from job_history import JobHistory, copy_file_mode
+
+MANIFEST_VERSION = 1
+
+def week_of(timestamp):
+    """Returns the ISO week segment name ("2026-W42") of a datetime."""
+    year, week, _ = timestamp.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def week_start(name):
+    """Returns the Monday that starts the ISO week segment name."""
+    year, week = name.split("-W")
+    return date.fromisocalendar(int(year), int(week), 1)
+
+class SegmentedJobHistory(JobHistory):
+    """
+    JobHistory partitioned into weekly segments.
+
+    Segments are kept separately in memory ({week: {job_id: timestamp}}).
+    Cleanup works at week granularity: a segment is dropped once its whole
+    week is older than the retention window, so an entry can outlive it by
+    up to 7 days.
+    """
+    def __init__(self, history_dir='data/history', json_file=None, retention_days=45):
+        self.history_dir = history_dir
+        self.manifest_file = os.path.join(history_dir, 'manifest.json')
+        self.lock_file = self.manifest_file + '.lock'
+        self.json_file = json_file
+        self.retention_days = retention_days
+        self.manifest = {"version": MANIFEST_VERSION, "segments": {}}
+        self.segments = {}
+        self._dirty = set()
+        # Segments dropped by cleanup, removed from the manifest on the next save
+        self._expired = set()
+        # Pagination policies read the segments from the search worker threads
+        self._lock = threading.Lock()
+        self._ensure_data_dir()
+        self.load_history()
+
+    def _ensure_data_dir(self):
+        """Ensure the segment directory exists."""
+        if not os.path.exists(self.history_dir):
+            os.makedirs(self.history_dir)
+
+    def _is_expired(self, name, days):
+        """True if the whole week of segment name ended before the cutoff."""
+        cutoff = (datetime.now() - timedelta(days=days)).date()
+        return week_start(name) + timedelta(days=7) <= cutoff
+
+    def load_history(self):
+        """Loads the manifest and the segments inside the retention window."""
+        self.segments = {}
+        self._dirty = set()
+        if not os.path.exists(self.manifest_file):
+            self.manifest = {"version": MANIFEST_VERSION, "segments": {}}
+            if self.json_file and os.path.exists(self.json_file):
+                self._import_json(self.json_file)
+            else:
+                logging.info("No history manifest found. Starting with empty history.")
+            return
+
+        try:
+            with open(self.manifest_file, 'r') as f:
+                self.manifest = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logging.error(f"Failed to load history manifest: {e}. Starting with empty history.")
+            self.manifest = {"version": MANIFEST_VERSION, "segments": {}}
+            return
+
+        skipped = 0
+        for name, info in self.manifest["segments"].items():
+            if self._is_expired(name, self.retention_days):
+                skipped += 1
+                continue
+            try:
+                with open(os.path.join(self.history_dir, info["file"]), 'r') as f:
+                    self.segments[name] = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logging.error(f"Failed to load history segment {name}: {e}. Skipping it.")
+        entries = sum(len(segment) for segment in self.segments.values())
+        logging.info(f"Loaded {len(self.segments)} history segments ({entries} entries) from {self.history_dir}, skipped {skipped} expired.")
+
+    def _import_json(self, json_file):
+        """Splits a history.json file into weekly segments."""
+        try:
+            with open(json_file, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logging.error(f"Failed to read history file {json_file}: {e}")
+            return
+
+        for job_id, timestamp in data.items():
+            try:
+                name = week_of(datetime.fromisoformat(timestamp))
+            except (TypeError, ValueError):
+                logging.warning(f"Skipping history entry {job_id} with invalid timestamp {timestamp!r}.")
+                continue
+            self.segments.setdefault(name, {})[job_id] = timestamp
+            self._dirty.add(name)
+        logging.info(f"Imported {len(data)} entries from {json_file} into {len(self.segments)} weekly segments.")
+
+    def _write_atomic(self, path, data):
+        """Writes data to a temporary file in the segment directory and renames it over path."""
+        fd, temp_path = tempfile.mkstemp(prefix='.history-', suffix='.tmp', dir=self.history_dir)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            copy_file_mode(temp_path, path)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def _read_saved(self, path, default):
+        """Reads a manifest or segment saved by another run. Returns default if it is missing or unreadable."""
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return default
+
+    def save_history(self):
+        """
+        Writes the segments changed in this run, then the manifest. Segments and
+        manifest entries saved by other runs in the meantime are merged in.
+        Returns True on success.
+        """
+        try:
+            with self._locked():
+                manifest = self._read_saved(self.manifest_file, self.manifest)
+                segments = manifest.setdefault("segments", {})
+                for name in self._expired:
+                    segments.pop(name, None)
+                for name in sorted(self._dirty):
+                    with self._lock:
+                        segment = self.segments.get(name)
+                    if segment is None:
+                        continue
+                    filename = f"{name}.json"
+                    path = os.path.join(self.history_dir, filename)
+                    if name in segments:
+                        segment = {**self._read_saved(path, {}), **segment}
+                    self._write_atomic(path, segment)
+                    with self._lock:
+                        self.segments[name] = segment
+                    segments[name] = {
+                        "file": filename,
+                        "start": week_start(name).isoformat(),
+                        "count": len(segment),
+                    }
+                self._write_atomic(self.manifest_file, manifest)
+            self.manifest = manifest
+            self._dirty = set()
+            self._expired = set()
+            logging.info(f"Saved job history to {self.history_dir}")
+            return True
+        except (IOError, OSError) as e:
+            logging.error(f"Failed to save history segments: {e}")
+            return False
+
+    def is_seen(self, job):
+        """Check if a job has been seen before."""
+        job_id = self._generate_id(job)
+        with self._lock:
+            segments = list(self.segments.values())
+        return any(job_id in segment for segment in segments)
+
+    def is_seen_many(self, jobs):
+        """Check a whole page of jobs at once. Returns one boolean per job."""
+        with self._lock:
+            segments = list(self.segments.values())
+        return [any(job_id in segment for segment in segments) for job_id in map(self._generate_id, jobs)]
+
+    def add_job(self, job):
+        """Add a job to the current week's segment."""
+        job_id = self._generate_id(job)
+        now = datetime.now()
+        name = week_of(now)
+        with self._lock:
+            self.segments.setdefault(name, {})[job_id] = now.isoformat()
+        self._dirty.add(name)
+
+    def cleanup_old_entries(self, days=45):
+        """Drops whole weekly segments that are older than the specified number of days."""
+        expired = [name for name in self.manifest["segments"] if self._is_expired(name, days)]
+        expired += [name for name in self.segments if name not in self.manifest["segments"] and self._is_expired(name, days)]
+        if not expired:
+            return
+
+        removed_count = 0
+        paths = []
+        for name in expired:
+            info = self.manifest["segments"].pop(name, None)
+            with self._lock:
+                segment = self.segments.pop(name, None)
+            self._dirty.discard(name)
+            self._expired.add(name)
+            if info:
+                removed_count += info["count"]
+                paths.append(os.path.join(self.history_dir, info["file"]))
+            elif segment:
+                removed_count += len(segment)
+        logging.info(f"Cleaned up {len(expired)} expired history segments ({removed_count} entries).")
+        # The files are only deleted once the manifest no longer lists them
+        if self.save_history():
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
@@ -0,0 +1,305 @@
+"""
+Record/replay stand-in for SerpApi, for offline benchmarking and load tests.
+
+Record real responses (including pagination tokens) into a fixture corpus:
+    SERPAPI_RECORD_DIR=data/serpapi_fixtures python src/main.py
+
+Replay them in-process (no network, no credits):
+    SERPAPI_REPLAY_DIR=data/serpapi_fixtures python src/main.py
+
+Or serve them over HTTP and point the pooled transport at the server:
+    python src/serpapi_replay.py serve --fixtures data/serpapi_fixtures --port 8765 --latency 0.2
+    SERPAPI_BASE_URL=http://127.0.0.1:8765 python src/main.py
+"""
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from serpapi import GoogleSearch
+from date_parser import SECONDS_PER_DAY
+from response_cache import ResponseCache
+from transport import TransportError
+
+# Used to synthesize pages when the fixture corpus is empty
+SEED_JOBS = [
+    {
+        "title": "Software Developer",
+        "company_name": "Maple Systems",
+        "location": "Toronto, ON",
+        "share_link": "https://www.google.com/search?q=software+developer",
+        "extensions": ["2 days ago", "Full-time", "$90K–$110K a year"],
+        "detected_extensions": {"posted_at": "2 days ago", "schedule_type": "Full-time", "salary": "$90K–$110K a year"},
+        "apply_options": [{"title": "LinkedIn", "link": "https://ca.linkedin.com/jobs/view/1"}],
+    },
+    {
+        "title": "Backend Engineer",
+        "company_name": "Northwind",
+        "location": "Montreal, QC",
+        "share_link": "https://www.google.com/search?q=backend+engineer",
+        "extensions": ["5 days ago", "Full-time", "Health insurance"],
+        "detected_extensions": {"posted_at": "5 days ago", "schedule_type": "Full-time"},
+        "apply_options": [{"title": "Northwind Careers", "link": "https://careers.northwind.com/jobs/2"}],
+    },
+    {
+        "title": "Junior Python Developer",
+        "company_name": "Lakeshore Labs",
+        "location": "Toronto, ON",
+        "share_link": "https://www.google.com/search?q=python+developer",
+        "extensions": ["30+ days ago", "Contractor", "$35–$45 an hour"],
+        "detected_extensions": {"posted_at": "30+ days ago", "schedule_type": "Contractor", "salary": "$35–$45 an hour"},
+        "apply_options": [{"title": "Indeed", "link": "https://ca.indeed.com/viewjob?jk=3"}],
+    },
+]
+
+class RecordingTransport:
+    """
+    Wraps another transport (or serpapi.GoogleSearch when inner is None) and
+    saves every successful response to the fixture corpus, with the time it
+    was fetched.
+    """
+    def __init__(self, fixture_dir, inner=None):
+        self.fixture_dir = fixture_dir
+        self.inner = inner
+        os.makedirs(fixture_dir, exist_ok=True)
+
+    def fetch(self, params):
+        if self.inner:
+            results = self.inner.fetch(params)
+        else:
+            results = GoogleSearch(params).get_dict()
+        if "error" not in results:
+            key = ResponseCache.make_key(params)
+            fixture = {
+                "params": {k: v for k, v in params.items() if k != "api_key"},
+                "fetched_at": int(time.time()),
+                "response": results,
+            }
+            with open(os.path.join(self.fixture_dir, f"{key}.json"), 'w') as f:
+                json.dump(fixture, f, indent=2)
+            logging.debug(f"Recorded SerpApi response {key}.")
+        return results
+
+class ReplayStore:
+    """
+    Serves recorded responses by request key.
+
+    With synthetic_pages > 0, every recorded search is extended by that many
+    synthetic pages and searches that were not recorded get that many pages,
+    cloned deterministically from the corpus jobs with unique ids. For example
+    100 searches x 100 synthetic pages x 10 jobs = 100k jobs.
+
+    Every replayed job is stamped with a fetched_at, so replays don't depend on
+    the wall clock: the recording time for recorded responses, anchor_time for
+    synthetic pages and fixtures recorded without one. anchor_time defaults to
+    the newest recording time, or the start of the current UTC day for an
+    empty corpus.
+    """
+    def __init__(self, fixture_dir=None, synthetic_pages=0, page_size=10, anchor_time=None):
+        self.responses = {}
+        self.fetched_at = {}
+        self.jobs = []
+        self.synthetic_pages = synthetic_pages
+        self.page_size = page_size
+        if fixture_dir and os.path.isdir(fixture_dir):
+            self._load(fixture_dir)
+        if not self.jobs:
+            self.jobs = copy.deepcopy(SEED_JOBS)
+        if anchor_time is None:
+            anchor_time = max(self.fetched_at.values(), default=int(time.time()) // SECONDS_PER_DAY * SECONDS_PER_DAY)
+        self.anchor_time = anchor_time
+
+    @staticmethod
+    def _stamp(response, fetched_at):
+        # Relative dates ("3 days ago") refer to this time, which JobFinder
+        # keeps instead of stamping the replay time
+        for job in response.get("jobs_results", []):
+            job.setdefault("fetched_at", fetched_at)
+        return response
+
+    def _load(self, fixture_dir):
+        for name in sorted(os.listdir(fixture_dir)):
+            if not name.endswith('.json'):
+                continue
+            with open(os.path.join(fixture_dir, name), 'r') as f:
+                fixture = json.load(f)
+            key = name[:-len('.json')]
+            self.responses[key] = fixture["response"]
+            if "fetched_at" in fixture:
+                self.fetched_at[key] = fixture["fetched_at"]
+            self.jobs.extend(fixture["response"].get("jobs_results", []))
+        logging.info(f"Loaded {len(self.responses)} recorded responses ({len(self.jobs)} jobs) from {fixture_dir}.")
+
+    def lookup(self, params):
+        """Returns the response for one request."""
+        token = params.get("next_page_token") or ""
+        if token.startswith("replay:"):
+            _, base_key, page = token.split(":")
+            return self._synthesize(base_key, int(page))
+
+        key = ResponseCache.make_key(params)
+        base_key = ResponseCache.make_key({k: v for k, v in params.items() if k != "next_page_token"})
+        if key in self.responses:
+            response = self._stamp(copy.deepcopy(self.responses[key]), self.fetched_at.get(key, self.anchor_time))
+            if self.synthetic_pages and not response.get("serpapi_pagination", {}).get("next_page_token"):
+                # Append the synthetic pages after the last recorded page
+                response.setdefault("serpapi_pagination", {})["next_page_token"] = f"replay:{base_key}:0"
+            return response
+        if self.responses and not self.synthetic_pages:
+            return {"error": "Google hasn't returned any results for this query."}
+        return self._synthesize(base_key, 0)
+
+    def _synthesize(self, base_key, page):
+        """Builds synthetic page number `page` of the search identified by base_key."""
+        total_pages = max(1, self.synthetic_pages)
+        rng = random.Random(f"{base_key}:{page}")
+        jobs = []
+        for i in range(self.page_size):
+            job = copy.deepcopy(rng.choice(self.jobs))
+            job.pop("fetched_at", None)
+            digest = hashlib.sha1(f"{base_key}:{page * self.page_size + i}".encode('utf-8')).hexdigest()[:16]
+            job["job_id"] = f"replay-{digest}"
+            job["title"] = f"{job.get('title', 'Job')} #{digest[:6]}"
+            jobs.append(job)
+
+        response = self._stamp({
+            "search_metadata": {"status": "Success", "replayed": True},
+            "jobs_results": jobs,
+        }, self.anchor_time)
+        if page + 1 < total_pages:
+            response["serpapi_pagination"] = {"next_page_token": f"replay:{base_key}:{page + 1}"}
+        return response
+
+class ReplayTransport:
+    """
+    In-process transport answering from a ReplayStore, with optional latency
+    and deterministic error injection.
+
+    Error kinds: "invalid_json" raises json.JSONDecodeError, "http_5xx" raises
+    TransportError(status=503), "error_key" returns an {"error": ...} payload.
+    Injection depends only on the seed, the request and how many times it was
+    sent, so concurrent runs inject the same errors in the same places.
+    """
+    ERROR_KINDS = ("invalid_json", "http_5xx", "error_key")
+
+    def __init__(self, store, latency=0.0, error_rate=0.0, error_kinds=ERROR_KINDS, seed=0):
+        self.store = store
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_kinds = tuple(error_kinds)
+        self.seed = seed
+        self.requests = 0
+        self._attempts = {}
+        self._lock = threading.Lock()
+
+    def _injected_error(self, params):
+        if not self.error_rate or not self.error_kinds:
+            return None
+        key = ResponseCache.make_key(params)
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+        rng = random.Random(f"{self.seed}:{key}:{attempt}")
+        if rng.random() < self.error_rate:
+            return rng.choice(self.error_kinds)
+        return None
+
+    def fetch(self, params):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        error = self._injected_error(params)
+        if error == "invalid_json":
+            raise json.JSONDecodeError("Expecting value", "<html>", 0)
+        if error == "http_5xx":
+            raise TransportError("HTTP 503 from replay", status=503)
+        if error == "error_key":
+            return {"error": "Replay injected error"}
+        return self.store.lookup(params)
+
+class ReplayServer:
+    """
+    Serves a ReplayTransport over HTTP on /search.json, so the real
+    PooledHttpTransport can be exercised end to end.
+    """
+    def __init__(self, transport, host="127.0.0.1", port=0):
+        replay = transport
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+                status, body = 200, None
+                try:
+                    body = json.dumps(replay.fetch(params)).encode('utf-8')
+                except json.JSONDecodeError:
+                    body = b"<html>not json</html>"
+                except TransportError as e:
+                    status, body = e.status or 500, b"<html>Service Unavailable</html>"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logging.debug(f"Replay server: {format % args}")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        logging.info(f"Replay server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="SerpApi replay server.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve = subparsers.add_parser("serve", help="Serve a fixture corpus over HTTP.")
+    serve.add_argument("--fixtures", default="data/serpapi_fixtures")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--synthetic-pages", type=int, default=0)
+    serve.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = ReplayStore(args.fixtures, synthetic_pages=args.synthetic_pages)
+    transport = ReplayTransport(store, latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+    server = ReplayServer(transport, host=args.host, port=args.port)
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+if __name__ == "__main__":
+    main()
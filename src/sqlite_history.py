@@ -0,0 +1,164 @@
+"""
+SQLite storage backend for JobHistory.
+
+Select it with HISTORY_BACKEND=sqlite. An existing data/history.json is
+imported automatically the first time the database is opened, or explicitly:
+    python src/sqlite_history.py migrate --json data/history.json --db data/history.db
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from job_history import JobHistory
+
+class SqliteJobHistory(JobHistory):
+    """
+    JobHistory stored in a SQLite database (WAL mode) instead of one JSON file.
+
+    Startup no longer parses the whole history: lookups are primary-key queries.
+    New jobs are buffered and inserted in batches, and expiry is a single
+    DELETE on the indexed timestamp column (seconds since the epoch).
+    """
+    def __init__(self, history_file='data/history.db', json_file=None, batch_size=500):
+        self.history_file = history_file
+        self.json_file = json_file
+        self.batch_size = batch_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._ensure_data_dir()
+        self.load_history()
+
+    def load_history(self):
+        """Opens the database, creating the schema (and importing json_file) if needed."""
+        # Pagination policies call is_seen from the search worker threads
+        self._conn = sqlite3.connect(self.history_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS history (job_id TEXT PRIMARY KEY, ts REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_ts ON history (ts)")
+        self._conn.commit()
+
+        count = len(self)
+        if count == 0 and self.json_file and os.path.exists(self.json_file):
+            logging.info(f"History database is empty. Importing {self.json_file}...")
+            self.migrate_from_json(self.json_file)
+            count = len(self)
+        logging.info(f"Opened job history database {self.history_file} ({count} entries)")
+
+    def __len__(self):
+        with self._lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+            return stored + len(self._pending)
+
+    def migrate_from_json(self, json_file):
+        """
+        Imports a history.json file ({job_id: ISO timestamp}). Entries with an
+        invalid timestamp are skipped. Returns the number of imported entries.
+        """
+        try:
+            with open(json_file, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logging.error(f"Failed to read history file {json_file}: {e}")
+            return 0
+
+        rows = []
+        for job_id, timestamp in data.items():
+            try:
+                rows.append((job_id, datetime.fromisoformat(timestamp).timestamp()))
+            except (TypeError, ValueError):
+                logging.warning(f"Skipping history entry {job_id} with invalid timestamp {timestamp!r}.")
+
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO history (job_id, ts) VALUES (?, ?)", rows)
+            self._conn.commit()
+        logging.info(f"Imported {len(rows)} entries from {json_file} into {self.history_file}")
+        return len(rows)
+
+    def _flush(self):
+        """Writes the buffered jobs. Must be called with the lock held."""
+        if not self._pending:
+            return
+        self._conn.executemany("INSERT OR REPLACE INTO history (job_id, ts) VALUES (?, ?)", self._pending.items())
+        self._conn.commit()
+        self._pending = {}
+
+    def save_history(self):
+        """Writes any buffered jobs. Returns True on success."""
+        try:
+            with self._lock:
+                self._flush()
+            logging.info(f"Saved job history to {self.history_file}")
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"Failed to save history database: {e}")
+            return False
+
+    def is_seen(self, job):
+        """Check if a job has been seen before."""
+        job_id = self._generate_id(job)
+        with self._lock:
+            if job_id in self._pending:
+                return True
+            row = self._conn.execute("SELECT 1 FROM history WHERE job_id = ?", (job_id,)).fetchone()
+        return row is not None
+
+    def is_seen_many(self, jobs):
+        """Checks a whole page of jobs with one query per chunk. Returns one boolean per job."""
+        job_ids = [self._generate_id(job) for job in jobs]
+        found = set()
+        with self._lock:
+            found.update(job_id for job_id in job_ids if job_id in self._pending)
+            # Stay well below SQLite's limit on bound parameters
+            for start in range(0, len(job_ids), 500):
+                chunk = job_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(f"SELECT job_id FROM history WHERE job_id IN ({placeholders})", chunk)
+                found.update(row[0] for row in rows)
+        return [job_id in found for job_id in job_ids]
+
+    def add_job(self, job):
+        """Add a job to the history. Jobs are written in batches of batch_size."""
+        job_id = self._generate_id(job)
+        with self._lock:
+            self._pending[job_id] = time.time()
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def cleanup_old_entries(self, days=45):
+        """Remove entries older than the specified number of days."""
+        cutoff = time.time() - days * 86400
+        with self._lock:
+            self._flush()
+            removed_count = self._conn.execute("DELETE FROM history WHERE ts < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        if removed_count > 0:
+            logging.info(f"Cleaned up {removed_count} old entries from history.")
+
+    def close(self):
+        """Writes buffered jobs and closes the database."""
+        if self._conn:
+            self.save_history()
+            self._conn.close()
+            self._conn = None
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite job history tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Import a history.json file into the SQLite database.")
+    migrate.add_argument("--json", default="data/history.json")
+    migrate.add_argument("--db", default="data/history.db")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    history = SqliteJobHistory(args.db)
+    history.migrate_from_json(args.json)
+    history.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import gzip
+import http.client
+import json
+import logging
+import queue
+import socket
+import ssl
+import threading
+import time
+from collections import deque
+from urllib.parse import urlencode, urlsplit
+
+class TransportError(Exception):
+    """Raised when SerpApi (or a stand-in) answers with an unusable HTTP response."""
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+class _TimedConnectMixin:
+    """
+    Replaces http.client's connect() with one that times DNS, TCP connect and
+    TLS separately (in connect_timing). Because the connection classes stay
+    HTTPConnection/HTTPSConnection, any automatic reconnect (e.g. after the
+    server closed the socket) goes through the same code, so an HTTPS
+    connection can never reconnect in plaintext.
+    """
+    connect_timing = None
+
+    def _wrap_socket(self, sock):
+        return sock
+
+    def connect(self):
+        start = time.perf_counter()
+        family, socktype, proto, _, address = socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)[0]
+        resolved = time.perf_counter()
+
+        sock = socket.socket(family, socktype, proto)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(address)
+            connected = time.perf_counter()
+            sock = self._wrap_socket(sock)
+            handshaken = time.perf_counter()
+        except OSError:
+            sock.close()
+            raise
+
+        self.sock = sock
+        self.connect_timing = {
+            "dns": resolved - start,
+            "connect": connected - resolved,
+            "tls": handshaken - connected,
+        }
+
+class TimedHTTPConnection(_TimedConnectMixin, http.client.HTTPConnection):
+    """Plain HTTP connection recording its connection setup timings."""
+
+class TimedHTTPSConnection(_TimedConnectMixin, http.client.HTTPSConnection):
+    """HTTPS connection recording its connection setup timings."""
+    def _wrap_socket(self, sock):
+        return self._context.wrap_socket(sock, server_hostname=self.host)
+
+class PooledHttpTransport:
+    """
+    SerpApi transport that keeps a pool of keep-alive connections instead of
+    opening a new HTTPS connection (and TLS handshake) for every page.
+
+    Responses are requested gzip-compressed. Each request records a timing
+    breakdown (dns/connect/tls/ttfb/body in seconds); reused connections
+    report 0 for the connection setup phases.
+    """
+    # Errors that mean an idle keep-alive connection was closed by the server
+    _STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+    def __init__(self, base_url="https://serpapi.com", path="/search.json", pool_size=8, timeout=60, max_timings=1000):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.scheme == "https" else 80)
+        self.path = path
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+        self._lock = threading.Lock()
+        self.timings = deque(maxlen=max_timings)
+        self.connections_opened = 0
+
+    def _open_connection(self, timing):
+        """Opens a new connection, timing DNS, TCP connect and TLS separately."""
+        if self._ssl_context:
+            connection = TimedHTTPSConnection(self.host, self.port, timeout=self.timeout, context=self._ssl_context)
+        else:
+            connection = TimedHTTPConnection(self.host, self.port, timeout=self.timeout)
+        connection.connect()
+        timing.update(connection.connect_timing)
+        with self._lock:
+            self.connections_opened += 1
+        return connection
+
+    def _acquire(self, timing):
+        try:
+            connection = self._pool.get_nowait()
+            timing.update(dns=0.0, connect=0.0, tls=0.0, reused=True)
+            return connection
+        except queue.Empty:
+            timing["reused"] = False
+            return self._open_connection(timing)
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _request(self, connection, url, timing):
+        start = time.perf_counter()
+        connection.request("GET", url, headers={
+            "Host": self.host,
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+            "User-Agent": "job-finder-automation",
+        })
+        response = connection.getresponse()
+        first_byte = time.perf_counter()
+        body = response.read()
+        done = time.perf_counter()
+        timing["ttfb"] = first_byte - start
+        timing["body"] = done - first_byte
+        return response, body
+
+    def fetch(self, params):
+        """
+        Sends one SerpApi request and returns the decoded JSON response.
+        Like serpapi.GoogleSearch.get_dict, JSON error payloads (e.g. an invalid
+        API key) are returned as-is; non-JSON 5xx/429 responses raise TransportError.
+        """
+        url = f"{self.path}?{urlencode(params)}"
+        timing = {}
+        connection = self._acquire(timing)
+        try:
+            response, body = self._request(connection, url, timing)
+        except self._STALE_CONNECTION_ERRORS:
+            connection.close()
+            if not timing.get("reused"):
+                raise
+            # The pooled connection went stale; retry once on a fresh one
+            logging.debug("Pooled connection was closed by the server, reconnecting.")
+            timing = {"reused": False}
+            connection = self._open_connection(timing)
+            try:
+                response, body = self._request(connection, url, timing)
+            except Exception:
+                connection.close()
+                raise
+        except Exception:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(connection)
+
+        timing["status"] = response.status
+        timing["total"] = sum(timing.get(phase, 0.0) for phase in ("dns", "connect", "tls", "ttfb", "body"))
+        with self._lock:
+            self.timings.append(timing)
+        logging.debug(
+            f"SerpApi request: status={response.status} reused={timing['reused']} "
+            f"dns={timing['dns']:.3f}s connect={timing['connect']:.3f}s tls={timing['tls']:.3f}s "
+            f"ttfb={timing['ttfb']:.3f}s body={timing['body']:.3f}s"
+        )
+
+        if response.getheader("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+
+        try:
+            return json.loads(body.decode("utf-8"))
+        except json.JSONDecodeError:
+            if response.status >= 400:
+                retry_after = response.getheader("Retry-After")
+                raise TransportError(
+                    f"HTTP {response.status} from {self.host}",
+                    status=response.status,
+                    retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+                )
+            raise
+
+    def summary(self):
+        """Returns average timings per phase (seconds) over the recorded requests."""
+        with self._lock:
+            timings = list(self.timings)
+        if not timings:
+            return {}
+        phases = ("dns", "connect", "tls", "ttfb", "body", "total")
+        summary = {phase: sum(t[phase] for t in timings) / len(timings) for phase in phases}
+        summary["requests"] = len(timings)
+        summary["connections_opened"] = self.connections_opened
+        return summary
+
+    def close(self):
+        """Closes every idle pooled connection."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
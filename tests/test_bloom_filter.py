@@ -0,0 +1,63 @@
+import logging
+import pytest
+from bloom_filter import BloomFilter, file_fingerprint
+
+def test_no_false_negatives():
+    """Every added key is reported as possibly present."""
+    logging.info("Testing BloomFilter false negatives...")
+    keys = [f"job{i}" for i in range(2000)]
+    bloom = BloomFilter.build(keys, fp_rate=0.01)
+    assert all(bloom.might_contain(key) for key in keys)
+    assert bloom.count == 2000
+    logging.info("BloomFilter false negatives test passed.")
+
+def test_false_positive_rate_near_target():
+    """The observed false-positive rate stays close to the configured rate."""
+    logging.info("Testing BloomFilter false-positive rate...")
+    bloom = BloomFilter.build((f"job{i}" for i in range(5000)), fp_rate=0.01)
+    false_positives = sum(bloom.might_contain(f"other{i}") for i in range(20000))
+
+    assert false_positives / 20000 < 0.02
+    assert bloom.expected_fp_rate() == pytest.approx(0.01, rel=0.2)
+    logging.info("BloomFilter false-positive rate test passed.")
+
+def test_lower_fp_rate_uses_more_bits():
+    assert BloomFilter(1000, fp_rate=0.001).num_bits > BloomFilter(1000, fp_rate=0.01).num_bits
+
+def test_save_and_open_mmap(tmp_path):
+    """A saved filter is memory-mapped read-only and keeps its fingerprint."""
+    logging.info("Testing BloomFilter save/open...")
+    source = tmp_path / "history.json"
+    source.write_text('{"job1": "2023-01-01T00:00:00"}')
+    path = str(tmp_path / "history.bloom")
+
+    bloom = BloomFilter.build(["job1", "job2"], fp_rate=0.01)
+    bloom.save(path, fingerprint=file_fingerprint(str(source)))
+
+    opened = BloomFilter.open(path)
+    assert opened.might_contain("job1")
+    assert opened.might_contain("job2")
+    assert opened.count == 2
+    assert opened.num_bits == bloom.num_bits
+    assert opened.fingerprint == file_fingerprint(str(source))
+    with pytest.raises(ValueError):
+        opened.add("job3")
+    opened.close()
+    logging.info("BloomFilter save/open test passed.")
+
+def test_open_rejects_invalid_files(tmp_path):
+    path = tmp_path / "history.bloom"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        BloomFilter.open(str(path))
+    path.write_bytes(b"not a bloom filter at all, just some bytes in a file")
+    with pytest.raises(ValueError):
+        BloomFilter.open(str(path))
+
+def test_file_fingerprint(tmp_path):
+    path = tmp_path / "history.json"
+    assert file_fingerprint(str(path)) is None
+    path.write_text("{}")
+    first = file_fingerprint(str(path))
+    path.write_text('{"a": 1}')
+    assert file_fingerprint(str(path)) != first
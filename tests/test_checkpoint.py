@@ -0,0 +1,154 @@
+import json
+import logging
+from unittest.mock import patch
+import pytest
+from checkpoint import RunCheckpoint
+from job_finder import JobFinder
+from rate_limiter import ApiBudget
+from search_executor import SearchExecutor
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "data" / "checkpoint.jsonl")
+
+def test_journal_roundtrip(journal_path):
+    """Pages and completed combinations survive a reload."""
+    logging.info("Testing RunCheckpoint roundtrip...")
+    checkpoint = RunCheckpoint(journal_path)
+    checkpoint.start()
+    checkpoint.record_page(("dev", "Toronto"), 0, [{"title": "Job 1"}], "token_1")
+    checkpoint.record_page(("dev", "Toronto"), 1, [{"title": "Job 2"}], None)
+    checkpoint.record_done(("dev", "Toronto"))
+    checkpoint.record_page(("qa", "Toronto"), 0, [{"title": "Job 3"}], "token_2")
+
+    reloaded = RunCheckpoint(journal_path)
+    reloaded.start(resume=True)
+
+    assert reloaded.get(("dev", "Toronto")) == {
+        "pages": [[{"title": "Job 1"}], [{"title": "Job 2"}]],
+        "next_page_token": None,
+        "done": True,
+    }
+    assert reloaded.get(("qa", "Toronto"))["next_page_token"] == "token_2"
+    assert reloaded.get(("qa", "Toronto"))["done"] is False
+    logging.info("RunCheckpoint roundtrip test passed.")
+
+def test_torn_last_line_is_ignored(journal_path):
+    """A record cut off by a crash does not prevent resuming."""
+    logging.info("Testing RunCheckpoint torn write...")
+    checkpoint = RunCheckpoint(journal_path)
+    checkpoint.start()
+    checkpoint.record_page(("dev", "Toronto"), 0, [{"title": "Job 1"}], "token_1")
+    with open(journal_path, 'a') as f:
+        f.write('{"type": "page", "combo": ["dev", "Tor')
+
+    checkpoint.load()
+    assert len(checkpoint.get(("dev", "Toronto"))["pages"]) == 1
+    logging.info("RunCheckpoint torn write test passed.")
+
+def test_start_without_resume_discards_journal(journal_path):
+    """A normal run starts with an empty journal."""
+    checkpoint = RunCheckpoint(journal_path)
+    checkpoint.start()
+    checkpoint.record_done(("dev", "Toronto"))
+
+    fresh = RunCheckpoint(journal_path)
+    fresh.start(resume=False)
+    fresh.load()
+    assert fresh.get(("dev", "Toronto")) is None
+
+def test_clear_removes_journal(journal_path, tmp_path):
+    checkpoint = RunCheckpoint(journal_path)
+    checkpoint.start()
+    checkpoint.clear()
+    assert not (tmp_path / "data" / "checkpoint.jsonl").exists()
+
+def test_resume_continues_from_last_token(journal_path):
+    """After a crash on page 2, resuming reuses page 1 and only fetches page 2."""
+    logging.info("Testing resume after a crash...")
+    combination = ("dev", "Toronto", {"q": "dev near Toronto", "location": "Toronto"})
+    page_1 = {"jobs_results": [{"title": "Job 1"}], "serpapi_pagination": {"next_page_token": "token_1"}}
+    page_2 = {"jobs_results": [{"title": "Job 2"}]}
+
+    checkpoint = RunCheckpoint(journal_path)
+    checkpoint.start()
+    with patch("job_finder.GoogleSearch") as MockSearch, patch("job_finder.time.sleep"):
+        MockSearch.return_value.get_dict.side_effect = [page_1] + [json.JSONDecodeError("Expecting value", "", 0)] * 3
+        finder = JobFinder(api_key="test_key", max_pages=5)
+        with pytest.raises(json.JSONDecodeError):
+            list(SearchExecutor(finder, checkpoint=checkpoint).run([combination]))
+
+    resumed = RunCheckpoint(journal_path)
+    resumed.start(resume=True)
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.return_value = page_2
+        finder = JobFinder(api_key="test_key", max_pages=5)
+        results = list(SearchExecutor(finder, checkpoint=resumed).run([combination]))
+
+        assert MockSearch.call_count == 1
+        assert MockSearch.call_args[0][0]["next_page_token"] == "token_1"
+    assert [job["title"] for job in results[0][2]] == ["Job 1", "Job 2"]
+    assert finder.total_api_calls == 1
+
+    # A second resume reuses the completed search without any API call
+    again = RunCheckpoint(journal_path)
+    again.start(resume=True)
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        results = list(SearchExecutor(JobFinder(api_key="test_key"), checkpoint=again).run([combination]))
+        MockSearch.assert_not_called()
+    assert [job["title"] for job in results[0][2]] == ["Job 1", "Job 2"]
+    logging.info("Resume after a crash test passed.")
+
+def test_search_cut_short_by_quota_is_resumed(journal_path):
+    """A search stopped by a quota error is not journaled as done, so resuming fetches the rest."""
+    logging.info("Testing resume after a quota error...")
+    combination = ("dev", "Toronto", {"q": "dev near Toronto", "location": "Toronto"})
+    page_1 = {"jobs_results": [{"title": "Job 1"}], "serpapi_pagination": {"next_page_token": "token_1"}}
+    page_2 = {"jobs_results": [{"title": "Job 2"}]}
+
+    checkpoint = RunCheckpoint(journal_path)
+    checkpoint.start()
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.side_effect = [page_1, {"error": "Your account has run out of searches."}]
+        results = list(SearchExecutor(JobFinder(api_key="test_key", max_pages=5), checkpoint=checkpoint).run([combination]))
+    assert [job["title"] for job in results[0][2]] == ["Job 1"]
+
+    resumed = RunCheckpoint(journal_path)
+    resumed.start(resume=True)
+    assert resumed.get(("dev", "Toronto"))["done"] is False
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.return_value = page_2
+        results = list(SearchExecutor(JobFinder(api_key="test_key", max_pages=5), checkpoint=resumed).run([combination]))
+        assert MockSearch.call_count == 1
+        assert MockSearch.call_args[0][0]["next_page_token"] == "token_1"
+    assert [job["title"] for job in results[0][2]] == ["Job 1", "Job 2"]
+    # Once it ends normally the search is journaled as done
+    again = RunCheckpoint(journal_path)
+    again.start(resume=True)
+    assert again.get(("dev", "Toronto"))["done"] is True
+    logging.info("Resume after a quota error test passed.")
+
+def test_replayed_search_releases_its_budget_share(journal_path):
+    """With MAX_API_CALLS set, a search replayed from the journal leaves its calls to the others."""
+    logging.info("Testing budget release on resume...")
+    done = ("dev", "Toronto", {"q": "dev near Toronto", "location": "Toronto"})
+    pending = ("qa", "Toronto", {"q": "qa near Toronto", "location": "Toronto"})
+    checkpoint = RunCheckpoint(journal_path)
+    checkpoint.start()
+    checkpoint.record_page(("dev", "Toronto"), 0, [{"title": "Job 1"}], None)
+    checkpoint.record_done(("dev", "Toronto"))
+
+    resumed = RunCheckpoint(journal_path)
+    resumed.start(resume=True)
+    # Two calls per search; the replayed search's two go to the shared pool
+    budget = ApiBudget(4, num_combos=2)
+    pages = [{"jobs_results": [{"title": f"QA {i}"}], "serpapi_pagination": {"next_page_token": f"t{i}"}} for i in range(4)]
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.side_effect = pages
+        finder = JobFinder(api_key="test_key", max_pages=4, budget=budget)
+        results = list(SearchExecutor(finder, checkpoint=resumed).run([done, pending]))
+
+    assert [job["title"] for job in results[1][2]] == ["QA 0", "QA 1", "QA 2", "QA 3"]
+    assert budget.used == 4
+    assert budget.denied == 0
+    logging.info("Budget release on resume test passed.")
@@ -23,6 +23,28 @@ def test_config_defaults(mock_env):
     assert "q" not in config.search_params or config.search_params["q"] is None
     assert config.locations == ["Toronto, Ontario, Canada"]
     assert config.max_pages == 5
+    assert config.search_workers == 4
+    assert config.search_prefetch is True
+    assert config.serpapi_transport == "pooled"
+    assert config.serpapi_base_url == "https://serpapi.com"
+    assert config.serpapi_record_dir is None
+    assert config.serpapi_replay_dir is None
+    assert config.max_api_calls == 0
+    assert config.requests_per_second == 0
+    assert config.retry_max_delay == 30
+    assert config.circuit_failure_threshold == 5
+    assert config.circuit_cooldown_seconds == 300
+    assert config.stop_seen_percent == 0
+    assert config.stop_seen_pages == 0
+    assert config.stop_stale_percent == 0
+    assert config.cache_ttl_hours == 6
+    assert config.cache_max_mb == 100
+    assert config.cache_bypass is False
+    assert config.history_backend == "json"
+    assert config.history_merge_on_save is True
+    assert config.history_bloom is True
+    assert config.history_bloom_fp_rate == 0.01
+    assert config.rejection_cache is True
     assert config.min_salary == 0
     assert config.max_days_old == 7
     assert config.blacklist_companies == []
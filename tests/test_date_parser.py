@@ -1,5 +1,7 @@
 import pytest
-from date_parser import DateParser
+from unittest.mock import patch
+from date_parser import SECONDS_PER_DAY, DateParser
+from extension_parser import classify_extension
 
 @pytest.mark.parametrize("text,expected", [
     ("just now", 0),
@@ -13,8 +15,30 @@ from date_parser import DateParser
     ("2 months ago", 60),
     ("30+ days ago", 30),
     ("invalid date", None),
+    ("Day shift", None),
     ("", None),
     (None, None)
 ])
 def test_parse_days_ago(text, expected):
     assert DateParser.parse_days_ago(text) == expected
+
+def test_parse_many():
+    texts = ["3 days ago", None, "just now", "3 days ago", "invalid date"]
+    assert DateParser.parse_many(texts) == [3, None, 0, 3, None]
+
+def test_parse_days_ago_is_memoized():
+    classify_extension.cache_clear()
+    DateParser.parse_days_ago("30+ days ago")
+    DateParser.parse_days_ago("30+ days ago")
+    assert classify_extension.cache_info().hits == 1
+
+def test_parse_posted_at_is_anchored_to_fetch_time():
+    fetched_at = 1_760_000_000
+    assert DateParser.parse_posted_at("3 days ago", fetched_at) == fetched_at - 3 * SECONDS_PER_DAY
+    assert DateParser.parse_posted_at("30+ days ago", fetched_at) == fetched_at - 30 * SECONDS_PER_DAY
+    assert DateParser.parse_posted_at("just now", fetched_at) == fetched_at
+    assert DateParser.parse_posted_at("invalid date", fetched_at) is None
+
+def test_parse_posted_at_defaults_to_now():
+    with patch("date_parser.time.time", return_value=1_760_000_000.5):
+        assert DateParser.parse_posted_at("1 week ago") == 1_760_000_000 - 7 * SECONDS_PER_DAY
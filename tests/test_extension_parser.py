@@ -0,0 +1,94 @@
+import logging
+import pytest
+from date_parser import DateParser
+from extension_parser import BENEFITS, POSTED_DATE, SALARY, SCHEDULE, UNKNOWN, classify_extension, classify_salary
+from salary_parser import SalaryParser
+
+@pytest.mark.parametrize("text,kind", [
+    ("3 days ago", POSTED_DATE),
+    ("30+ days ago", POSTED_DATE),
+    ("Just now", POSTED_DATE),
+    ("Yesterday", POSTED_DATE),
+    ("an hour ago", POSTED_DATE),
+    ("Day shift", UNKNOWN),
+    ("Weekend availability", UNKNOWN),
+    ("Monday to Friday", UNKNOWN),
+    ("Full-time", SCHEDULE),
+    ("Part-time", SCHEDULE),
+    ("Contractor", SCHEDULE),
+    ("Health insurance", BENEFITS),
+    ("Paid time off", BENEFITS),
+    ("$25–$30 an hour", SALARY),
+    ("Salary: 50000", SALARY),
+    ("Work from home", UNKNOWN),
+    ("Competitive pay", UNKNOWN),
+    ("", UNKNOWN),
+    (None, UNKNOWN),
+])
+def test_classify_extension_kind(text, kind):
+    assert classify_extension(text).kind == kind
+
+@pytest.mark.parametrize("text,currency,pay_period,expected", [
+    ("$25–$30 an hour", "$", "hour", (52000, 62400)),
+    ("$50/hr", "$", "hour", (104000, 104000)),
+    ("$4,000 a month", "$", "month", (48000, 48000)),
+    ("$80K–$100K a year", "$", "year", (80000, 100000)),
+    ("€45K–€55K a year", "EUR", "year", (45000, 55000)),
+    ("CAD $90,000", "CAD", None, (90000, 90000)),
+    ("$200 a day", "$", "day", (52000, 52000)),
+    ("$600 a week", "$", "week", (31200, 31200)),
+    ("$30 an hour, weekends", "$", "hour", (62400, 62400)),
+    ("€50,000 a year", "EUR", "year", (50000, 50000)),
+    ("£30 an hour", "GBP", "hour", (62400, 62400)),
+    ("50000 CAD", "CAD", None, (50000, 50000)),
+])
+def test_classify_extension_salary_fields(text, currency, pay_period, expected):
+    info = classify_extension(text)
+    assert info.kind == SALARY
+    assert info.currency == currency
+    assert info.pay_period == pay_period
+    assert (info.min_salary, info.max_salary) == expected
+
+def test_date_and_salary_parsers_match_classifier():
+    """DateParser and SalaryParser give the same numbers as the classifier."""
+    logging.info("Testing classify_extension against DateParser and SalaryParser...")
+    dates = ["just now", "5 hours ago", "1 day ago", "6 days ago", "2 weeks ago", "1 month ago", "30+ days ago", "Today", "Yesterday"]
+    salaries = ["$100k - $120k", "$80,000 a year", "$50 - $60 per hour", "$4000/month", "$25.50 an hour", "Salary: 65000", "$120K a year"]
+    for text in dates:
+        info = classify_extension(text)
+        assert info.kind == POSTED_DATE, text
+        assert info.days_ago == DateParser.parse_days_ago(text), text
+    for text in salaries:
+        info = classify_extension(text)
+        assert SalaryParser.is_salary_text(text)
+        assert info.kind == SALARY, text
+        assert (info.min_salary, info.max_salary) == SalaryParser.parse_salary(text), text
+    logging.info("DateParser and SalaryParser comparison test passed.")
+
+def test_date_numbers_are_not_salaries():
+    info = classify_extension("3 days ago")
+    assert (info.min_salary, info.max_salary, info.currency, info.pay_period) == (None, None, None, None)
+
+def test_classify_salary_keeps_amounts_without_currency():
+    """Text known to be a salary keeps its amounts, even if it reads like a date."""
+    logging.info("Testing classify_salary...")
+    assert classify_extension("150 a day").kind == UNKNOWN
+    info = classify_salary("150 a day")
+    assert info.kind == SALARY
+    assert info.pay_period == "day"
+    assert (info.min_salary, info.max_salary) == (39000, 39000)
+    assert classify_salary("90K a year").max_salary == 90000
+    assert classify_salary("Competitive") == classify_extension("Competitive")
+    logging.info("classify_salary test passed.")
+
+def test_only_relative_dates_are_dates():
+    """Words like "day" or "weekend" alone are not dates or pay periods."""
+    logging.info("Testing date and pay period words...")
+    for text in ["Day shift", "Weekend availability", "Days off"]:
+        info = classify_extension(text)
+        assert info.kind != POSTED_DATE, text
+        assert info.days_ago is None, text
+        assert info.pay_period is None, text
+    assert classify_extension("5 hours ago").days_ago == 0
+    assert classify_extension("Posted 2 weeks ago").days_ago == 14
+    logging.info("Date and pay period words test passed.")
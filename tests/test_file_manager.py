@@ -1,7 +1,9 @@
 import json
 import logging
+from datetime import datetime
 from unittest.mock import mock_open, patch, MagicMock
 from file_manager import FileManager
+from job_parser import JobParser
 
 def test_save_json():
     """Test saving data to JSON file."""
@@ -104,3 +106,56 @@ def test_save_summary_markdown():
         assert "Dev" not in written_content # Title shouldn't be there
         assert "Please download the `job-reports` artifact" in written_content
     logging.info("save_summary_markdown test passed.")
+
+def test_save_filter_stats():
+    """Test saving the per-rule filter statistics table."""
+    logging.info("Testing save_filter_stats...")
+    stats = [
+        {"rule": "keyword", "position": 1, "evaluated": 10, "rejected": 4, "rejection_rate": 0.4, "total_ms": 1.5, "avg_us": 150.0},
+        {"rule": "source", "position": 2, "evaluated": 6, "rejected": 0, "rejection_rate": 0.0, "total_ms": 0.3, "avg_us": 50.0},
+    ]
+
+    with patch("builtins.open", mock_open()) as mock_file:
+        FileManager.save_filter_stats(stats, "filter_stats.md")
+
+        mock_file.assert_called_once_with("filter_stats.md", 'w', encoding="utf-8")
+        handle = mock_file()
+        written_content = "".join(call.args[0] for call in handle.write.call_args_list)
+
+        assert "# Filter Statistics" in written_content
+        assert "| 1 | keyword | 10 | 4 | 40.0% | 1.50 | 150.0 |" in written_content
+        assert "| 2 | source | 6 | 0 | 0.0% | 0.30 | 50.0 |" in written_content
+        assert "keyword → source" in written_content
+    logging.info("save_filter_stats test passed.")
+
+def test_save_markdown_reuses_parsed_jobs():
+    """Report writers don't parse jobs that were already parsed."""
+    logging.info("Testing save_markdown with ParsedJob...")
+    jobs = [JobParser.parse_job({"title": "Dev", "company_name": "A", "search_location": "City X", "extensions": ["1 day ago"]})]
+
+    with patch("builtins.open", mock_open()) as mock_file, patch("file_manager.JobParser.parse_job") as mock_parse:
+        FileManager.save_markdown(jobs, "test.md")
+        FileManager.save_summary_markdown(jobs, "summary.md")
+
+        mock_parse.assert_not_called()
+        written_content = "".join(call.args[0] for call in mock_file().write.call_args_list)
+        assert "#### Dev" in written_content
+        assert "| City X | 1 |" in written_content
+    logging.info("save_markdown with ParsedJob test passed.")
+
+def test_save_markdown_shows_absolute_posting_date():
+    """The relative posting date is followed by the date it resolves to at fetch time."""
+    logging.info("Testing save_markdown posting dates...")
+    fetched_at = 1_760_000_000
+    jobs = [
+        {"title": "Dev", "search_location": "City X", "extensions": ["3 days ago"], "fetched_at": fetched_at},
+        {"title": "Manager", "search_location": "City X", "extensions": ["Full-time"]},
+    ]
+    posted = datetime.fromtimestamp(fetched_at - 3 * 86400).strftime('%Y-%m-%d')
+
+    with patch("builtins.open", mock_open()) as mock_file:
+        FileManager.save_markdown(jobs, "test.md")
+        written_content = "".join(call.args[0] for call in mock_file().write.call_args_list)
+        assert f"- **Posted:** 3 days ago ({posted})\n" in written_content
+        assert "- **Posted:** N/A\n" in written_content
+    logging.info("save_markdown posting dates test passed.")
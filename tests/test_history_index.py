@@ -0,0 +1,116 @@
+import json
+import logging
+import pytest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from history_index import CompactHistoryIndex, CompactJobHistory, key_digest
+
+@pytest.fixture
+def temp_index_file(tmp_path):
+    return str(tmp_path / "history.idx")
+
+def test_add_and_contains():
+    """Keys are found whether they are pending or merged into the sorted arrays."""
+    logging.info("Testing CompactHistoryIndex add/contains...")
+    index = CompactHistoryIndex(merge_threshold=3)
+    for i in range(10):
+        index.add(f"job{i}", timestamp=1000 + i)
+
+    assert len(index) == 10
+    assert len(index._pending) == 1
+    assert list(index._keys) == sorted(index._keys)
+    assert all(index.contains(f"job{i}") for i in range(10))
+    assert not index.contains("job10")
+    logging.info("CompactHistoryIndex add/contains test passed.")
+
+def test_contains_many_matches_contains():
+    """The bulk lookup returns results in the order of the input ids."""
+    logging.info("Testing CompactHistoryIndex contains_many...")
+    index = CompactHistoryIndex.from_items((f"job{i}", 1000) for i in range(0, 100, 2))
+    index.add("pending_job")
+    ids = ["job51", "pending_job", "job50", "job0", "missing", "job98", "job99"]
+
+    assert index.contains_many(ids) == [index.contains(job_id) for job_id in ids]
+    assert index.contains_many(ids) == [False, True, True, True, False, True, False]
+    assert index.contains_many([]) == []
+    logging.info("CompactHistoryIndex contains_many test passed.")
+
+def test_readding_updates_timestamp():
+    """Re-adding a key keeps one entry and refreshes its timestamp."""
+    index = CompactHistoryIndex.from_items([("job1", 1000), ("job1", 500)])
+    assert len(index) == 1
+    index.add("job1", timestamp=5000)
+    assert len(index) == 1
+    assert index.remove_older_than(2000) == 0
+
+def test_remove_older_than():
+    index = CompactHistoryIndex.from_items([("old", 1000), ("new", 3000)])
+    index.add("pending_old", timestamp=1500)
+
+    assert index.remove_older_than(2000) == 2
+    assert index.contains_many(["old", "new", "pending_old"]) == [False, True, False]
+
+def test_save_and_load(temp_index_file):
+    """The binary file round-trips, and other files are rejected."""
+    logging.info("Testing CompactHistoryIndex save/load...")
+    index = CompactHistoryIndex.from_items((f"job{i}", 1000 + i) for i in range(50))
+    index.add("pending_job", timestamp=2000)
+    index.save(temp_index_file)
+
+    loaded = CompactHistoryIndex.load(temp_index_file)
+    assert len(loaded) == 51
+    assert list(loaded._keys) == list(index._keys)
+    assert list(loaded._timestamps) == list(index._timestamps)
+
+    with open(temp_index_file, 'wb') as f:
+        f.write(b"not an index")
+    with pytest.raises(ValueError):
+        CompactHistoryIndex.load(temp_index_file)
+    logging.info("CompactHistoryIndex save/load test passed.")
+
+def test_failed_save_keeps_previous_index(temp_index_file, tmp_path):
+    """A save that fails part-way leaves the previous index readable and no temporary file."""
+    logging.info("Testing CompactHistoryIndex atomic save...")
+    CompactHistoryIndex.from_items([("job1", 1000)]).save(temp_index_file)
+
+    index = CompactHistoryIndex.from_items((f"job{i}", 1000 + i) for i in range(50))
+    with patch("history_index.os.fsync", side_effect=OSError("No space left on device")):
+        with pytest.raises(OSError):
+            index.save(temp_index_file)
+
+    assert len(CompactHistoryIndex.load(temp_index_file)) == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["history.idx"]
+    logging.info("CompactHistoryIndex atomic save test passed.")
+
+def test_key_digest_is_64_bit():
+    assert 0 <= key_digest("abc") < 2 ** 64
+    assert key_digest("abc") == key_digest("abc")
+    assert key_digest("abc") != key_digest("abd")
+
+def test_compact_job_history(temp_index_file, tmp_path):
+    """CompactJobHistory imports history.json once and persists the index."""
+    logging.info("Testing CompactJobHistory...")
+    json_file = tmp_path / "history.json"
+    old = (datetime.now() - timedelta(days=50)).isoformat()
+    with open(json_file, 'w') as f:
+        json.dump({"recent": datetime.now().isoformat(), "old": old, "bad": "not a date"}, f)
+
+    history = CompactJobHistory(history_file=temp_index_file, json_file=str(json_file))
+    assert history.is_seen_many([{"job_id": "recent"}, {"job_id": "old"}, {"job_id": "bad"}]) == [True, True, False]
+
+    history.add_job({"title": "Dev", "company_name": "Corp", "location": "NY"})
+    history.cleanup_old_entries(days=45)
+    assert not history.is_seen({"job_id": "old"})
+    assert history.save_history() is True
+
+    reopened = CompactJobHistory(history_file=temp_index_file, json_file=str(json_file))
+    assert reopened.is_seen({"job_id": "recent"})
+    assert reopened.is_seen({"title": "Dev", "company_name": "Corp", "location": "NY"})
+    assert len(reopened.index) == 2
+    logging.info("CompactJobHistory test passed.")
+
+def test_corrupt_index_starts_empty(temp_index_file):
+    with open(temp_index_file, 'wb') as f:
+        f.write(b"garbage")
+    history = CompactJobHistory(history_file=temp_index_file)
+    assert len(history.index) == 0
@@ -0,0 +1,50 @@
+import logging
+import pytest
+import job_columns
+import job_filter
+from job_columns import EncodedColumn, JobColumns
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    """Runs a test with the pure Python columns and, if installed, with NumPy."""
+    numpy = pytest.importorskip("numpy") if request.param == "numpy" else None
+    monkeypatch.setattr(job_columns, "np", numpy)
+    monkeypatch.setattr(job_filter, "np", numpy)
+    return request.param
+
+def test_encoded_column_evaluates_distinct_values_once(backend):
+    logging.info(f"Testing EncodedColumn ({backend})...")
+    column = EncodedColumn(["Dev", "QA", "dev", "Dev", "QA"])
+    calls = []
+    def is_dev(value):
+        calls.append(value)
+        return value == "dev"
+    mask = column.mask(is_dev, column.codes if backend == "numpy" else list(range(5)))
+    assert [bool(flag) for flag in mask] == [True, False, True, True, False]
+    # "Dev" and "dev" are distinct raw values that lowercase to the same string
+    assert sorted(calls) == ["dev", "dev", "qa"]
+    logging.info("EncodedColumn test passed.")
+
+def test_job_columns_split_and_numeric(backend):
+    logging.info(f"Testing JobColumns ({backend})...")
+    jobs = [
+        {"title": "A", "extensions": ["3 days ago", "$50K a year"]},
+        {"title": "B", "extensions": ["3 days ago", "$50K a year"]},
+        {"title": "C"},
+    ]
+    columns = JobColumns(jobs)
+    rows = columns.all_rows()
+    days_ago = [float(d) for d in columns.numeric('days_ago', rows)]
+    assert days_ago[:2] == [3.0, 3.0]
+    assert days_ago[2] != days_ago[2]  # NaN for an unknown date
+    assert [float(s) for s in columns.numeric('max_salary', rows)][:2] == [50000.0, 50000.0]
+    # The two jobs with identical extensions were parsed once, and share the result
+    assert len(columns._parsed['date']) == 2
+    assert columns.view(0).date_fields() is columns.view(1).date_fields()
+    assert columns.view(1).salary_raw == "$50K a year"
+    assert [view.raw for view in columns.views()] == jobs
+
+    rejected, kept = columns.split(rows, [True, False, True])
+    assert [int(i) for i in rejected] == [0, 2]
+    assert [int(i) for i in kept] == [1]
+    logging.info("JobColumns test passed.")
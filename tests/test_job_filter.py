@@ -1,6 +1,8 @@
+import re
 import pytest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from job_filter import JobFilter
+from job_parser import JobParser
 
 @pytest.fixture
 def mock_config():
@@ -129,3 +131,251 @@ def test_job_filter_punctuation_keyword(mock_config):
     }
     is_valid, reason = job_filter.is_valid(job3)
     assert is_valid is True
+
+def test_job_filter_evaluate_reason_codes(mock_config):
+    """evaluate returns a reason code for each rule."""
+    job_filter = JobFilter(mock_config)
+    linkedin = [{"title": "LinkedIn", "link": "https://linkedin.com/jobs/..."}]
+    assert job_filter.evaluate({"title": "Dev", "company_name": "Spam Corp"})[0] == JobFilter.BLACKLIST
+    assert job_filter.evaluate({"title": "Senior Dev", "company_name": "Corp"})[0] == JobFilter.KEYWORD
+    assert job_filter.evaluate({"title": "Dev", "company_name": "Corp", "detected_extensions": {"schedule_type": "Part-time"}})[0] == JobFilter.SCHEDULE
+    assert job_filter.evaluate({"title": "Dev", "company_name": "Corp"})[0] == JobFilter.SOURCE
+    assert job_filter.evaluate({"title": "Dev", "company_name": "Corp", "apply_options": linkedin}) == (None, None)
+
+def _legacy_keyword_match(keywords, title):
+    """The original per-keyword implementation, used as a reference."""
+    for keyword in keywords:
+        pattern = r''
+        if keyword and keyword[0].isalnum():
+            pattern += r'\b'
+        pattern += re.escape(keyword)
+        if keyword and keyword[-1].isalnum():
+            pattern += r'\b'
+        if re.search(pattern, title):
+            return keyword
+    return None
+
+def test_job_filter_combined_keywords_match_legacy(mock_config):
+    """The compiled matcher finds the same keyword as checking each keyword in turn."""
+    mock_config.exclude_keywords = ["senior", "sr.", "lead", "c++", ".net", "intern", "jr", "(contract)", "iii"]
+    job_filter = JobFilter(mock_config)
+    titles = [
+        "senior developer", "sr. developer", "sr developer", "leading company developer",
+        "tech lead", "c++ engineer", "c developer", ".net developer", "asp.net dev",
+        "internal tools", "intern", "jr. dev", "developer (contract)", "developer iii",
+        "developer ii", "lead senior engineer", "", "sr.net", "junior",
+    ]
+    for title in titles:
+        assert job_filter.find_excluded_keyword(title) == _legacy_keyword_match(job_filter.exclude_keywords, title), title
+
+def test_job_filter_reports_first_configured_keyword(mock_config):
+    """When several keywords match, the first one in the configured order is reported."""
+    mock_config.exclude_keywords = ["senior", "lead"]
+    job_filter = JobFilter(mock_config)
+    is_valid, reason = job_filter.is_valid({"title": "Lead Senior Engineer", "company_name": "Corp"})
+    assert is_valid is False
+    assert "'senior'" in reason
+
+def test_job_filter_no_keywords(mock_config):
+    mock_config.exclude_keywords = []
+    job_filter = JobFilter(mock_config)
+    assert job_filter.find_excluded_keyword("senior developer") is None
+
+def test_job_filter_age_and_salary_rules(mock_config):
+    """Age and salary are rules of the pipeline when enabled."""
+    job_filter = JobFilter(mock_config, max_days_old=7, min_salary=80000)
+    linkedin = [{"title": "LinkedIn", "link": "https://linkedin.com/jobs/..."}]
+    old = {"title": "Dev", "company_name": "Corp", "apply_options": linkedin, "extensions": ["30 days ago"]}
+    code, reason = job_filter.evaluate(old)
+    assert code == JobFilter.AGE
+    assert "Older than 7 days" in reason
+
+    low = {"title": "Dev", "company_name": "Corp", "apply_options": linkedin, "extensions": ["1 day ago", "$50K a year"]}
+    context = {}
+    code, reason = job_filter.evaluate(low, context)
+    assert code == JobFilter.SALARY
+    assert "Below 80000" in reason
+    assert context["parsed"]["max_salary"] == 50000
+
+    good = {"title": "Dev", "company_name": "Corp", "apply_options": linkedin, "extensions": ["1 day ago", "$100K a year"]}
+    assert job_filter.evaluate(good) == (None, None)
+
+def test_job_filter_salary_in_other_currencies(mock_config):
+    """Euro, pound and currency-code amounts are salaries, compared without conversion."""
+    job_filter = JobFilter(mock_config, max_days_old=7, min_salary=80000)
+    linkedin = [{"title": "LinkedIn", "link": "https://linkedin.com/jobs/..."}]
+    for salary in ["€50,000 a year", "£30 an hour", "50000 CAD"]:
+        job = {"title": "Dev", "company_name": "Corp", "apply_options": linkedin, "extensions": ["1 day ago", salary]}
+        assert job_filter.evaluate(job)[0] == JobFilter.SALARY, salary
+    job = {"title": "Dev", "company_name": "Corp", "apply_options": linkedin, "extensions": ["1 day ago", "€90,000 a year"]}
+    assert job_filter.evaluate(job) == (None, None)
+
+def test_job_filter_age_and_salary_rules_disabled(mock_config):
+    """Without max_days_old and min_salary the job is never parsed."""
+    job_filter = JobFilter(mock_config)
+    assert [rule.code for rule in job_filter.rules] == [JobFilter.BLACKLIST, JobFilter.KEYWORD, JobFilter.SCHEDULE, JobFilter.SOURCE]
+    context = {}
+    job_filter.evaluate({"title": "Dev", "company_name": "Corp", "extensions": ["30 days ago"]}, context)
+    assert "parsed" not in context
+
+def test_job_filter_stats(mock_config):
+    """Each rule counts the jobs it evaluated and rejected."""
+    job_filter = JobFilter(mock_config)
+    job_filter.evaluate({"title": "Dev", "company_name": "Spam Corp"})
+    job_filter.evaluate({"title": "Senior Dev", "company_name": "Corp"})
+    job_filter.evaluate({"title": "Dev", "company_name": "Corp"})
+    stats = {row["rule"]: row for row in job_filter.stats()}
+    assert (stats["blacklist"]["evaluated"], stats["blacklist"]["rejected"]) == (3, 1)
+    assert (stats["keyword"]["evaluated"], stats["keyword"]["rejected"]) == (2, 1)
+    assert (stats["schedule"]["evaluated"], stats["schedule"]["rejected"]) == (1, 0)
+    assert (stats["source"]["evaluated"], stats["source"]["rejected"]) == (1, 1)
+    assert stats["source"]["rejection_rate"] == 1.0
+    assert [row["position"] for row in job_filter.stats()] == [1, 2, 3, 4]
+
+def test_job_filter_adaptive_reorder(mock_config):
+    """Rules that reject more jobs per second spent move to the front; verdicts don't change."""
+    job_filter = JobFilter(mock_config, adaptive=True, reorder_interval=10)
+    # Make the blacklist rule expensive and never reject, and the keyword rule cheap and selective
+    for rule in job_filter.rules:
+        if rule.code == JobFilter.BLACKLIST:
+            rule.seconds = 10.0
+    jobs = [{"title": "Senior Dev", "company_name": "Corp"}] * 10
+    results = [job_filter.evaluate(job) for job in jobs]
+    assert all(code == JobFilter.KEYWORD for code, _ in results)
+    order = [rule.code for rule in job_filter.rules]
+    assert order[0] == JobFilter.KEYWORD
+    # Rules that never rejected keep their relative order at the end
+    assert order[1:] == [JobFilter.BLACKLIST, JobFilter.SCHEDULE, JobFilter.SOURCE]
+
+    # A job matching several rules is still rejected, now by the first rule in the new order
+    code, _ = job_filter.evaluate({"title": "Senior Dev", "company_name": "Spam Corp"})
+    assert code == JobFilter.KEYWORD
+
+def _sample_jobs(count, seed=7):
+    import random
+    rng = random.Random(seed)
+    titles = ["Software Engineer", "Senior Developer", "Sr. Analyst", "Intern", "Data Engineer", "Lead Dev", ""]
+    companies = ["Good Company", "Bad Company", "SPAM CORP", "Acme", "Corp"]
+    schedules = [None, "Full-time", "Part-time", "Full-time and Contractor", ""]
+    dates = [None, "2 days ago", "30+ days ago", "1 week ago", "just now"]
+    salaries = [None, "$50K a year", "$120K a year", "$30 an hour"]
+    options = [
+        [],
+        [{"title": "LinkedIn", "link": "https://linkedin.com/jobs/1"}],
+        [{"title": "Apply on SpamBoard", "link": "https://spamboard.example/acme"}],
+        [{"title": "Careers", "link": "https://careers.acme.com/1"}],
+    ]
+    jobs = []
+    for _ in range(count):
+        job = {"title": rng.choice(titles), "company_name": rng.choice(companies), "apply_options": rng.choice(options)}
+        extensions = [value for value in (rng.choice(dates), rng.choice(salaries)) if value]
+        if extensions:
+            job["extensions"] = extensions
+        schedule = rng.choice(schedules)
+        if schedule is not None:
+            job["detected_extensions"] = {"schedule_type": schedule}
+        jobs.append(job)
+    return jobs
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_job_filter_evaluate_batch_matches_evaluate(mock_config, monkeypatch, backend):
+    """Batch evaluation gives the same verdicts and reason codes as evaluating each job."""
+    import job_columns
+    import job_filter as job_filter_module
+    numpy = pytest.importorskip("numpy") if backend == "numpy" else None
+    monkeypatch.setattr(job_columns, "np", numpy)
+    monkeypatch.setattr(job_filter_module, "np", numpy)
+
+    jobs = _sample_jobs(500)
+    job_filter = JobFilter(mock_config, max_days_old=7, min_salary=60000)
+    expected = [job_filter.evaluate(job)[0] for job in jobs]
+    assert len(set(expected)) == 7  # every rule rejects something, and some jobs pass
+
+    batch_filter = JobFilter(mock_config, max_days_old=7, min_salary=60000)
+    surviving, codes = batch_filter.evaluate_batch(jobs)
+    assert codes == expected
+    assert surviving == [i for i, code in enumerate(expected) if code is None]
+    # Both paths keep the same per-rule statistics
+    counts = lambda stats: [(row["rule"], row["evaluated"], row["rejected"]) for row in stats]
+    assert counts(batch_filter.stats()) == counts(job_filter.stats())
+
+    for job, code in zip(jobs, codes):
+        if code:
+            assert batch_filter.describe(job, code) == job_filter.evaluate(job)[1]
+
+def test_describe_reuses_the_batch_parse(mock_config):
+    jobs = _sample_jobs(200)
+    job_filter = JobFilter(mock_config, max_days_old=7, min_salary=60000)
+    batch = {}
+    _, codes = job_filter.evaluate_batch(jobs, batch)
+    expected = [job_filter.describe(job, code) for job, code in zip(jobs, codes)]
+    assert {JobFilter.AGE, JobFilter.SALARY} <= set(codes)
+
+    # The age and salary rules read the fields evaluate_batch already parsed
+    with patch("job_parser.parse_date_fields", side_effect=AssertionError("date parsed twice")), \
+            patch("job_parser.parse_salary_fields", side_effect=AssertionError("salary parsed twice")):
+        described = [
+            job_filter.describe(job, code, parsed_job)
+            for job, code, parsed_job in zip(jobs, codes, batch['parsed'])
+            if code in (JobFilter.AGE, JobFilter.SALARY)
+        ]
+    assert described == [reason for reason, code in zip(expected, codes) if code in (JobFilter.AGE, JobFilter.SALARY)]
+
+def test_job_filter_evaluate_batch_empty(mock_config):
+    job_filter = JobFilter(mock_config)
+    assert job_filter.evaluate_batch([]) == ([], [])
+
+@pytest.mark.parametrize("min_salary", [0, 60000])
+def test_job_filter_parses_salary_only_for_salary_rule(mock_config, min_salary):
+    """Without a salary filter, neither evaluation path parses salaries."""
+    import job_parser
+    jobs = _sample_jobs(200)
+    with patch("job_parser.parse_salary_fields", wraps=job_parser.parse_salary_fields) as parse_salary:
+        job_filter = JobFilter(mock_config, max_days_old=7, min_salary=min_salary)
+        for job in jobs:
+            job_filter.evaluate(job)
+        JobFilter(mock_config, max_days_old=7, min_salary=min_salary).evaluate_batch(jobs)
+    assert parse_salary.called == (min_salary > 0)
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_job_filter_age_uses_fetch_time(mock_config, batch):
+    """Jobs fetched earlier (cached or replayed) are aged from their fetch time."""
+    now = 1_760_000_000
+    day = 86400
+    jobs = [
+        {"title": "Fresh", "extensions": ["2 days ago"], "fetched_at": now},
+        # Fetched 3 days ago, when it was 6 days old: 9 days old now
+        {"title": "Replayed", "extensions": ["6 days ago"], "fetched_at": now - 3 * day},
+        {"title": "Replayed fresh", "extensions": ["1 day ago"], "fetched_at": now - 3 * day},
+        {"title": "Unknown", "extensions": ["Full-time"], "fetched_at": now - 30 * day},
+    ]
+    for job in jobs:
+        job["apply_options"] = [{"title": "LinkedIn", "link": "https://linkedin.com/jobs/1"}]
+    job_filter = JobFilter(mock_config, max_days_old=7, now=now)
+    assert job_filter.age_cutoff == now - 7 * day
+
+    if batch:
+        codes = job_filter.evaluate_batch(jobs)[1]
+    else:
+        codes = [job_filter.evaluate(job)[0] for job in jobs]
+    assert codes == [None, JobFilter.AGE, None, None]
+
+def test_job_filter_evaluate_batch_leaves_parsed_jobs(mock_config):
+    """The ParsedJob views of a batch already hold what the age and salary rules parsed."""
+    import job_parser
+    jobs = _sample_jobs(200)
+    job_filter = JobFilter(mock_config, max_days_old=7, min_salary=60000)
+    context = {}
+    surviving, _ = job_filter.evaluate_batch(jobs, context)
+    assert surviving
+    assert [parsed.raw for parsed in context['parsed']] == jobs
+
+    with patch("job_parser.parse_date_fields", wraps=job_parser.parse_date_fields) as parse_date, \
+            patch("job_parser.parse_salary_fields", wraps=job_parser.parse_salary_fields) as parse_salary:
+        for i in surviving:
+            parsed = context['parsed'][i]
+            assert parsed.days_ago == JobParser.parse_job(jobs[i]).days_ago
+            parsed.max_salary
+        # Only the fresh JobParser.parse_job comparisons parsed anything
+        assert parse_date.call_count == len(surviving)
+        assert parse_salary.call_count == 0
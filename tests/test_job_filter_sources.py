@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import Mock
-from job_filter import JobFilter
+from job_filter import JobFilter, extract_hostname
 
 @pytest.fixture
 def mock_config():
@@ -167,3 +167,74 @@ def test_job_filter_source_simplyhired(mock_config):
     is_valid, reason = job_filter.is_valid(job)
     assert is_valid is True
     assert reason is None
+
+def test_job_filter_source_dotted_domain_matches_subdomains(mock_config):
+    """Entries with a dot match that hostname and its subdomains only."""
+    mock_config.trusted_domains = ["workday.com"]
+    job_filter = JobFilter(mock_config)
+
+    def job(link):
+        return {"title": "Dev", "company_name": "Tech Corp", "apply_options": [{"title": "Apply", "link": link}]}
+
+    assert job_filter.has_reputable_source(job("https://workday.com/jobs/1"))[0] is True
+    assert job_filter.has_reputable_source(job("https://acme.wd5.myworkday.com/jobs/1"))[0] is False
+    assert job_filter.has_reputable_source(job("https://acme.workday.com/jobs/1"))[0] is True
+    assert job_filter.has_reputable_source(job("https://www.workday.com.evil.example/jobs/1"))[0] is False
+
+def test_job_filter_source_trusted_name_in_path_should_reject(mock_config):
+    """A trusted name that only appears in the URL path is not a trusted source."""
+    job_filter = JobFilter(mock_config)
+    job = {
+        "title": "Software Engineer",
+        "company_name": "Tech Corp",
+        "apply_options": [{"title": "Jobilize", "link": "https://www.jobilize.com/redirect?to=linkedin"}],
+    }
+    is_valid, reason = job_filter.is_valid(job)
+    assert is_valid is False
+    assert reason == "No reputable application source found"
+
+def test_job_filter_source_title_match(mock_config):
+    """The option title is matched token by token."""
+    job_filter = JobFilter(mock_config)
+    job = {
+        "title": "Software Engineer",
+        "company_name": "Tech Corp",
+        "apply_options": [{"title": "Apply on Indeed", "link": "https://redirect.example/abc"}],
+    }
+    assert job_filter.has_reputable_source(job) == (True, None)
+
+def test_job_filter_source_large_allow_list(mock_config):
+    """Thousands of trusted domains are looked up, not scanned."""
+    mock_config.trusted_domains = [f"company{i}.com" for i in range(5000)] + ["linkedin"]
+    job_filter = JobFilter(mock_config)
+
+    def job(link):
+        return {"title": "Dev", "company_name": "Tech Corp", "apply_options": [{"title": "Apply", "link": link}]}
+
+    assert job_filter.has_reputable_source(job("https://jobs.company4999.com/1"))[0] is True
+    assert job_filter.has_reputable_source(job("https://ca.linkedin.com/jobs/1"))[0] is True
+    assert job_filter.has_reputable_source(job("https://company5000.com/1"))[0] is False
+
+def test_job_filter_source_batch_matches_single(mock_config):
+    """has_reputable_sources returns the same verdicts as has_reputable_source."""
+    job_filter = JobFilter(mock_config)
+    jobs = [
+        {"company_name": "Tech Corp", "apply_options": [{"title": "LinkedIn", "link": "https://www.linkedin.com/jobs/view/1"}]},
+        {"company_name": "Acme Corp", "apply_options": [{"title": "Apply", "link": "https://careers.acmecorp.com/job/123"}]},
+        {"company_name": "Tech Corp", "apply_options": [{"title": "BeBee CA", "link": "https://ca.bebee.com/job/1"}]},
+        {"company_name": "Tech Corp", "apply_options": []},
+        {"company_name": "Tech Corp"},
+        {"company_name": "Tech Corp", "apply_options": [{"title": "Apply", "link": "no-scheme.indeed.com/job"}]},
+        {"company_name": "", "apply_options": [{"title": "Apply", "link": "http://[invalid"}]},
+    ]
+    assert job_filter.has_reputable_sources(jobs) == [job_filter.has_reputable_source(job) for job in jobs]
+
+    mock_config.trusted_domains = []
+    job_filter = JobFilter(mock_config)
+    assert job_filter.has_reputable_sources(jobs) == [job_filter.has_reputable_source(job) for job in jobs]
+
+def test_extract_hostname():
+    assert extract_hostname("https://www.LinkedIn.com/jobs") == "linkedin.com"
+    assert extract_hostname("careers.acme.com/job/1") == "careers.acme.com"
+    assert extract_hostname("") == ""
+    assert extract_hostname("http://[invalid") == ""
@@ -106,7 +106,9 @@ def test_fetch_with_retry_success_after_failure(job_finder_with_retries):
         assert len(results) == 1
         assert results[0]["title"] == "Job 1"
         assert mock_instance.get_dict.call_count == 2
-        mock_sleep.assert_called_once_with(1)  # 2^0 = 1 second backoff
+        mock_sleep.assert_called_once()
+        # Decorrelated jitter: first delay is drawn from [base, 3 * base]
+        assert 1 <= mock_sleep.call_args[0][0] <= 3
     logging.info("Retry recovery test passed.")
 
 def test_fetch_with_retry_max_retries_exceeded(job_finder_with_retries):
@@ -127,8 +129,8 @@ def test_fetch_with_retry_max_retries_exceeded(job_finder_with_retries):
     logging.info("Max retries test passed.")
 
 def test_fetch_with_retry_exponential_backoff(job_finder_with_retries):
-    """Test that exponential backoff timing is correct."""
-    logging.info("Testing exponential backoff timing...")
+    """Test that backoff grows with decorrelated jitter."""
+    logging.info("Testing backoff timing...")
 
     with patch("job_finder.GoogleSearch") as MockSearch, \
          patch("job_finder.time.sleep") as mock_sleep:
@@ -145,8 +147,99 @@ def test_fetch_with_retry_exponential_backoff(job_finder_with_retries):
         results = job_finder_with_retries.search_jobs(params)
 
         assert len(results) == 1
-        # Check exponential backoff: 2^0=1, 2^1=2
+        # Each delay is drawn from [base, 3 * previous delay]
         assert mock_sleep.call_count == 2
-        mock_sleep.assert_any_call(1)
-        mock_sleep.assert_any_call(2)
-    logging.info("Exponential backoff test passed.")
\ No newline at end of file
+        first, second = (call[0][0] for call in mock_sleep.call_args_list)
+        assert 1 <= first <= 3
+        assert 1 <= second <= 3 * first
+    logging.info("Backoff test passed.")
+
+def test_iter_pages_yields_each_page(job_finder):
+    """Test that iter_pages yields the jobs of each page separately."""
+    logging.info("Testing iter_pages...")
+    mock_results_page_1 = {
+        "jobs_results": [{"title": "Job 1"}, {"title": "Job 2"}],
+        "serpapi_pagination": {"next_page_token": "token_123"}
+    }
+    mock_results_page_2 = {"jobs_results": [{"title": "Job 3"}]}
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.side_effect = [mock_results_page_1, mock_results_page_2]
+
+        pages = list(job_finder.iter_pages({"q": "test", "location": "Toronto"}))
+
+        assert [[job["title"] for job in page] for page in pages] == [["Job 1", "Job 2"], ["Job 3"]]
+        assert all(job["search_location"] == "Toronto" for page in pages for job in page)
+        # Second request carries the pagination token
+        assert MockSearch.call_args_list[1][0][0]["next_page_token"] == "token_123"
+    logging.info("iter_pages test passed.")
+
+def test_iter_pages_prefetches_next_page(job_finder):
+    """Test that with prefetch the next page is requested before the current one is consumed."""
+    logging.info("Testing iter_pages prefetch...")
+    mock_results_page_1 = {
+        "jobs_results": [{"title": "Job 1"}],
+        "serpapi_pagination": {"next_page_token": "token_123"}
+    }
+    mock_results_page_2 = {"jobs_results": [{"title": "Job 2"}]}
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.side_effect = [mock_results_page_1, mock_results_page_2]
+
+        pages = job_finder.iter_pages({"q": "test"}, prefetch=True)
+        first_page = next(pages)
+        assert first_page[0]["title"] == "Job 1"
+        # Page 2 comes from the background prefetch
+        pending_results = list(pages)
+
+        assert pending_results[0][0]["title"] == "Job 2"
+        assert MockSearch.call_count == 2
+        assert job_finder.total_api_calls == 2
+    logging.info("iter_pages prefetch test passed.")
+
+def test_iter_jobs_matches_search_jobs(job_finder):
+    """Test that iter_jobs yields the same jobs as search_jobs."""
+    logging.info("Testing iter_jobs...")
+    mock_results = {"jobs_results": [{"title": "Job 1"}, {"title": "Job 2"}]}
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.return_value = mock_results
+        streamed = [job["title"] for job in job_finder.iter_jobs({"q": "test"}, prefetch=True)]
+        collected = [job["title"] for job in job_finder.search_jobs({"q": "test"})]
+
+    assert streamed == collected == ["Job 1", "Job 2"]
+    logging.info("iter_jobs test passed.")
+
+def test_remove_duplicates_across_batches(job_finder):
+    """Test that a shared seen set deduplicates across several calls."""
+    logging.info("Testing remove_duplicates across batches...")
+    seen = set()
+    first = job_finder.removeDuplicates([{"title": "Dev", "company": "A", "location": "NY"}], seen=seen)
+    second = job_finder.removeDuplicates([
+        {"title": "Dev", "company": "A", "location": "NY"},
+        {"title": "QA", "company": "A", "location": "NY"},
+    ], seen=seen)
+
+    assert len(first) == 1
+    assert [job["title"] for job in second] == ["QA"]
+    logging.info("remove_duplicates across batches test passed.")
+
+def test_jobs_are_stamped_with_fetch_time(job_finder):
+    """Each fetched job records when it was fetched, and cached responses keep that time."""
+    logging.info("Testing fetched_at stamping...")
+    cache = MagicMock()
+    cache.get.return_value = None
+    job_finder.cache = cache
+
+    with patch("job_finder.GoogleSearch") as MockSearch, patch("job_finder.time.time", return_value=1_760_000_000.7):
+        MockSearch.return_value.get_dict.return_value = {"jobs_results": [{"title": "Job 1"}]}
+        results = job_finder.search_jobs({"q": "test"})
+
+    assert results[0]["fetched_at"] == 1_760_000_000
+    # Stamped before caching
+    assert cache.set.call_args.args[1]["jobs_results"][0]["fetched_at"] == 1_760_000_000
+
+    # Cache hits keep the original fetch time
+    cache.get.return_value = {"jobs_results": [{"title": "Job 1", "fetched_at": 1_750_000_000}]}
+    assert job_finder.search_jobs({"q": "test"})[0]["fetched_at"] == 1_750_000_000
+    logging.info("fetched_at stamping test passed.")
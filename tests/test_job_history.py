@@ -1,7 +1,9 @@
 import os
+import stat
 import json
 import pytest
 import logging
+import threading
 from datetime import datetime, timedelta
 from unittest.mock import patch, mock_open
 from job_history import JobHistory
@@ -84,3 +86,229 @@ def test_cleanup_old_entries(temp_history_file):
     assert "old_job" not in history.history
     assert "new_job" in history.history
     logging.info("cleanup_old_entries test passed.")
+
+def test_save_history_reports_failure(temp_history_file):
+    """save_history returns False when the file cannot be written."""
+    logging.info("Testing save_history failure...")
+    history = JobHistory(history_file=str(temp_history_file))
+    assert history.save_history() is True
+    with patch("builtins.open", side_effect=IOError("disk full")):
+        assert history.save_history() is False
+    logging.info("save_history failure test passed.")
+
+def test_is_seen_many(temp_history_file):
+    """is_seen_many checks a whole page of jobs at once."""
+    logging.info("Testing is_seen_many...")
+    history = JobHistory(history_file=str(temp_history_file))
+    history.add_job({"job_id": "123"})
+    jobs = [{"job_id": "123"}, {"job_id": "456"}, {"title": "Dev", "company_name": "Corp", "location": "NY"}]
+    assert history.is_seen_many(jobs) == [True, False, False]
+    assert history.is_seen_many([]) == []
+    logging.info("is_seen_many test passed.")
+
+def test_concurrent_writers_are_merged(temp_history_file):
+    """Two instances that loaded the same file keep each other's additions."""
+    logging.info("Testing merge-on-save...")
+    first = JobHistory(history_file=str(temp_history_file))
+    second = JobHistory(history_file=str(temp_history_file))
+
+    first.add_job({"job_id": "job1"})
+    second.add_job({"job_id": "job2"})
+    assert first.save_history() is True
+    assert second.save_history() is True
+
+    with open(temp_history_file, 'r') as f:
+        data = json.load(f)
+    assert set(data) == {"job1", "job2"}
+    assert set(second.history) == {"job1", "job2"}
+    logging.info("merge-on-save test passed.")
+
+def test_merge_keeps_removals(temp_history_file):
+    """Entries removed by cleanup are not resurrected by another writer's save."""
+    logging.info("Testing merge-on-save with removals...")
+    old_date = (datetime.now() - timedelta(days=50)).isoformat()
+    with open(temp_history_file, 'w') as f:
+        json.dump({"old_job": old_date}, f)
+
+    cleaner = JobHistory(history_file=str(temp_history_file))
+    writer = JobHistory(history_file=str(temp_history_file))
+    cleaner.cleanup_old_entries(days=45)
+    writer.add_job({"job_id": "new_job"})
+    writer.save_history()
+
+    with open(temp_history_file, 'r') as f:
+        data = json.load(f)
+    assert set(data) == {"new_job"}
+    logging.info("merge-on-save with removals test passed.")
+
+def test_merge_disabled_overwrites(temp_history_file):
+    first = JobHistory(history_file=str(temp_history_file), merge_on_save=False)
+    second = JobHistory(history_file=str(temp_history_file), merge_on_save=False)
+    first.add_job({"job_id": "job1"})
+    second.add_job({"job_id": "job2"})
+    first.save_history()
+    second.save_history()
+
+    with open(temp_history_file, 'r') as f:
+        assert set(json.load(f)) == {"job2"}
+
+def test_parallel_saves_lose_nothing(temp_history_file):
+    """Writers saving at the same time are serialized by the file lock."""
+    logging.info("Testing parallel saves...")
+    histories = [JobHistory(history_file=str(temp_history_file)) for _ in range(8)]
+    for i, history in enumerate(histories):
+        history.add_job({"job_id": f"job{i}"})
+
+    threads = [threading.Thread(target=history.save_history) for history in histories]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(temp_history_file, 'r') as f:
+        assert set(json.load(f)) == {f"job{i}" for i in range(8)}
+    logging.info("Parallel saves test passed.")
+
+def test_failed_write_keeps_previous_file(temp_history_file):
+    """A crash while writing leaves the previous history file intact."""
+    logging.info("Testing atomic save...")
+    with open(temp_history_file, 'w') as f:
+        json.dump({"job1": "2023-01-01T00:00:00"}, f)
+    history = JobHistory(history_file=str(temp_history_file))
+    history.add_job({"job_id": "job2"})
+
+    with patch("job_history.json.dump", side_effect=IOError("disk full")):
+        assert history.save_history() is False
+
+    with open(temp_history_file, 'r') as f:
+        assert json.load(f) == {"job1": "2023-01-01T00:00:00"}
+    assert [name for name in os.listdir(temp_history_file.parent) if name.endswith('.tmp')] == []
+    logging.info("Atomic save test passed.")
+
+def test_atomic_save_keeps_file_permissions(temp_history_file):
+    """The renamed temporary file keeps the history file's mode, or gets 0644 for a new file."""
+    logging.info("Testing atomic save permissions...")
+    history = JobHistory(history_file=str(temp_history_file))
+    history.add_job({"job_id": "job1"})
+    assert history.save_history() is True
+    assert stat.S_IMODE(os.stat(temp_history_file).st_mode) == 0o644
+
+    os.chmod(temp_history_file, 0o664)
+    history.add_job({"job_id": "job2"})
+    assert history.save_history() is True
+    assert stat.S_IMODE(os.stat(temp_history_file).st_mode) == 0o664
+    logging.info("Atomic save permissions test passed.")
+
+def test_corrupt_file_is_backed_up(temp_history_file):
+    """An unreadable history file is copied aside instead of being silently overwritten."""
+    with open(temp_history_file, 'w') as f:
+        f.write('{"job1": "2023-01-0')
+    history = JobHistory(history_file=str(temp_history_file))
+    assert history.history == {}
+
+    backups = [name for name in os.listdir(temp_history_file.parent) if ".corrupt-" in name]
+    assert len(backups) == 1
+    with open(temp_history_file.parent / backups[0], 'r') as f:
+        assert f.read() == '{"job1": "2023-01-0'
+
+def _bloom_history(temp_history_file, **kwargs):
+    return JobHistory(history_file=str(temp_history_file), bloom_file=str(temp_history_file) + ".bloom", **kwargs)
+
+def test_bloom_snapshot_defers_loading(temp_history_file):
+    """With a fresh snapshot, new jobs are answered without parsing the history file."""
+    logging.info("Testing Bloom filter cold start...")
+    history = _bloom_history(temp_history_file)
+    history.add_job({"job_id": "job1"})
+    history.save_history()
+
+    with patch.object(JobHistory, "_load_file") as mock_load:
+        reopened = _bloom_history(temp_history_file)
+        assert reopened.bloom is not None
+        assert reopened.is_seen_many([{"job_id": "new1"}, {"job_id": "new2"}]) == [False, False]
+        mock_load.assert_not_called()
+    assert reopened.bloom_negatives == 2
+    logging.info("Bloom filter cold start test passed.")
+
+def test_bloom_possible_match_loads_history(temp_history_file):
+    """A possible match is confirmed against the full history."""
+    logging.info("Testing Bloom filter possible match...")
+    history = _bloom_history(temp_history_file)
+    history.add_job({"job_id": "job1"})
+    history.save_history()
+
+    reopened = _bloom_history(temp_history_file)
+    reopened.add_job({"job_id": "job2"})
+    assert reopened.is_seen({"job_id": "job2"})
+    assert reopened.is_seen({"job_id": "job1"})
+    assert reopened.bloom_maybes == 1
+    assert set(reopened.history) == {"job1", "job2"}
+
+    reopened.save_history()
+    with open(temp_history_file, 'r') as f:
+        assert set(json.load(f)) == {"job1", "job2"}
+    logging.info("Bloom filter possible match test passed.")
+
+def test_lazy_load_races_with_lookups_and_additions(temp_history_file):
+    """Jobs added before or during a lazy load are neither reported unseen nor lost."""
+    logging.info("Testing lazy history load with concurrent workers...")
+    history = _bloom_history(temp_history_file)
+    history.add_job({"job_id": "job1"})
+    history.save_history()
+
+    reopened = _bloom_history(temp_history_file)
+    reopened.add_job({"job_id": "job2"})
+    reading = threading.Event()
+    release = threading.Event()
+
+    def pause_after_read(message, *args, **kwargs):
+        # Holds the loader right after it has read the file
+        if message.startswith("Loaded job history"):
+            reading.set()
+            release.wait(5)
+
+    with patch("job_history.logging.info", side_effect=pause_after_read):
+        loader = threading.Thread(target=reopened.is_seen, args=({"job_id": "job1"},))
+        loader.start()
+        assert reading.wait(5)
+        adder = threading.Thread(target=reopened.add_job, args=({"job_id": "job3"},))
+        adder.start()
+        # job2 was added before the load started and must stay visible throughout
+        assert reopened.is_seen({"job_id": "job2"})
+        release.set()
+        loader.join(5)
+        adder.join(5)
+
+    assert reopened.is_seen_many([{"job_id": "job1"}, {"job_id": "job2"}, {"job_id": "job3"}]) == [True, True, True]
+    reopened.save_history()
+    with open(temp_history_file, 'r') as f:
+        assert set(json.load(f)) == {"job1", "job2", "job3"}
+    logging.info("Lazy history load with concurrent workers test passed.")
+
+def test_bloom_lazy_save_merges_additions(temp_history_file):
+    """Saving without ever loading the history keeps the existing entries."""
+    history = _bloom_history(temp_history_file)
+    history.add_job({"job_id": "job1"})
+    history.save_history()
+
+    reopened = _bloom_history(temp_history_file)
+    reopened.add_job({"job_id": "job2"})
+    assert reopened.save_history() is True
+    with open(temp_history_file, 'r') as f:
+        assert set(json.load(f)) == {"job1", "job2"}
+
+    # The snapshot was rebuilt for the new file
+    again = _bloom_history(temp_history_file)
+    assert again.bloom is not None
+    assert again.bloom.count == 2
+
+def test_stale_bloom_snapshot_is_ignored(temp_history_file):
+    """A snapshot built from a different history file is not trusted."""
+    history = _bloom_history(temp_history_file)
+    history.add_job({"job_id": "job1"})
+    history.save_history()
+    with open(temp_history_file, 'w') as f:
+        json.dump({"job1": datetime.now().isoformat(), "job9": datetime.now().isoformat()}, f)
+
+    reopened = _bloom_history(temp_history_file)
+    assert reopened.bloom is None
+    assert reopened.is_seen({"job_id": "job9"})
@@ -1,5 +1,7 @@
 import logging
-from job_parser import JobParser
+import job_parser
+from unittest.mock import patch
+from job_parser import JobParser, ParsedJob
 
 def test_parse_job_full_data():
     """Test parsing a job with all fields present."""
@@ -73,4 +75,103 @@ def test_parse_job_detected_extensions_salary():
     parsed = JobParser.parse_job(raw_job)
     assert parsed["min_salary"] == 104000
     assert parsed["max_salary"] == 104000
+
+    # A detected salary without a currency is still pay, even if it mentions days
+    parsed = JobParser.parse_job({"detected_extensions": {"salary": "150 a day"}})
+    assert parsed["max_salary"] == 39000
+    assert parsed["salary_raw"] == "150 a day"
     logging.info("parse_job detected_extensions salary test passed.")
+
+def test_parse_job_returns_parsed_job():
+    """parse_job returns a compact ParsedJob that references the raw job."""
+    logging.info("Testing ParsedJob...")
+    raw_job = {"title": "Dev", "company_name": "Acme", "extensions": ["1 day ago", "$90K a year"]}
+
+    parsed = JobParser.parse_job(raw_job)
+    assert isinstance(parsed, ParsedJob)
+    assert parsed.raw is raw_job
+    assert parsed.title == parsed["title"] == "Dev"
+    assert parsed.max_salary == 90000
+    assert parsed.get("salary_raw", "N/A") == "$90K a year"
+    assert parsed.get("unknown", "default") == "default"
+    assert not hasattr(parsed, "__dict__")
+    assert parsed.to_dict()["company"] == "Acme"
+    # Already parsed jobs are passed through
+    assert JobParser.ensure_parsed(parsed) is parsed
+    logging.info("ParsedJob test passed.")
+
+def test_parse_job_currency_and_pay_period():
+    """parse_job exposes the currency and pay period of the salary."""
+    logging.info("Testing parse_job currency and pay period...")
+    parsed = JobParser.parse_job({"extensions": ["2 days ago", "Full-time", "€40–€45 an hour"]})
+    assert parsed.currency == "EUR"
+    assert parsed.pay_period == "hour"
+    assert parsed.max_salary == 93600
+    assert parsed.days_ago == 2
+
+    parsed = JobParser.parse_job({"detected_extensions": {"salary": "90K a year", "posted_at": "5 days ago"}})
+    assert parsed.max_salary == 90000
+    assert parsed.pay_period == "year"
+    assert parsed.currency is None
+    assert parsed.days_ago == 5
+    logging.info("parse_job currency and pay period test passed.")
+
+def test_parsed_job_fields_are_lazy():
+    """Date and salary fields are parsed separately, on first access, and cached."""
+    logging.info("Testing lazy ParsedJob fields...")
+    raw_job = {"title": "Dev", "extensions": ["3 days ago", "$90K a year"]}
+    with patch("job_parser.parse_date_fields", wraps=job_parser.parse_date_fields) as parse_date, \
+            patch("job_parser.parse_salary_fields", wraps=job_parser.parse_salary_fields) as parse_salary:
+        parsed = JobParser.parse_job(raw_job)
+        assert parse_date.call_count == 0 and parse_salary.call_count == 0
+
+        assert parsed.days_ago == 3
+        assert parsed.posted_date == "3 days ago"
+        assert parse_date.call_count == 1
+        assert parse_salary.call_count == 0
+
+        assert parsed.max_salary == 90000
+        assert parsed.salary_raw == "$90K a year"
+        assert parse_salary.call_count == 1
+    logging.info("Lazy ParsedJob fields test passed.")
+
+def test_parsed_job_classifies_extensions_once():
+    """The date and salary groups share one scan of the extensions."""
+    logging.info("Testing shared extension scan...")
+    raw_job = {"extensions": ["3 days ago", "Full-time", "$90K a year"], "detected_extensions": {"posted_at": "3 days ago"}}
+    with patch("job_parser.scan_extensions", wraps=job_parser.scan_extensions) as scan:
+        parsed = JobParser.parse_job(raw_job)
+        assert (parsed.days_ago, parsed.max_salary) == (3, 90000)
+        assert scan.call_count == 1
+    assert job_parser.parse_salary_fields(raw_job)[0] == "$90K a year"
+    logging.info("Shared extension scan test passed.")
+
+def test_parse_job_posted_at():
+    """posted_at resolves the relative date against the job's fetch time."""
+    logging.info("Testing parse_job posted_at...")
+    fetched_at = 1_760_000_000
+    parsed = JobParser.parse_job({"extensions": ["3 days ago"], "fetched_at": fetched_at})
+    assert parsed.fetched_at == fetched_at
+    assert parsed.posted_at == fetched_at - 3 * 86400
+    assert parsed.days_ago == 3
+
+    parsed = JobParser.parse_job({"detected_extensions": {"posted_at": "30+ days ago"}, "fetched_at": fetched_at})
+    assert parsed["posted_at"] == fetched_at - 30 * 86400
+
+    # Jobs fetched before fetched_at was recorded are anchored to now
+    with patch("date_parser.time.time", return_value=fetched_at):
+        assert JobParser.parse_job({"extensions": ["1 week ago"]}).posted_at == fetched_at - 7 * 86400
+    assert JobParser.parse_job({"extensions": ["Full-time"], "fetched_at": fetched_at}).posted_at is None
+    logging.info("parse_job posted_at test passed.")
+
+def test_parse_job_day_shift_is_not_a_date():
+    """A schedule like "Day shift" doesn't hide the posting date."""
+    logging.info("Testing parse_job with a day shift...")
+    parsed = JobParser.parse_job({"extensions": ["40 days ago", "Full-time", "Day shift"]})
+    assert parsed.posted_date == "40 days ago"
+    assert parsed.days_ago == 40
+
+    parsed = JobParser.parse_job({"extensions": ["Weekend availability"], "detected_extensions": {"posted_at": "3 days ago"}})
+    assert parsed.posted_date == "3 days ago"
+    assert parsed.days_ago == 3
+    logging.info("parse_job day shift test passed.")
@@ -2,7 +2,15 @@ import pytest
 from unittest.mock import MagicMock, patch
 from main import main
 from config import Config
+from job_parser import JobParser
 
+def _accept_all(jobs, context=None):
+    """evaluate_batch stand-in that accepts every job."""
+    if context is not None:
+        context['parsed'] = [JobParser.parse_job(job) for job in jobs]
+    return list(range(len(jobs))), [None] * len(jobs)
+
+@patch("main.RunCheckpoint")
 @patch("main.Config")
 @patch("main.JobFinder")
 @patch("main.JobHistory")
@@ -10,7 +18,7 @@ from config import Config
 @patch("main.FileManager")
 @patch("os.path.getsize")
 @patch("shutil.copy")
-def test_main_multiple_queries(mock_shutil_copy, mock_getsize, mock_file_manager, mock_job_filter, mock_job_history, mock_job_finder, mock_config_class):
+def test_main_multiple_queries(mock_shutil_copy, mock_getsize, mock_file_manager, mock_job_filter, mock_job_history, mock_job_finder, mock_config_class, mock_checkpoint):
     """Test that main iterates over multiple queries and locations."""
     
     # Setup mock config
@@ -20,6 +28,26 @@ def test_main_multiple_queries(mock_shutil_copy, mock_getsize, mock_file_manager
     mock_config.locations = ["loc1", "loc2"]
     mock_config.search_params = {"q": "default", "location": "default"}
     mock_config.max_pages = 1
+    mock_config.search_workers = 1
+    mock_config.search_prefetch = False
+    mock_config.cache_ttl_hours = 0
+    mock_config.serpapi_transport = "serpapi"
+    mock_config.serpapi_record_dir = None
+    mock_config.serpapi_replay_dir = None
+    mock_config.max_api_calls = 0
+    mock_config.retry_max_delay = 30
+    mock_config.circuit_failure_threshold = 5
+    mock_config.circuit_cooldown_seconds = 300
+    mock_config.requests_per_second = 0
+    mock_config.stop_seen_percent = 0
+    mock_config.stop_seen_pages = 0
+    mock_config.stop_stale_percent = 0
+    mock_config.history_backend = "json"
+    mock_config.history_merge_on_save = True
+    mock_config.history_bloom = False
+    mock_config.history_bloom_fp_rate = 0.01
+    mock_config.rejection_cache = False
+    mock_config.filter_adaptive_order = False
     mock_config.min_salary = 0
     mock_config.max_days_old = 30
     mock_config.email_address = None
@@ -35,25 +63,30 @@ def test_main_multiple_queries(mock_shutil_copy, mock_getsize, mock_file_manager
     # Setup mock history
     mock_history_instance = MagicMock()
     mock_history_instance.is_seen.return_value = False
+    mock_history_instance.is_seen_many.side_effect = lambda jobs: [False] * len(jobs)
     mock_job_history.return_value = mock_history_instance
 
     # Setup mock filter
     mock_filter_instance = MagicMock()
     mock_filter_instance.is_valid.return_value = (True, "Valid")
+    mock_filter_instance.evaluate_batch.side_effect = _accept_all
     mock_job_filter.return_value = mock_filter_instance
     
+    # No journaled pages from a previous run
+    mock_checkpoint.return_value.get.return_value = None
+
     # Mock file size to be small so it tries to copy
     mock_getsize.return_value = 1000
 
     # Run main
     main()
     
-    # Verify search_jobs calls
+    # Verify search calls (pages are streamed through iter_pages)
     # Expected calls: 2 queries * 2 locations = 4 calls
-    assert mock_finder_instance.search_jobs.call_count == 4
+    assert mock_finder_instance.iter_pages.call_count == 4
     
     # Check call arguments
-    calls = mock_finder_instance.search_jobs.call_args_list
+    calls = mock_finder_instance.iter_pages.call_args_list
     
     # Call 1: query1, loc1
     args1, _ = calls[0]
@@ -79,6 +112,7 @@ def test_main_multiple_queries(mock_shutil_copy, mock_getsize, mock_file_manager
 
 @patch("main.EmailNotification")
 @patch("main.datetime")
+@patch("main.RunCheckpoint")
 @patch("main.Config")
 @patch("main.JobFinder")
 @patch("main.JobHistory")
@@ -94,6 +128,7 @@ def test_main_email_subject_date_only(
     mock_job_history,
     mock_job_finder,
     mock_config_class,
+    mock_checkpoint,
     mock_datetime,
     mock_email_notification,
 ):
@@ -103,6 +138,26 @@ def test_main_email_subject_date_only(
     mock_config.locations = []
     mock_config.search_params = {"q": "default", "location": "default"}
     mock_config.max_pages = 1
+    mock_config.search_workers = 1
+    mock_config.search_prefetch = False
+    mock_config.cache_ttl_hours = 0
+    mock_config.serpapi_transport = "serpapi"
+    mock_config.serpapi_record_dir = None
+    mock_config.serpapi_replay_dir = None
+    mock_config.max_api_calls = 0
+    mock_config.retry_max_delay = 30
+    mock_config.circuit_failure_threshold = 5
+    mock_config.circuit_cooldown_seconds = 300
+    mock_config.requests_per_second = 0
+    mock_config.stop_seen_percent = 0
+    mock_config.stop_seen_pages = 0
+    mock_config.stop_stale_percent = 0
+    mock_config.history_backend = "json"
+    mock_config.history_merge_on_save = True
+    mock_config.history_bloom = False
+    mock_config.history_bloom_fp_rate = 0.01
+    mock_config.rejection_cache = False
+    mock_config.filter_adaptive_order = False
     mock_config.min_salary = 0
     mock_config.max_days_old = 30
     mock_config.smtp_server = "smtp.test.com"
@@ -119,13 +174,16 @@ def test_main_email_subject_date_only(
 
     mock_history_instance = MagicMock()
     mock_history_instance.is_seen.return_value = False
+    mock_history_instance.is_seen_many.side_effect = lambda jobs: [False] * len(jobs)
     mock_job_history.return_value = mock_history_instance
 
     mock_filter_instance = MagicMock()
     mock_filter_instance.is_valid.return_value = (True, "Valid")
+    mock_filter_instance.evaluate_batch.side_effect = _accept_all
     mock_job_filter.return_value = mock_filter_instance
 
     mock_getsize.return_value = 1000
+    mock_checkpoint.return_value.get.return_value = None
 
     mock_datetime.now.return_value.strftime.return_value = "2026-01-01"
 
@@ -141,3 +199,72 @@ def test_main_email_subject_date_only(
     kwargs = email_instance.send_email.call_args.kwargs
     assert "github_issue_url" in kwargs
     assert kwargs["github_issue_url"].startswith("https://github.com/HarshPanchal01/Job-Finder-Automation/issues")
+
+@patch("main.RunCheckpoint")
+@patch("main.Config")
+@patch("main.JobFinder")
+@patch("main.JobHistory")
+@patch("main.JobFilter")
+@patch("main.FileManager")
+@patch("os.path.getsize")
+@patch("shutil.copy")
+def test_main_adds_history_after_all_searches(mock_shutil_copy, mock_getsize, mock_file_manager, mock_job_filter, mock_job_history, mock_job_finder, mock_config_class, mock_checkpoint):
+    """Jobs found in this run are not in the history while later searches still run."""
+    mock_config = MagicMock()
+    mock_config.api_key = "test_key"
+    mock_config.queries = ["query1", "query2"]
+    mock_config.locations = ["loc1"]
+    mock_config.search_params = {"q": "default", "location": "default"}
+    mock_config.max_pages = 1
+    mock_config.search_workers = 1
+    mock_config.search_prefetch = False
+    mock_config.cache_ttl_hours = 0
+    mock_config.serpapi_transport = "serpapi"
+    mock_config.serpapi_record_dir = None
+    mock_config.serpapi_replay_dir = None
+    mock_config.max_api_calls = 0
+    mock_config.retry_max_delay = 30
+    mock_config.circuit_failure_threshold = 5
+    mock_config.circuit_cooldown_seconds = 300
+    mock_config.requests_per_second = 0
+    mock_config.stop_seen_percent = 50
+    mock_config.stop_seen_pages = 0
+    mock_config.stop_stale_percent = 0
+    mock_config.history_backend = "json"
+    mock_config.history_merge_on_save = True
+    mock_config.history_bloom = False
+    mock_config.history_bloom_fp_rate = 0.01
+    mock_config.rejection_cache = False
+    mock_config.filter_adaptive_order = False
+    mock_config.min_salary = 0
+    mock_config.max_days_old = 30
+    mock_config.email_address = None
+    mock_config.email_password = None
+    mock_config_class.return_value = mock_config
+
+    mock_history_instance = MagicMock()
+    mock_history_instance.is_seen_many.side_effect = lambda jobs: [False] * len(jobs)
+    mock_job_history.return_value = mock_history_instance
+
+    # Each search records how many jobs were already added to the history
+    added_during_search = []
+    def iter_pages(search_params, **kwargs):
+        added_during_search.append(mock_history_instance.add_job.call_count)
+        yield [{"title": search_params["q"], "company_name": "Acme", "job_id": search_params["q"]}]
+
+    mock_finder_instance = MagicMock()
+    mock_finder_instance.iter_pages.side_effect = iter_pages
+    mock_finder_instance.removeDuplicates.side_effect = lambda jobs, seen=None: jobs
+    mock_job_finder.return_value = mock_finder_instance
+
+    mock_filter_instance = MagicMock()
+    mock_filter_instance.evaluate_batch.side_effect = _accept_all
+    mock_job_filter.return_value = mock_filter_instance
+
+    mock_checkpoint.return_value.get.return_value = None
+    mock_getsize.return_value = 1000
+
+    main()
+
+    assert added_during_search == [0, 0]
+    assert mock_history_instance.add_job.call_count == 2
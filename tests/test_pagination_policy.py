@@ -0,0 +1,90 @@
+import logging
+from unittest.mock import MagicMock, patch
+from job_finder import JobFinder
+from pagination_policy import SeenHistoryPolicy, FreshnessPolicy
+
+def _history(seen_ids):
+    history = MagicMock()
+    history.is_seen.side_effect = lambda job: job["job_id"] in seen_ids
+    history.is_seen_many.side_effect = lambda jobs: [job["job_id"] in seen_ids for job in jobs]
+    return history
+
+def _page(*ids):
+    return [{"job_id": job_id, "title": job_id} for job_id in ids]
+
+def test_seen_percent_threshold():
+    """Stops once more than the configured percentage of a page is already seen."""
+    logging.info("Testing SeenHistoryPolicy percent threshold...")
+    policy = SeenHistoryPolicy(_history({"a", "b", "c"}), max_seen_percent=50)
+    assert policy.should_stop(_page("a", "x", "y", "z"), {}) is None
+    assert policy.should_stop(_page("a", "b", "c", "z"), {}) is not None
+    logging.info("SeenHistoryPolicy percent threshold test passed.")
+
+def test_consecutive_fully_seen_pages():
+    """Stops after K consecutive fully-seen pages."""
+    logging.info("Testing SeenHistoryPolicy consecutive pages...")
+    policy = SeenHistoryPolicy(_history({"a", "b"}), max_seen_pages=2)
+    state = {}
+    assert policy.should_stop(_page("a", "b"), state) is None
+    assert policy.should_stop(_page("a", "new"), state) is None
+    assert policy.should_stop(_page("a"), state) is None
+    assert policy.should_stop(_page("b"), state) is not None
+    logging.info("SeenHistoryPolicy consecutive pages test passed.")
+
+def test_job_finder_stops_early_and_reports_skipped_pages():
+    """JobFinder stops paginating and records the pages it did not fetch."""
+    logging.info("Testing JobFinder early stop...")
+    policy = SeenHistoryPolicy(_history({"a", "b"}), max_seen_percent=90)
+    finder = JobFinder(api_key="test_key", max_pages=5, policies=[policy])
+    page_1 = {"jobs_results": _page("new1", "new2"), "serpapi_pagination": {"next_page_token": "t1"}}
+    page_2 = {"jobs_results": _page("a", "b"), "serpapi_pagination": {"next_page_token": "t2"}}
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.side_effect = [page_1, page_2]
+        results = finder.search_jobs({"q": "test"}, prefetch=True)
+
+    # The page that triggered the stop is still returned
+    assert [job["job_id"] for job in results] == ["new1", "new2", "a", "b"]
+    assert finder.total_api_calls == 2
+    assert finder.pages_skipped == {"history": 3}
+    logging.info("JobFinder early stop test passed.")
+
+def test_freshness_policy_reads_posted_at_and_extensions():
+    """Ages come from detected_extensions.posted_at, falling back to extensions."""
+    logging.info("Testing FreshnessPolicy date extraction...")
+    assert FreshnessPolicy._days_ago({"detected_extensions": {"posted_at": "3 days ago"}}) == 3
+    assert FreshnessPolicy._days_ago({"extensions": ["Full-time", "30+ days ago"]}) == 30
+    assert FreshnessPolicy._days_ago({"extensions": ["Full-time"]}) is None
+    # The same reading as the age filter: "Day shift" is not a date
+    assert FreshnessPolicy._days_ago({"extensions": ["40 days ago", "Day shift"]}) == 40
+    logging.info("FreshnessPolicy date extraction test passed.")
+
+def test_freshness_policy_stops_on_stale_page():
+    """Stops only when the page is dominated by postings older than the cutoff."""
+    logging.info("Testing FreshnessPolicy threshold...")
+    policy = FreshnessPolicy(max_days_old=7, max_stale_percent=50)
+    fresh = {"detected_extensions": {"posted_at": "2 days ago"}}
+    stale = {"detected_extensions": {"posted_at": "30+ days ago"}}
+    unknown = {"extensions": ["Full-time"]}
+
+    assert policy.should_stop([fresh, stale], {}) is None
+    assert policy.should_stop([stale, stale, unknown], {}) is not None
+    assert policy.should_stop([], {}) is None
+    logging.info("FreshnessPolicy threshold test passed.")
+
+def test_job_finder_freshness_stop_counts_pages_avoided():
+    """A stale page ends pagination and the avoided pages are recorded."""
+    logging.info("Testing JobFinder freshness stop...")
+    finder = JobFinder(api_key="test_key", max_pages=4, policies=[FreshnessPolicy(max_days_old=7)])
+    stale_page = {
+        "jobs_results": [{"title": "Old", "detected_extensions": {"posted_at": "30+ days ago"}}],
+        "serpapi_pagination": {"next_page_token": "t1"},
+    }
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.return_value = stale_page
+        finder.search_jobs({"q": "test"})
+
+    assert finder.total_api_calls == 1
+    assert finder.pages_skipped == {"freshness": 3}
+    logging.info("JobFinder freshness stop test passed.")
@@ -0,0 +1,85 @@
+import logging
+from unittest.mock import patch
+from job_finder import JobFinder
+from rate_limiter import ApiBudget, TokenBucket
+
+def test_budget_unlimited_when_disabled():
+    """A max_calls of 0 never denies a call."""
+    logging.info("Testing ApiBudget disabled...")
+    budget = ApiBudget(0, num_combos=2)
+    assert all(budget.try_acquire("a") for _ in range(100))
+    assert budget.used == 100
+    assert budget.denied == 0
+    logging.info("ApiBudget disabled test passed.")
+
+def test_budget_fair_share():
+    """One combination cannot consume the shares reserved for the others."""
+    logging.info("Testing ApiBudget fair share...")
+    budget = ApiBudget(6, num_combos=3)
+    granted = sum(budget.try_acquire("greedy") for _ in range(10))
+    assert granted == 2
+    assert budget.try_acquire("b")
+    assert budget.try_acquire("b")
+    assert not budget.try_acquire("b")
+    assert budget.denied == 9
+    logging.info("ApiBudget fair share test passed.")
+
+def test_budget_release_returns_unused_share():
+    """Unused calls of a finished combination go back to the shared pool."""
+    logging.info("Testing ApiBudget release...")
+    budget = ApiBudget(6, num_combos=3)
+    budget.try_acquire("a")
+    budget.release("a")
+    granted = sum(budget.try_acquire("b") for _ in range(10))
+    # b's own share (2) plus a's unused call (1)
+    assert granted == 3
+    # a cannot reclaim its share once released
+    assert not budget.try_acquire("a")
+    assert budget.used == 4
+    logging.info("ApiBudget release test passed.")
+
+def test_token_bucket_waits_when_empty():
+    """The bucket sleeps once its burst capacity has been used."""
+    logging.info("Testing TokenBucket...")
+    with patch("rate_limiter.time.monotonic", return_value=100.0), \
+         patch("rate_limiter.time.sleep") as mock_sleep:
+        bucket = TokenBucket(rate=2)
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+
+    clock = iter([100.0, 100.5])
+    with patch("rate_limiter.time.monotonic", side_effect=lambda: next(clock)), \
+         patch("rate_limiter.time.sleep") as mock_sleep:
+        bucket.acquire()
+        mock_sleep.assert_called_once_with(0.5)
+    logging.info("TokenBucket test passed.")
+
+def test_job_finder_degrades_when_budget_exhausted():
+    """A search keeps the pages it fetched when the budget runs out."""
+    logging.info("Testing JobFinder budget degradation...")
+    finder = JobFinder(api_key="test_key", max_pages=5, budget=ApiBudget(2, num_combos=1))
+    page = {"jobs_results": [{"title": "Job"}], "serpapi_pagination": {"next_page_token": "t"}}
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.return_value = page
+        results = finder.search_jobs({"q": "test", "location": "Toronto"})
+
+    assert len(results) == 2
+    assert finder.total_api_calls == 2
+    assert finder.pages_skipped == {"budget": 3}
+    logging.info("JobFinder budget degradation test passed.")
+
+def test_budget_refund_returns_call():
+    """A reserved call that was never made goes back to where it came from."""
+    logging.info("Testing ApiBudget refund...")
+    budget = ApiBudget(3, num_combos=2)
+    assert budget.try_acquire("a")
+    budget.refund("a")
+    assert budget.used == 0
+    # a's share of 1 is available again, and so is the shared pool
+    assert budget.try_acquire("a")
+    assert budget.try_acquire("a")
+    budget.refund("a")
+    assert budget.pool == 1
+    logging.info("ApiBudget refund test passed.")
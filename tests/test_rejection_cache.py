@@ -0,0 +1,99 @@
+import logging
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from rejection_cache import RejectionCache, content_fingerprint, rule_fingerprints
+
+@pytest.fixture
+def config():
+    config = Mock()
+    config.blacklist_companies = ["Bad Company"]
+    config.exclude_keywords = ["senior"]
+    config.schedule_types = ["full-time"]
+    config.trusted_domains = ["linkedin"]
+    config.max_days_old = 7
+    config.min_salary = 50000
+    return config
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / "rejections.json")
+
+JOB = {
+    "job_id": "job1",
+    "title": "Senior Developer",
+    "company_name": "Corp",
+    "extensions": ["3 days ago", "Full-time"],
+    "detected_extensions": {"posted_at": "3 days ago", "schedule_type": "Full-time"},
+    "apply_options": [{"title": "LinkedIn", "link": "https://linkedin.com/jobs/1"}],
+}
+
+def test_cached_verdict_roundtrip(config, cache_file):
+    """A rejection is reused by the next run while nothing changed."""
+    logging.info("Testing RejectionCache roundtrip...")
+    cache = RejectionCache(rule_fingerprints(config), cache_file=cache_file)
+    assert cache.get(JOB) is None
+    cache.add(JOB, "keyword")
+    assert cache.save() is True
+
+    reloaded = RejectionCache(rule_fingerprints(config), cache_file=cache_file)
+    assert reloaded.get(JOB) == "keyword"
+    assert reloaded.hits == 1
+    logging.info("RejectionCache roundtrip test passed.")
+
+def test_config_change_invalidates_only_that_rule(config, cache_file):
+    """Changing one rule's settings drops the verdicts of that rule only."""
+    logging.info("Testing RejectionCache config invalidation...")
+    other = dict(JOB, job_id="job2")
+    cache = RejectionCache(rule_fingerprints(config), cache_file=cache_file)
+    cache.add(JOB, "keyword")
+    cache.add(other, "salary")
+    cache.save()
+
+    config.exclude_keywords = ["intern"]
+    reloaded = RejectionCache(rule_fingerprints(config), cache_file=cache_file)
+    assert reloaded.get(JOB) is None
+    assert reloaded.get(other) == "salary"
+    assert reloaded.invalidated == 1
+    logging.info("RejectionCache config invalidation test passed.")
+
+def test_job_change_invalidates_verdict(config, cache_file):
+    cache = RejectionCache(rule_fingerprints(config), cache_file=cache_file)
+    cache.add(JOB, "keyword")
+    assert cache.get(dict(JOB, title="Developer")) is None
+
+def test_posting_date_does_not_invalidate(config, cache_file):
+    """The posted date changes every day and is not part of the job fingerprint."""
+    older = dict(JOB, extensions=["10 days ago", "Full-time"], detected_extensions={"posted_at": "10 days ago", "schedule_type": "Full-time"})
+    assert content_fingerprint(older) == content_fingerprint(JOB)
+    cache = RejectionCache(rule_fingerprints(config), cache_file=cache_file)
+    cache.add(JOB, "age")
+    assert cache.get(older) == "age"
+
+def test_fingerprints_ignore_case_and_order(config):
+    before = rule_fingerprints(config)
+    config.blacklist_companies = ["bad company"]
+    assert rule_fingerprints(config)["blacklist"] == before["blacklist"]
+    config.trusted_domains = None
+    assert rule_fingerprints(config)["source"] != before["source"]
+
+def test_cleanup_old_entries(config, cache_file):
+    cache = RejectionCache(rule_fingerprints(config), cache_file=cache_file)
+    cache.add(JOB, "keyword")
+    cache.entries["old"] = {"reason": "keyword", "fingerprint": "x", "content": "y", "timestamp": (datetime.now() - timedelta(days=50)).isoformat()}
+    cache.cleanup_old_entries(days=45)
+    assert set(cache.entries) == {"job1"}
+
+def test_corrupt_cache_starts_empty(config, cache_file):
+    with open(cache_file, 'w') as f:
+        f.write("{not json")
+    cache = RejectionCache(rule_fingerprints(config), cache_file=cache_file)
+    assert cache.entries == {}
+
+def test_salary_change_invalidates_verdict(config, cache_file):
+    """Only the posting date is left out; a daily rate is part of the fingerprint."""
+    paid = dict(JOB, extensions=["3 days ago", "$200 a day"])
+    cache = RejectionCache(rule_fingerprints(config), cache_file=cache_file)
+    cache.add(paid, "salary")
+    assert cache.get(dict(paid, extensions=["5 days ago", "$200 a day"])) == "salary"
+    assert cache.get(dict(paid, extensions=["3 days ago", "$100 a day"])) is None
@@ -0,0 +1,95 @@
+import os
+import logging
+from unittest.mock import patch
+from job_finder import JobFinder
+from response_cache import ResponseCache
+
+def test_make_key_ignores_api_key_and_includes_token():
+    """Keys ignore api_key and param order, but include next_page_token."""
+    logging.info("Testing ResponseCache.make_key...")
+    base = ResponseCache.make_key({"q": "dev", "location": "NY", "api_key": "a"})
+    assert base == ResponseCache.make_key({"location": "NY", "q": "dev", "api_key": "b"})
+    assert base != ResponseCache.make_key({"q": "dev", "location": "NY", "next_page_token": "t1"})
+    logging.info("ResponseCache.make_key test passed.")
+
+def test_set_and_get_roundtrip(tmp_path):
+    """Stored responses are returned on the next lookup."""
+    logging.info("Testing ResponseCache roundtrip...")
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    results = {"jobs_results": [{"title": "Dev"}]}
+    cache.set({"q": "dev"}, results)
+
+    assert cache.get({"q": "dev"}) == results
+    assert cache.get({"q": "other"}) is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert os.listdir(tmp_path)[0].endswith(".json.gz")
+    logging.info("ResponseCache roundtrip test passed.")
+
+def test_expired_entries_are_ignored(tmp_path):
+    """Entries older than the TTL are treated as misses and removed."""
+    logging.info("Testing ResponseCache TTL...")
+    cache = ResponseCache(cache_dir=str(tmp_path), ttl_seconds=60)
+    with patch("response_cache.time.time", return_value=1000):
+        cache.set({"q": "dev"}, {"jobs_results": []})
+    with patch("response_cache.time.time", return_value=1061):
+        assert cache.get({"q": "dev"}) is None
+    assert os.listdir(tmp_path) == []
+    logging.info("ResponseCache TTL test passed.")
+
+def test_bypass_skips_reads(tmp_path):
+    """Bypass mode never serves from the cache."""
+    logging.info("Testing ResponseCache bypass...")
+    ResponseCache(cache_dir=str(tmp_path)).set({"q": "dev"}, {"jobs_results": []})
+    cache = ResponseCache(cache_dir=str(tmp_path), bypass=True)
+    assert cache.get({"q": "dev"}) is None
+    logging.info("ResponseCache bypass test passed.")
+
+def test_lru_eviction(tmp_path):
+    """The least recently used entry is evicted when the cache exceeds max_bytes."""
+    logging.info("Testing ResponseCache LRU eviction...")
+    cache = ResponseCache(cache_dir=str(tmp_path), max_bytes=10 ** 6)
+    cache.set({"q": "a"}, {"jobs_results": []})
+    cache.set({"q": "b"}, {"jobs_results": []})
+    key_a = ResponseCache.make_key({"q": "a"})
+    key_b = ResponseCache.make_key({"q": "b"})
+    # "a" was used more recently than "b"
+    cache._index[key_a] = (cache._index[key_a][0], 200)
+    cache._index[key_b] = (cache._index[key_b][0], 100)
+    # Room for two entries (sizes vary by a few bytes with the timestamp)
+    cache.max_bytes = cache._index[key_a][0] + cache._index[key_b][0] + 16
+    cache.set({"q": "c"}, {"jobs_results": []})
+
+    assert cache.get({"q": "b"}) is None
+    assert cache.get({"q": "a"}) is not None
+    assert cache.get({"q": "c"}) is not None
+    logging.info("ResponseCache LRU eviction test passed.")
+
+def test_job_finder_cache_hits_do_not_count(tmp_path):
+    """A rerun served from the cache makes no API calls."""
+    logging.info("Testing JobFinder cache integration...")
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    mock_results = {"jobs_results": [{"title": "Job 1"}]}
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.return_value = mock_results
+        first = JobFinder(api_key="key1", max_pages=1, cache=cache)
+        first.search_jobs({"q": "test"})
+        second = JobFinder(api_key="key2", max_pages=1, cache=cache)
+        results = second.search_jobs({"q": "test"})
+
+    assert first.total_api_calls == 1
+    assert second.total_api_calls == 0
+    assert MockSearch.call_count == 1
+    assert results[0]["title"] == "Job 1"
+    logging.info("JobFinder cache integration test passed.")
+
+def test_error_responses_are_not_cached(tmp_path):
+    """Responses with an error key must not be cached."""
+    logging.info("Testing ResponseCache skips API errors...")
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.return_value = {"error": "Invalid API key"}
+        JobFinder(api_key="key", max_pages=1, cache=cache).search_jobs({"q": "test"})
+    assert os.listdir(tmp_path) == []
+    logging.info("ResponseCache error skip test passed.")
@@ -0,0 +1,177 @@
+import json
+import random
+import logging
+from unittest.mock import ANY, MagicMock, patch
+import pytest
+from job_finder import JobFinder
+from rate_limiter import ApiBudget
+from retry_policy import (
+    FATAL,
+    QUOTA,
+    TRANSIENT,
+    CircuitBreaker,
+    RetryPolicy,
+    classify_exception,
+    classify_response_error,
+)
+from transport import TransportError
+
+@pytest.mark.parametrize("message,kind,account_wide", [
+    ("Your account has run out of searches.", QUOTA, True),
+    ("Invalid API key. Your API key should be here: https://serpapi.com/manage-api-key", FATAL, True),
+    ("Internal error, please try again later.", TRANSIENT, False),
+    ("Unsupported `xyz` location - location parameter.", FATAL, False),
+])
+def test_classify_response_error(message, kind, account_wide):
+    error = classify_response_error(message)
+    assert error.kind == kind
+    assert error.account_wide == account_wide
+
+def test_classify_response_error_no_results():
+    """An empty result set is not an error."""
+    assert classify_response_error("Google hasn't returned any results for this query.") is None
+
+@pytest.mark.parametrize("error,kind", [
+    (json.JSONDecodeError("Expecting value", "", 0), TRANSIENT),
+    (ConnectionResetError(), TRANSIENT),
+    (TransportError("HTTP 503", status=503), TRANSIENT),
+    (TransportError("HTTP 429", status=429, retry_after=5), TRANSIENT),
+    (TransportError("HTTP 429", status=429), QUOTA),
+    (TransportError("HTTP 401", status=401), FATAL),
+])
+def test_classify_exception(error, kind):
+    assert classify_exception(error) == kind
+
+def test_decorrelated_jitter_bounds():
+    """Delays stay within [base, 3 * previous] and never exceed max_delay."""
+    logging.info("Testing RetryPolicy jitter...")
+    policy = RetryPolicy(base_delay=1, max_delay=10, rng=random.Random(42))
+    delay = None
+    for _ in range(50):
+        previous = delay or 1
+        delay = policy.next_delay(delay)
+        assert 1 <= delay <= min(10, previous * 3)
+    logging.info("RetryPolicy jitter test passed.")
+
+def test_retry_after_is_honoured():
+    """A Retry-After hint replaces the jittered delay, capped at max_delay."""
+    policy = RetryPolicy(max_delay=30)
+    assert policy.next_delay(retry_after=7) == 7
+    assert policy.next_delay(retry_after=120) == 30
+
+def test_circuit_breaker_opens_and_recovers():
+    """The breaker opens after repeated failures and lets one trial through after the cooldown."""
+    logging.info("Testing CircuitBreaker...")
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+    with patch("retry_policy.time.monotonic", return_value=1000):
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+    with patch("retry_policy.time.monotonic", return_value=1061):
+        assert breaker.allow()
+        # Only one trial request while half-open
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.allow()
+    logging.info("CircuitBreaker test passed.")
+
+def test_quota_error_is_not_retried_and_trips_breaker():
+    """A quota error stops immediately and short-circuits every later search."""
+    logging.info("Testing quota error handling...")
+    breaker = CircuitBreaker()
+    finder = JobFinder(api_key="test_key", max_pages=2, circuit_breaker=breaker)
+
+    with patch("job_finder.GoogleSearch") as MockSearch, \
+         patch("job_finder.time.sleep") as mock_sleep:
+        MockSearch.return_value.get_dict.return_value = {"error": "Your account has run out of searches."}
+        assert finder.search_jobs({"q": "first"}) == []
+        assert finder.search_jobs({"q": "second"}) == []
+
+    assert MockSearch.call_count == 1
+    mock_sleep.assert_not_called()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.short_circuited == 1
+    logging.info("Quota error handling test passed.")
+
+def test_dead_upstream_stops_retrying_when_breaker_opens():
+    """Once the breaker opens, pending retries give up instead of sleeping."""
+    logging.info("Testing circuit breaker during retries...")
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=300)
+    finder = JobFinder(api_key="test_key", max_pages=1, max_retries=5, circuit_breaker=breaker)
+    transport = MagicMock()
+    transport.fetch.side_effect = TransportError("HTTP 503", status=503)
+    finder.transport = transport
+
+    with patch("job_finder.time.sleep") as mock_sleep:
+        assert finder.search_jobs({"q": "first"}) == []
+        assert finder.search_jobs({"q": "second"}) == []
+
+    assert transport.fetch.call_count == 2
+    assert mock_sleep.call_count == 1
+    logging.info("Circuit breaker during retries test passed.")
+
+def test_transient_error_key_is_retried():
+    """Transient errors reported in the response body are retried."""
+    logging.info("Testing transient error key retry...")
+    finder = JobFinder(api_key="test_key", max_pages=1)
+    with patch("job_finder.GoogleSearch") as MockSearch, \
+         patch("job_finder.time.sleep"):
+        MockSearch.return_value.get_dict.side_effect = [
+            {"error": "Internal error, please try again later."},
+            {"jobs_results": [{"title": "Job 1"}]},
+        ]
+        results = finder.search_jobs({"q": "test"})
+
+    assert [job["title"] for job in results] == ["Job 1"]
+    logging.info("Transient error key retry test passed.")
+
+def _tripped_finder(**kwargs):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+    breaker.trip("test")
+    return JobFinder(api_key="test_key", max_pages=1, circuit_breaker=breaker, **kwargs), breaker
+
+def test_fatal_trial_request_does_not_leave_breaker_half_open():
+    """A half-open trial that fails with a request-specific error lets the next trial through."""
+    logging.info("Testing half-open trial with a fatal error...")
+    finder, breaker = _tripped_finder()
+    good = {"jobs_results": [{"title": "Job"}]}
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.side_effect = [{"error": "Invalid Google domain."}, good]
+        assert finder.search_jobs({"q": "first"}) == []
+        assert finder.search_jobs({"q": "second"}) == [{"title": "Job", "search_location": "Unknown", "fetched_at": ANY}]
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    logging.info("Half-open trial with a fatal error test passed.")
+
+def test_budget_is_checked_before_the_trial_request():
+    """An exhausted budget never consumes the half-open trial."""
+    logging.info("Testing half-open trial with an exhausted budget...")
+    budget = ApiBudget(2, num_combos=2)
+    assert budget.try_acquire(("first", None))
+    finder, breaker = _tripped_finder(budget=budget)
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.return_value = {"jobs_results": [{"title": "Job"}]}
+        assert finder.search_jobs({"q": "first"}) == []
+        assert breaker.state == CircuitBreaker.OPEN
+        assert len(finder.search_jobs({"q": "second"})) == 1
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert budget.denied == 1
+    logging.info("Half-open trial with an exhausted budget test passed.")
+
+def test_open_breaker_refunds_the_budget():
+    """A request short-circuited by the breaker does not use up the budget."""
+    logging.info("Testing budget refund on an open breaker...")
+    budget = ApiBudget(5, num_combos=1)
+    breaker = CircuitBreaker(cooldown=300)
+    breaker.trip("test")
+    finder = JobFinder(api_key="test_key", max_pages=1, circuit_breaker=breaker, budget=budget)
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        assert finder.search_jobs({"q": "first"}) == []
+        MockSearch.assert_not_called()
+    assert budget.used == 0
+    logging.info("Budget refund on an open breaker test passed.")
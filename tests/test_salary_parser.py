@@ -1,4 +1,6 @@
 import pytest
+from unittest.mock import patch
+from extension_parser import classify_salary
 from salary_parser import SalaryParser
 
 @pytest.mark.parametrize("text,expected", [
@@ -11,6 +13,8 @@ from salary_parser import SalaryParser
     ("", None),
     ("50k", (50000, 50000)),
     ("100k-150k", (100000, 150000)),
+    ("$200 a day", (52000, 52000)),
+    ("€500 a week", (26000, 26000)),
 ])
 def test_parse_salary(text, expected):
     assert SalaryParser.parse_salary(text) == expected
@@ -20,3 +24,17 @@ def test_is_salary_text():
     assert SalaryParser.is_salary_text("Salary: 50000")
     assert not SalaryParser.is_salary_text("Full-time")
     assert not SalaryParser.is_salary_text("Remote")
+    assert not SalaryParser.is_salary_text("3 days ago")
+
+def test_parse_many_dedupes_input():
+    texts = ["$50/hr", "", "$100k - $120k", "$50/hr", None, "$50/hr"]
+    assert SalaryParser.parse_many(texts) == [SalaryParser.parse_salary(text) for text in texts]
+    with patch("salary_parser.classify_salary", wraps=classify_salary) as mock_parse:
+        SalaryParser.parse_many(["$60/hr", "$60/hr", "$60/hr"])
+        assert mock_parse.call_count == 1
+
+def test_parse_salary_is_memoized():
+    classify_salary.cache_clear()
+    SalaryParser.parse_salary("$70K–$90K a year")
+    SalaryParser.parse_salary("$70K–$90K a year")
+    assert classify_salary.cache_info().hits == 1
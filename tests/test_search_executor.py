@@ -0,0 +1,66 @@
+import time
+import logging
+import threading
+from unittest.mock import MagicMock, patch
+from job_finder import JobFinder
+from search_executor import SearchExecutor
+
+def _combinations():
+    return [
+        (query, location, {"q": f"{query} near {location}", "location": location})
+        for query in ["q1", "q2", "q3"]
+        for location in ["loc1", "loc2"]
+    ]
+
+def test_run_preserves_combination_order():
+    """Results must come back in submission order even when searches finish out of order."""
+    logging.info("Testing SearchExecutor result ordering...")
+    finder = MagicMock()
+
+    def slow_search(params, prefetch=False):
+        # Later combinations finish first
+        time.sleep(0.01 if params["location"] == "loc1" else 0)
+        return [{"title": params["q"], "search_location": params["location"]}]
+
+    finder.search_jobs.side_effect = slow_search
+    executor = SearchExecutor(finder, max_workers=4)
+
+    results = list(executor.run(_combinations()))
+
+    assert [(q, loc) for q, loc, _ in results] == [(q, loc) for q, loc, _ in _combinations()]
+    for query, location, jobs in results:
+        assert jobs == [{"title": f"{query} near {location}", "search_location": location}]
+    logging.info("SearchExecutor ordering test passed.")
+
+def test_run_sequential_with_single_worker():
+    """A single worker runs combinations inline, in order."""
+    logging.info("Testing SearchExecutor sequential mode...")
+    finder = MagicMock()
+    finder.search_jobs.return_value = []
+    executor = SearchExecutor(finder, max_workers=1)
+
+    list(executor.run(_combinations()))
+
+    called = [args[0]["q"] for args, _ in finder.search_jobs.call_args_list]
+    assert called == [params["q"] for _, _, params in _combinations()]
+    logging.info("SearchExecutor sequential test passed.")
+
+def test_total_api_calls_thread_safe():
+    """Concurrent searches must not lose updates to total_api_calls."""
+    logging.info("Testing thread-safe API call counter...")
+    finder = JobFinder(api_key="test_key", max_pages=1)
+    mock_results = {"jobs_results": [{"title": "Job"}]}
+
+    with patch("job_finder.GoogleSearch") as MockSearch:
+        MockSearch.return_value.get_dict.return_value = mock_results
+        threads = [
+            threading.Thread(target=lambda: [finder.search_jobs({"q": "test"}) for _ in range(50)])
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert finder.total_api_calls == 400
+    logging.info("Thread-safe API call counter test passed.")
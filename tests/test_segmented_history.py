@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import pytest
+from unittest.mock import patch
+from datetime import date, datetime, timedelta
+from segmented_history import SegmentedJobHistory, week_of, week_start
+
+@pytest.fixture
+def history_dir(tmp_path):
+    return str(tmp_path / "history")
+
+def _write_json_history(path, entries):
+    with open(path, 'w') as f:
+        json.dump(entries, f)
+
+def test_week_helpers():
+    assert week_of(datetime(2026, 10, 14, 12, 0)) == "2026-W42"
+    assert week_start("2026-W42") == date(2026, 10, 12)
+    # ISO years can start in the previous calendar year
+    assert week_of(datetime(2027, 1, 1)) == "2026-W53"
+
+def test_add_save_and_reload(history_dir):
+    """Jobs are written to the current week's segment and listed in the manifest."""
+    logging.info("Testing SegmentedJobHistory save and reload...")
+    history = SegmentedJobHistory(history_dir=history_dir)
+    job = {"job_id": "123", "title": "Dev"}
+    assert not history.is_seen(job)
+
+    history.add_job(job)
+    assert history.is_seen(job)
+    assert history.save_history() is True
+
+    current_week = week_of(datetime.now())
+    with open(os.path.join(history_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    assert manifest["segments"][current_week]["count"] == 1
+    assert os.path.exists(os.path.join(history_dir, f"{current_week}.json"))
+
+    reloaded = SegmentedJobHistory(history_dir=history_dir)
+    assert reloaded.is_seen_many([job, {"job_id": "456"}]) == [True, False]
+    logging.info("SegmentedJobHistory save and reload test passed.")
+
+def test_import_json_into_weekly_segments(history_dir, tmp_path):
+    """An existing history.json is split by ISO week on first use."""
+    logging.info("Testing SegmentedJobHistory JSON import...")
+    json_file = tmp_path / "history.json"
+    now = datetime.now()
+    _write_json_history(json_file, {
+        "this_week": now.isoformat(),
+        "last_week": (now - timedelta(days=7)).isoformat(),
+        "bad": "not a date",
+    })
+
+    history = SegmentedJobHistory(history_dir=history_dir, json_file=str(json_file))
+    assert set(history.segments) == {week_of(now), week_of(now - timedelta(days=7))}
+    assert history.is_seen({"job_id": "this_week"})
+    assert history.is_seen({"job_id": "last_week"})
+    assert not history.is_seen({"job_id": "bad"})
+    assert history.save_history() is True
+
+    # The JSON file is only imported while no manifest exists
+    _write_json_history(json_file, {"other": now.isoformat()})
+    reloaded = SegmentedJobHistory(history_dir=history_dir, json_file=str(json_file))
+    assert not reloaded.is_seen({"job_id": "other"})
+    logging.info("SegmentedJobHistory JSON import test passed.")
+
+def test_cleanup_drops_whole_segments(history_dir, tmp_path):
+    """Expired weeks are deleted without touching the live segments."""
+    logging.info("Testing SegmentedJobHistory cleanup...")
+    json_file = tmp_path / "history.json"
+    now = datetime.now()
+    old = now - timedelta(days=60)
+    _write_json_history(json_file, {"old": old.isoformat(), "new": now.isoformat()})
+    history = SegmentedJobHistory(history_dir=history_dir, json_file=str(json_file))
+    history.save_history()
+    old_file = os.path.join(history_dir, f"{week_of(old)}.json")
+    assert os.path.exists(old_file)
+
+    history.cleanup_old_entries(days=45)
+
+    assert not os.path.exists(old_file)
+    assert week_of(old) not in history.manifest["segments"]
+    assert not history.is_seen({"job_id": "old"})
+    assert history.is_seen({"job_id": "new"})
+    logging.info("SegmentedJobHistory cleanup test passed.")
+
+def test_startup_skips_segments_outside_retention(history_dir, tmp_path):
+    """Segments older than the retention window are not read at startup."""
+    json_file = tmp_path / "history.json"
+    now = datetime.now()
+    old = now - timedelta(days=60)
+    _write_json_history(json_file, {"old": old.isoformat(), "new": now.isoformat()})
+    SegmentedJobHistory(history_dir=history_dir, json_file=str(json_file)).save_history()
+
+    history = SegmentedJobHistory(history_dir=history_dir, retention_days=45)
+    assert set(history.segments) == {week_of(now)}
+    assert not history.is_seen({"job_id": "old"})
+
+    # A longer retention window still finds it
+    history = SegmentedJobHistory(history_dir=history_dir, retention_days=90)
+    assert history.is_seen({"job_id": "old"})
+
+def test_corrupt_segment_is_skipped(history_dir):
+    history = SegmentedJobHistory(history_dir=history_dir)
+    history.add_job({"job_id": "123"})
+    history.save_history()
+    with open(os.path.join(history_dir, f"{week_of(datetime.now())}.json"), 'w') as f:
+        f.write("{not json")
+
+    reloaded = SegmentedJobHistory(history_dir=history_dir)
+    assert reloaded.segments == {}
+
+def test_overlapping_runs_merge_their_segments(history_dir):
+    """A run saving after another one keeps the other run's entries."""
+    logging.info("Testing SegmentedJobHistory merge on save...")
+    first = SegmentedJobHistory(history_dir=history_dir)
+    second = SegmentedJobHistory(history_dir=history_dir)
+    first.add_job({"job_id": "a"})
+    second.add_job({"job_id": "b"})
+    assert first.save_history() is True
+    assert second.save_history() is True
+
+    reloaded = SegmentedJobHistory(history_dir=history_dir)
+    assert reloaded.is_seen_many([{"job_id": "a"}, {"job_id": "b"}]) == [True, True]
+    assert reloaded.manifest["segments"][week_of(datetime.now())]["count"] == 2
+    logging.info("SegmentedJobHistory merge on save test passed.")
+
+def test_failed_save_keeps_previous_files(history_dir):
+    """A save that fails midway returns False and leaves the saved history intact."""
+    logging.info("Testing SegmentedJobHistory failed save...")
+    history = SegmentedJobHistory(history_dir=history_dir)
+    history.add_job({"job_id": "a"})
+    assert history.save_history() is True
+
+    history.add_job({"job_id": "b"})
+    with patch("segmented_history.os.replace", side_effect=OSError("disk full")):
+        assert history.save_history() is False
+
+    assert [name for name in os.listdir(history_dir) if name.endswith(".tmp")] == []
+    reloaded = SegmentedJobHistory(history_dir=history_dir)
+    assert reloaded.is_seen_many([{"job_id": "a"}, {"job_id": "b"}]) == [True, False]
+    assert reloaded.manifest["segments"][week_of(datetime.now())]["count"] == 1
+    logging.info("SegmentedJobHistory failed save test passed.")
@@ -0,0 +1,156 @@
+import os
+import json
+import logging
+from unittest.mock import MagicMock, patch
+import pytest
+from job_finder import JobFinder
+from job_parser import JobParser
+from main import main
+from serpapi_replay import RecordingTransport, ReplayServer, ReplayStore, ReplayTransport
+from transport import PooledHttpTransport, TransportError
+
+PAGE_1 = {
+    "jobs_results": [{"job_id": "a", "title": "Dev"}],
+    "serpapi_pagination": {"next_page_token": "real-token-1"},
+}
+PAGE_2 = {"jobs_results": [{"job_id": "b", "title": "QA"}]}
+
+@pytest.fixture
+def fixture_dir(tmp_path):
+    """Records a two-page search through a fake live transport."""
+    live = MagicMock()
+    live.fetch.side_effect = [PAGE_1, PAGE_2]
+    finder = JobFinder(api_key="secret", max_pages=5, transport=RecordingTransport(str(tmp_path), inner=live))
+    finder.search_jobs({"q": "dev", "location": "Toronto"})
+    return str(tmp_path)
+
+def test_recording_strips_api_key(fixture_dir):
+    """Recorded fixtures contain the pagination token but never the API key."""
+    logging.info("Testing RecordingTransport...")
+    fixtures = [json.load(open(os.path.join(fixture_dir, name))) for name in os.listdir(fixture_dir)]
+    assert len(fixtures) == 2
+    assert all("api_key" not in fixture["params"] for fixture in fixtures)
+    assert any(fixture["params"].get("next_page_token") == "real-token-1" for fixture in fixtures)
+    logging.info("RecordingTransport test passed.")
+
+def test_replay_follows_recorded_pagination(fixture_dir):
+    """Replaying the corpus returns the recorded pages in order."""
+    logging.info("Testing ReplayTransport pagination...")
+    transport = ReplayTransport(ReplayStore(fixture_dir))
+    finder = JobFinder(api_key="other", max_pages=5, transport=transport)
+
+    results = finder.search_jobs({"q": "dev", "location": "Toronto"})
+
+    assert [job["job_id"] for job in results] == ["a", "b"]
+    assert transport.requests == 2
+    logging.info("ReplayTransport pagination test passed.")
+
+def test_replay_keeps_recording_time(tmp_path):
+    """Replayed jobs are aged from when they were recorded, not replayed."""
+    logging.info("Testing ReplayTransport fetched_at...")
+    recorded_at = 1700000000
+    live = MagicMock()
+    live.fetch.return_value = {"jobs_results": [{"job_id": "a", "title": "Dev", "extensions": ["3 days ago"]}]}
+    with patch("time.time", return_value=recorded_at):
+        JobFinder(api_key="secret", max_pages=1, transport=RecordingTransport(str(tmp_path), inner=live)).search_jobs({"q": "dev"})
+
+    finder = JobFinder(api_key="other", max_pages=1, transport=ReplayTransport(ReplayStore(str(tmp_path))))
+    job = finder.search_jobs({"q": "dev"})[0]
+
+    assert job["fetched_at"] == recorded_at
+    assert JobParser.parse_job(job).posted_at == recorded_at - 3 * 86400
+    logging.info("ReplayTransport fetched_at test passed.")
+
+def test_synthetic_pages_use_anchor_time(fixture_dir):
+    """Synthetic pages are stamped with the store's anchor, not the wall clock."""
+    logging.info("Testing ReplayStore anchor_time...")
+    recorded = [json.load(open(os.path.join(fixture_dir, name)))["fetched_at"] for name in os.listdir(fixture_dir)]
+    assert ReplayStore(fixture_dir).anchor_time == max(recorded)
+
+    store = ReplayStore(synthetic_pages=2)
+    assert store.anchor_time % 86400 == 0
+    finder = JobFinder(api_key="k", max_pages=5, transport=ReplayTransport(store))
+    with patch("time.time", return_value=store.anchor_time + 5000):
+        jobs = finder.search_jobs({"q": "unrecorded", "location": "Nowhere"})
+    assert len(jobs) == 20
+    assert {job["fetched_at"] for job in jobs} == {store.anchor_time}
+    logging.info("ReplayStore anchor_time test passed.")
+
+def test_synthetic_scaling_is_deterministic(fixture_dir):
+    """Synthetic pages extend searches with unique, reproducible jobs."""
+    logging.info("Testing ReplayStore synthetic scaling...")
+    def run():
+        store = ReplayStore(fixture_dir, synthetic_pages=20)
+        finder = JobFinder(api_key="k", max_pages=100, transport=ReplayTransport(store))
+        return [job["job_id"] for job in finder.search_jobs({"q": "unrecorded", "location": "Nowhere"})]
+
+    first, second = run(), run()
+    assert len(first) == 200
+    assert len(set(first)) == 200
+    assert first == second
+    logging.info("ReplayStore synthetic scaling test passed.")
+
+def test_error_injection_is_deterministic():
+    """The same seed injects the same errors for the same requests."""
+    logging.info("Testing ReplayTransport error injection...")
+    def outcomes(seed):
+        transport = ReplayTransport(ReplayStore(), error_rate=0.5, seed=seed)
+        results = []
+        for i in range(30):
+            try:
+                response = transport.fetch({"q": f"query {i}"})
+                results.append("error_key" if "error" in response else "ok")
+            except json.JSONDecodeError:
+                results.append("invalid_json")
+            except TransportError:
+                results.append("http_5xx")
+        return results
+
+    first = outcomes(seed=1)
+    assert first == outcomes(seed=1)
+    assert {"ok", "invalid_json", "http_5xx", "error_key"} <= set(first)
+    logging.info("ReplayTransport error injection test passed.")
+
+def test_replay_server_with_pooled_transport(fixture_dir):
+    """The HTTP replay server can stand in for SerpApi behind the pooled transport."""
+    logging.info("Testing ReplayServer...")
+    with ReplayServer(ReplayTransport(ReplayStore(fixture_dir))) as server:
+        transport = PooledHttpTransport(base_url=server.base_url)
+        finder = JobFinder(api_key="k", max_pages=5, transport=transport)
+        results = finder.search_jobs({"q": "dev", "location": "Toronto"})
+        transport.close()
+
+    assert [job["job_id"] for job in results] == ["a", "b"]
+    logging.info("ReplayServer test passed.")
+
+def _run_main_in(directory, replay_dir, monkeypatch):
+    monkeypatch.chdir(directory)
+    env = {
+        "API_KEY": "replay",
+        "SEARCH_QUERIES": '["python developer", "backend engineer"]',
+        "LOCATIONS": '["Toronto, Ontario, Canada", "Montreal, Quebec, Canada"]',
+        "SERPAPI_REPLAY_DIR": replay_dir,
+        "TRUSTED_DOMAINS": "[]",
+        "MAX_DAYS_OLD": "60",
+        "SCHEDULE_TYPES": '["full-time", "contractor"]',
+    }
+    with patch.dict(os.environ, env, clear=True), patch("config.load_dotenv"):
+        main()
+    with open(os.path.join(directory, "jobs.json")) as f:
+        return json.load(f)
+
+def test_main_end_to_end_is_deterministic(tmp_path, monkeypatch):
+    """main() runs offline against the replay corpus and produces the same report every time."""
+    logging.info("Testing main() end to end against replay...")
+    first_dir, second_dir = tmp_path / "first", tmp_path / "second"
+    first_dir.mkdir()
+    second_dir.mkdir()
+    empty_corpus = str(tmp_path / "corpus")
+
+    first = _run_main_in(first_dir, empty_corpus, monkeypatch)
+    second = _run_main_in(second_dir, empty_corpus, monkeypatch)
+
+    assert len(first) > 0
+    assert first == second
+    assert os.path.exists(first_dir / "data" / "history.json")
+    logging.info("main() end to end test passed.")
@@ -0,0 +1,111 @@
+import json
+import logging
+import threading
+import pytest
+from datetime import datetime, timedelta
+from sqlite_history import SqliteJobHistory
+
+@pytest.fixture
+def temp_db_file(tmp_path):
+    return str(tmp_path / "history.db")
+
+def test_is_seen_and_add_job(temp_db_file):
+    """Jobs are visible before and after they are flushed to the database."""
+    logging.info("Testing SqliteJobHistory is_seen and add_job...")
+    history = SqliteJobHistory(history_file=temp_db_file)
+    job = {"job_id": "123", "title": "Dev"}
+
+    assert not history.is_seen(job)
+    history.add_job(job)
+    assert history.is_seen(job)
+    assert history.save_history() is True
+    history.close()
+
+    reopened = SqliteJobHistory(history_file=temp_db_file)
+    assert reopened.is_seen(job)
+    assert not reopened.is_seen({"job_id": "456"})
+    assert len(reopened) == 1
+    logging.info("SqliteJobHistory is_seen and add_job test passed.")
+
+def test_generate_id_fallback(temp_db_file):
+    """Jobs without a job_id use the same hashed id as the JSON backend."""
+    history = SqliteJobHistory(history_file=temp_db_file)
+    job = {"title": "Dev", "company_name": "Corp", "location": "NY"}
+    history.add_job(job)
+    assert history.is_seen({"title": "Dev", "company_name": "Corp", "location": "NY"})
+
+def test_batched_inserts(temp_db_file):
+    """Pending jobs are written once the batch is full."""
+    logging.info("Testing SqliteJobHistory batching...")
+    history = SqliteJobHistory(history_file=temp_db_file, batch_size=3)
+    for i in range(4):
+        history.add_job({"job_id": f"job{i}"})
+
+    stored = history._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+    assert stored == 3
+    assert len(history._pending) == 1
+    assert len(history) == 4
+    logging.info("SqliteJobHistory batching test passed.")
+
+def test_cleanup_old_entries(temp_db_file):
+    """Entries older than the retention window are deleted."""
+    logging.info("Testing SqliteJobHistory cleanup...")
+    history = SqliteJobHistory(history_file=temp_db_file)
+    old = (datetime.now() - timedelta(days=50)).timestamp()
+    history._conn.execute("INSERT INTO history (job_id, ts) VALUES (?, ?)", ("old_job", old))
+    history.add_job({"job_id": "new_job"})
+
+    history.cleanup_old_entries(days=45)
+
+    assert not history.is_seen({"job_id": "old_job"})
+    assert history.is_seen({"job_id": "new_job"})
+    logging.info("SqliteJobHistory cleanup test passed.")
+
+def test_migrate_from_json(temp_db_file, tmp_path):
+    """An existing history.json is imported when the database is first created."""
+    logging.info("Testing SqliteJobHistory JSON migration...")
+    json_file = tmp_path / "history.json"
+    recent = datetime.now().isoformat()
+    with open(json_file, 'w') as f:
+        json.dump({"job1": recent, "job2": "2023-01-01T00:00:00", "bad": "not a date"}, f)
+
+    history = SqliteJobHistory(history_file=temp_db_file, json_file=str(json_file))
+
+    assert history.is_seen({"job_id": "job1"})
+    assert history.is_seen({"job_id": "job2"})
+    assert not history.is_seen({"job_id": "bad"})
+    assert len(history) == 2
+
+    # The import only happens once; later runs use the database alone
+    history.add_job({"job_id": "job3"})
+    history.close()
+    with open(json_file, 'w') as f:
+        json.dump({"job4": recent}, f)
+    reopened = SqliteJobHistory(history_file=temp_db_file, json_file=str(json_file))
+    assert not reopened.is_seen({"job_id": "job4"})
+    assert len(reopened) == 3
+    logging.info("SqliteJobHistory JSON migration test passed.")
+
+def test_is_seen_from_worker_threads(temp_db_file):
+    """Pagination policies look up history from the search worker threads."""
+    history = SqliteJobHistory(history_file=temp_db_file)
+    history.add_job({"job_id": "123"})
+    history.save_history()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(history.is_seen({"job_id": "123"}))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [True] * 4
+
+def test_is_seen_many(temp_db_file):
+    """Stored and pending jobs are both found by the bulk lookup."""
+    history = SqliteJobHistory(history_file=temp_db_file)
+    history.add_job({"job_id": "stored"})
+    history.save_history()
+    history.add_job({"job_id": "pending"})
+
+    jobs = [{"job_id": "pending"}, {"job_id": "new"}, {"job_id": "stored"}]
+    assert history.is_seen_many(jobs) == [True, False, True]
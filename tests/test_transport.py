@@ -0,0 +1,128 @@
+import gzip
+import json
+import logging
+import threading
+from unittest.mock import patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import pytest
+from job_finder import JobFinder
+from transport import PooledHttpTransport, TimedHTTPConnection, TimedHTTPSConnection, TransportError
+
+class FakeSerpApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        if params.get("q") == "unavailable":
+            body, status = b"<html>Service Unavailable</html>", 503
+        else:
+            body, status = json.dumps({"jobs_results": [{"title": params.get("q")}]}).encode(), 200
+
+        headers = {"Content-Type": "application/json"}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        if status == 503:
+            headers["Retry-After"] = "7"
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def fake_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSerpApiHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_fetch_reuses_pooled_connection(fake_server):
+    """Consecutive requests share one keep-alive connection."""
+    logging.info("Testing PooledHttpTransport connection reuse...")
+    transport = PooledHttpTransport(base_url=fake_server)
+
+    first = transport.fetch({"q": "dev"})
+    second = transport.fetch({"q": "qa"})
+
+    assert first == {"jobs_results": [{"title": "dev"}]}
+    assert second == {"jobs_results": [{"title": "qa"}]}
+    assert transport.connections_opened == 1
+    assert [t["reused"] for t in transport.timings] == [False, True]
+    transport.close()
+    logging.info("PooledHttpTransport connection reuse test passed.")
+
+def test_fetch_records_timing_breakdown(fake_server):
+    """Every request reports dns/connect/tls/ttfb/body timings."""
+    logging.info("Testing PooledHttpTransport timings...")
+    transport = PooledHttpTransport(base_url=fake_server)
+    transport.fetch({"q": "dev"})
+
+    timing = transport.timings[0]
+    for phase in ("dns", "connect", "tls", "ttfb", "body", "total"):
+        assert timing[phase] >= 0
+    assert timing["status"] == 200
+    assert transport.summary()["requests"] == 1
+    transport.close()
+    logging.info("PooledHttpTransport timings test passed.")
+
+def test_fetch_non_json_error_raises_transport_error(fake_server):
+    """A non-JSON 5xx response raises TransportError with the status and Retry-After."""
+    logging.info("Testing PooledHttpTransport error handling...")
+    transport = PooledHttpTransport(base_url=fake_server)
+    with pytest.raises(TransportError) as excinfo:
+        transport.fetch({"q": "unavailable"})
+    assert excinfo.value.status == 503
+    assert excinfo.value.retry_after == 7
+    transport.close()
+    logging.info("PooledHttpTransport error handling test passed.")
+
+def test_job_finder_uses_transport(fake_server):
+    """JobFinder sends every page through the injected transport."""
+    logging.info("Testing JobFinder with PooledHttpTransport...")
+    transport = PooledHttpTransport(base_url=fake_server)
+    finder = JobFinder(api_key="test_key", max_pages=1, transport=transport)
+
+    results = finder.search_jobs({"q": "dev", "location": "Toronto"})
+
+    fetched_at = results[0].pop("fetched_at")
+    assert isinstance(fetched_at, int)
+    assert results == [{"title": "dev", "search_location": "Toronto"}]
+    assert finder.total_api_calls == 1
+    transport.close()
+    logging.info("JobFinder with PooledHttpTransport test passed.")
+
+def test_https_connections_never_reconnect_in_plaintext():
+    """HTTPS transports use an HTTPSConnection, so an automatic reconnect is TLS too."""
+    logging.info("Testing PooledHttpTransport HTTPS connections...")
+    transport = PooledHttpTransport(base_url="https://serpapi.example")
+    fake_connect = lambda connection: setattr(connection, "connect_timing", {"dns": 0.0, "connect": 0.0, "tls": 0.0})
+    with patch.object(TimedHTTPSConnection, "connect", autospec=True, side_effect=fake_connect):
+        connection = transport._open_connection({})
+    assert isinstance(connection, TimedHTTPSConnection)
+    assert connection.port == 443
+    logging.info("PooledHttpTransport HTTPS connections test passed.")
+
+def test_reconnect_goes_through_timed_connect(fake_server):
+    """A connection whose socket was dropped reconnects with the timed connect()."""
+    logging.info("Testing PooledHttpTransport reconnect...")
+    transport = PooledHttpTransport(base_url=fake_server)
+    transport.fetch({"q": "dev"})
+    connection = transport._pool.get_nowait()
+    assert isinstance(connection, TimedHTTPConnection)
+    connection.close()
+    connection.connect_timing = None
+    transport._release(connection)
+
+    assert transport.fetch({"q": "qa"}) == {"jobs_results": [{"title": "qa"}]}
+    assert connection.connect_timing is not None
+    transport.close()
+    logging.info("PooledHttpTransport reconnect test passed.")